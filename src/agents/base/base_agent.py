@@ -1,24 +1,87 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, List
 
 class BaseAgent(ABC):
     def __init__(self, pos: Tuple[int, int], id: int):
+        # 환경에 등록되면 pos/speed/view_range 는 AgentRegistry 의 한 행을 가리킴
+        self._registry = None
+        self._row = -1
+        self._speed = 0
+        self._view_range = 0
         self.pos = pos
         self.id = id
         self.policy = None
         self.observation_history = []
+        self.received_messages: List[Dict[str, Any]] = []
+    
+    def attach(self, registry, row: int):
+        """AgentRegistry 의 행에 연결 (이후 상태는 배열에 저장됨)"""
+        self._registry = registry
+        self._row = row
+    
+    @property
+    def pos(self) -> Tuple[int, int]:
+        if self._registry is None:
+            return self._pos
+        return self._registry.position(self._row)
+    
+    @pos.setter
+    def pos(self, value: Tuple[int, int]):
+        if self._registry is None:
+            self._pos = value
+        else:
+            self._registry.positions[self._row] = value
+    
+    @property
+    def speed(self) -> float:
+        if self._registry is None:
+            return self._speed
+        return self._registry.speeds[self._row].item()
+    
+    @speed.setter
+    def speed(self, value: float):
+        if self._registry is None:
+            self._speed = value
+        else:
+            self._registry.speeds[self._row] = value
+    
+    @property
+    def view_range(self) -> float:
+        if self._registry is None:
+            return self._view_range
+        return self._registry.view_ranges[self._row].item()
+    
+    @view_range.setter
+    def view_range(self, value: float):
+        if self._registry is None:
+            self._view_range = value
+        else:
+            self._registry.view_ranges[self._row] = value
     
     @abstractmethod
     def get_observation(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """환경을 관찰하여 에이전트의 관점에서의 상태를 반환"""
         pass
     
+    def _fill_visible(self, state: Dict[str, Any], visible_objects: Dict[str, Any]):
+        """환경이 일괄 계산한 가시성 결과(state['visibility'])에서 자기 행의 객체를 채움"""
+        visibility = state.get('visibility')
+        if visibility is None or self._registry is None:
+            return
+        patients, obstacles = visibility.visible(self._row)
+        visible_objects['patients'] = [state['patients'][i] for i in patients.tolist()]
+        visible_objects['obstacles'] = [state['obstacles'][i] for i in obstacles.tolist()]
+    
     def step(self, state: Dict[str, Any]) -> Tuple[int, int]:
         """환경 상태를 받아서 행동을 결정"""
         if self.policy:
             return self.policy.select_action(self.get_observation(state))
         return (0, 0)  # 기본 행동
     
+    def process_messages(self, messages: List[Dict[str, Any]]):
+        """다른 에이전트로부터 받은 메시지 저장"""
+        self.received_messages = messages
+    
     def set_policy(self, policy):
         """정책 설정"""
         self.policy = policy
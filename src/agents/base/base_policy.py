@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, List, Sequence
+import numpy as np
 
 class BasePolicy(ABC):
     @abstractmethod
@@ -7,7 +8,32 @@ class BasePolicy(ABC):
         """상태를 받아서 행동을 선택"""
         pass
     
+    def select_actions(self, states: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """여러 에이전트의 상태를 받아 행동을 한 번에 선택 (정수 이동량 [에이전트 수, 2])
+        
+        기본 구현은 select_action 을 반복 호출하며, 신경망 정책은 한 번의 forward 로 재정의한다.
+        """
+        return np.array([self.select_action(state) for state in states], dtype=np.int64).reshape(-1, 2)
+    
     @abstractmethod
     def update(self, experience: Dict[str, Any]):
-        """경험을 통해 정책을 업데이트"""
-        pass 
\ No newline at end of file
+        """경험을 통해 정책을 업데이트하고 손실 등의 통계 dict 를 반환
+        
+        experience 에 필요한 키는 정책마다 다르다 (예: PPOPolicy 는 'buffer' 에 RolloutBuffer).
+        필요한 키가 없는 경험 (BaseAgent.update 에 넘기던 예전 형식 등) 은 무시하고 빈 dict 를 반환한다.
+        """
+        pass
+
+def select_actions_by_policy(agents: Sequence[Any], observations: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """같은 정책을 쓰는 에이전트끼리 묶어 정책마다 select_actions 를 한 번만 호출
+    
+    반환값은 에이전트 순서의 정수 이동량 [에이전트 수, 2] 이며, 정책이 없는 에이전트는 (0, 0) 이다.
+    """
+    actions = np.zeros((len(agents), 2), dtype=np.int64)
+    groups: Dict[int, Tuple[BasePolicy, List[int]]] = {}
+    for i, agent in enumerate(agents):
+        if agent.policy is not None:
+            groups.setdefault(id(agent.policy), (agent.policy, []))[1].append(i)
+    for policy, rows in groups.values():
+        actions[rows] = policy.select_actions([observations[i] for i in rows])
+    return actions
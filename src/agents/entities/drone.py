@@ -2,6 +2,7 @@ from typing import Dict, Any, Tuple
 from ..base.agent import BaseAgent
 from ..base.policy import BasePolicy
 import numpy as np
+from environments.rescue.visibility import in_view_range
 
 class DroneAgent(BaseAgent):
     def __init__(self, pos: Tuple[int, int], id: int):
@@ -18,11 +19,13 @@ class DroneAgent(BaseAgent):
             'obstacles': [],
         }
         
-        for key in ['patients', 'obstacles']:
-            if key in state:
-                for obj in state[key]:
-                    if self._is_in_view_range(obj[0] if isinstance(obj, tuple) else obj):
-                        visible_objects[key].append(obj)
+        # 환자는 위치 자체, 장애물은 (위치, 타입) 튜플
+        if state.get('patients'):
+            mask = in_view_range(self.pos, self.view_range, state['patients'])
+            visible_objects['patients'] = [obj for obj, seen in zip(state['patients'], mask) if seen]
+        if state.get('obstacles'):
+            mask = in_view_range(self.pos, self.view_range, [obj[0] for obj in state['obstacles']])
+            visible_objects['obstacles'] = [obj for obj, seen in zip(state['obstacles'], mask) if seen]
         
         return visible_objects
         
@@ -1,34 +1,134 @@
-from typing import Tuple, Dict, Any, List
+from collections import OrderedDict
+from typing import Tuple, Dict, Any, List, Optional, Sequence
 import numpy as np
 import math
 
+TWO_PI = 2 * math.pi
+
 class Observer:
-    def __init__(self, pos: Tuple[int, int], view_range: int = 800):
+    """제자리에서 시야각을 돌리며 환자를 감지하는 관찰자
+    
+    관찰자는 움직이지 않으므로 시야 반경 안의 환자를 방위각 순으로 정렬한 극좌표 인덱스를 한 번 만들고,
+    매 스캔은 지난 스캔 이후 시야각 앞쪽 경계가 쓸고 지나간 각도 구간만 이진 탐색으로 잘라 새로 시야에
+    들어온 환자를 감지한다 (첫 스캔이나 환자 목록이 바뀐 뒤에는 시야각 전체).
+    환자 목록이 바뀌었는지는 state['patients_version'] 이 있으면 그 값으로, 없으면 목록 내용의
+    해시로 판단하므로 목록을 제자리에서 고쳐도 인덱스를 다시 만든다.
+    감지 기록 detected_objects 는 위치를 키로 마지막 감지만 남기며, max_detections 개를 넘으면
+    가장 오래전에 감지된 것부터 버린다.
+    """
+    
+    def __init__(self, pos: Tuple[int, int], view_range: int = 800, line_of_sight=None,
+                 max_detections: int = 10000):
         self.pos = pos
         self.view_range = view_range
+        self.line_of_sight = line_of_sight  # LineOfSight 를 주면 장애물에 가려진 환자는 감지하지 않음
         self.rotation_speed = 2
         self.current_angle = 0
         self.fov = math.pi / 3
-        self.detected_objects = []
-        
+        self.max_detections = max_detections
+        self.detected_objects: 'OrderedDict[Tuple[int, int], Dict[str, Any]]' = OrderedDict()
+        # 극좌표 인덱스 (시야 반경 안의 환자, 방위각 [0, 2pi) 오름차순)
+        self._source_key: Optional[Tuple] = None
+        self._rows = np.zeros(0, dtype=np.int64)  # 환자 목록에서의 인덱스
+        self._bearings = np.zeros(0)
+        self._distances = np.zeros(0)
+        self._scanned = False  # 지금 인덱스로 시야각 전체를 스캔한 적이 있는지
+    
     def scan(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
-        self.current_angle = (self.current_angle + math.radians(self.rotation_speed)) % (2 * math.pi)
+        """시야각을 돌리고 이번에 새로 시야에 들어온 환자의 감지 목록을 반환"""
+        previous = self.current_angle
+        self.current_angle = (self.current_angle + math.radians(self.rotation_speed)) % TWO_PI
         
         detected = []
         
-        if 'patients' in state:
-            for obj_pos in state['patients']:
-                if self._is_in_view_cone(obj_pos):
-                    detected.append({
-                        'type': 'patient',
-                        'position': obj_pos,
-                        'distance': self._calculate_distance(obj_pos),
-                        'detection_time': state.get('time', 0)
-                    })
+        patients = state.get('patients')
+        if patients:
+            self._index(patients, state.get('patients_version'))
+            rows = self._swept(math.radians(self.rotation_speed), previous)
+            positions = [patients[i] for i in self._rows[rows].tolist()]
+            distances = self._distances[rows].tolist()
+            time = state.get('time', 0)
+            for obj_pos, distance in self._unoccluded(positions, distances):
+                detected.append({
+                    'type': 'patient',
+                    'position': obj_pos,
+                    'distance': distance,
+                    'detection_time': time
+                })
         
-        self.detected_objects.extend(detected)
+        self._remember(detected)
         return detected
     
+    def in_view(self) -> np.ndarray:
+        """지금 시야각 안에 있는 환자의 (마지막 스캔한 환자 목록에서의) 인덱스"""
+        half = self.fov / 2
+        return self._rows[self._range(self.current_angle - half, self.current_angle + half, True)]
+    
+    def _index(self, patients: Sequence[Tuple[int, int]], version: Any = None):
+        # 환자 목록 버전 (호출자가 바꿀 때마다 올림) 이 없으면 내용 해시로 비교 (관찰자는 움직이지 않음)
+        content = ('version', version) if version is not None else ('hash', hash(tuple(map(tuple, patients))))
+        key = (content, self.pos, self.view_range)
+        if key == self._source_key:
+            return
+        points = np.asarray(patients, dtype=np.float64).reshape(-1, 2)
+        dx = points[:, 0] - self.pos[0]
+        dy = points[:, 1] - self.pos[1]
+        distances = np.sqrt(dx**2 + dy**2)
+        rows = np.flatnonzero(distances <= self.view_range)
+        bearings = np.arctan2(dy[rows], dx[rows]) % TWO_PI
+        order = np.argsort(bearings, kind='stable')
+        self._rows = rows[order]
+        self._bearings = bearings[order]
+        self._distances = distances[self._rows]
+        self._source_key = key
+        self._scanned = False
+    
+    def _swept(self, step: float, previous: float) -> np.ndarray:
+        """이번 회전으로 시야각에 새로 들어온 인덱스 위치 (지난 시야각에 있던 것은 제외)"""
+        half = self.fov / 2
+        current = previous + step
+        if not self._scanned or abs(step) >= self.fov:
+            self._scanned = True
+            return self._range(current - half, current + half, True)
+        if step >= 0:
+            return self._range(previous + half, current + half, False)
+        return self._range(current - half, previous - half, True, False)
+    
+    def _range(self, low: float, high: float, include_low: bool, include_high: bool = True) -> np.ndarray:
+        """방위각이 low ~ high (low <= high, 2pi 를 넘으면 감아 돌림) 인 인덱스 위치"""
+        width = high - low
+        if width >= TWO_PI:
+            return np.arange(len(self._bearings))
+        low %= TWO_PI
+        high = low + width
+        low_side = 'left' if include_low else 'right'
+        high_side = 'right' if include_high else 'left'
+        start = np.searchsorted(self._bearings, low, low_side)
+        if high < TWO_PI:
+            return np.arange(start, max(start, np.searchsorted(self._bearings, high, high_side)))
+        end = np.searchsorted(self._bearings, high - TWO_PI, high_side)
+        return np.concatenate([np.arange(start, len(self._bearings)), np.arange(end)])
+    
+    def _remember(self, detected: List[Dict[str, Any]]):
+        # 같은 위치는 마지막 감지로 덮어쓰고 맨 뒤로 옮김 (가장 오래된 것부터 버림)
+        store = self.detected_objects
+        for detection in detected:
+            key = detection['position']
+            if key in store:
+                store.move_to_end(key)
+            store[key] = detection
+        while len(store) > self.max_detections:
+            store.popitem(last=False)
+    
+    def _unoccluded(self, positions: List[Tuple[int, int]], distances: List[float]) -> List[Tuple[Tuple[int, int], float]]:
+        # 관찰자는 지상 층 (모든 장애물이 시야를 가림) 에서 한 번에 광선 추적
+        if self.line_of_sight is None or not positions:
+            return list(zip(positions, distances))
+        origins = np.tile(np.asarray(self.pos, dtype=np.float64), (len(positions), 1))
+        visible = self.line_of_sight.trace(origins, np.asarray(positions, dtype=np.float64),
+                                           self.line_of_sight.layers(np.zeros(len(positions), dtype=bool)))
+        return [(pos, distance) for pos, distance, seen in zip(positions, distances, visible.tolist()) if seen]
+    
     def _is_in_view_cone(self, obj_pos: Tuple[int, int]) -> bool:
         dx = obj_pos[0] - self.pos[0]
         dy = obj_pos[1] - self.pos[1]
@@ -46,8 +146,5 @@ class Observer:
         return math.sqrt(dx**2 + dy**2)
     
     def _normalize_angle(self, angle: float) -> float:
-        while angle > math.pi:
-            angle -= 2 * math.pi
-        while angle < -math.pi:
-            angle += 2 * math.pi
-        return angle
\ No newline at end of file
+        # [-pi, pi] 로 (반복문 없이)
+        return math.remainder(angle, TWO_PI)
@@ -13,5 +13,6 @@ class DroneAgent(BaseAgent):
             'obstacles': [],
             'rescue_signals': []
         }
+        self._fill_visible(state, visible_objects)
         # 드론 특화 관찰 로직 구현
         return visible_objects 
\ No newline at end of file
@@ -0,0 +1 @@
+# 비워둡니다
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""python -m benchmarks: 환경 처리량 벤치마크 스위트 실행 (benchmarks.suite 참고)"""
+import sys
+from benchmarks.suite import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""에이전트 상태 저장 방식 벤치마크: 객체별 튜플 위치 vs. AgentRegistry 배열
+
+이동 단계(move)와 상태의 'agents' 항목 생성(agents_state)을 에이전트 수별로 측정한다.
+할당량은 tracemalloc 으로 잰 스텝당 임시 메모리 최대치(peak)이다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.agent_state --num-agents 3 100 1000 10000
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from environments.rescue.rescue_env import RescueEnv
+from agents.types.drone import DroneAgent
+from agents.types.wheeled import WheeledAgent
+
+
+def _make_env(num_agents: int) -> RescueEnv:
+    env = RescueEnv()
+    env.setup_default_environment()
+    rng = np.random.default_rng(0)
+    for i in range(num_agents):
+        pos = (int(rng.integers(0, env.width)), int(rng.integers(0, env.height)))
+        env.add_agent(DroneAgent(pos, i) if i % 2 == 0 else WheeledAgent(pos, i))
+    return env
+
+
+def _legacy_move(env: RescueEnv, movements: np.ndarray):
+    """에이전트 객체를 하나씩 갱신하던 기존 방식"""
+    for agent, (dx, dy) in zip(env.agents, movements.tolist()):
+        current_pos = agent.pos
+        new_pos = (max(0, min(env.width, current_pos[0] + dx)),
+                   max(0, min(env.height, current_pos[1] + dy)))
+        if env._is_valid_move(agent, new_pos):
+            agent.pos = new_pos
+
+
+def _registry_move(env: RescueEnv, movements: np.ndarray):
+    env._move_agents(movements)
+
+
+def _legacy_agents_state(env: RescueEnv, movements: np.ndarray):
+    return [(agent.pos, type(agent).__name__) for agent in env.agents]
+
+
+def _registry_agents_state(env: RescueEnv, movements: np.ndarray):
+    return list(zip(map(tuple, env.registry.positions[:env.registry.count].tolist()),
+                    env.registry.type_names))
+
+
+def _measure(step_fn, env: RescueEnv, all_movements: np.ndarray) -> dict:
+    start = time.perf_counter()
+    for movements in all_movements:
+        step_fn(env, movements)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    peaks = []
+    for movements in all_movements:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        step_fn(env, movements)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return {'us': elapsed / len(all_movements) * 1e6, 'peak_kb': float(np.median(peaks)) / 1024}
+
+
+def run(num_agents: int, steps: int = 50) -> dict:
+    rng = np.random.default_rng(1)
+    all_movements = rng.integers(-2, 3, size=(steps, num_agents, 2)).astype(np.float64)
+    return {
+        'num_agents': num_agents,
+        'move': {
+            'legacy': _measure(_legacy_move, _make_env(num_agents), all_movements),
+            'registry': _measure(_registry_move, _make_env(num_agents), all_movements),
+        },
+        'agents_state': {
+            'legacy': _measure(_legacy_agents_state, _make_env(num_agents), all_movements),
+            'registry': _measure(_registry_agents_state, _make_env(num_agents), all_movements),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[3, 100, 1000, 10000])
+    parser.add_argument('--steps', type=int, default=50)
+    args = parser.parse_args()
+    
+    print(f"{'phase':<13} {'agents':>7} {'legacy(us)':>11} {'registry(us)':>13} "
+          f"{'legacy(KB)':>11} {'registry(KB)':>13}")
+    for num_agents in args.num_agents:
+        r = run(num_agents, args.steps)
+        for phase in ['move', 'agents_state']:
+            legacy, registry = r[phase]['legacy'], r[phase]['registry']
+            print(f"{phase:<13} {num_agents:>7} {legacy['us']:>11.1f} {registry['us']:>13.1f} "
+                  f"{legacy['peak_kb']:>11.1f} {registry['peak_kb']:>13.1f}")
+
+if __name__ == '__main__':
+    main()
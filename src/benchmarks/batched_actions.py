@@ -0,0 +1,66 @@
+"""행동 선택 벤치마크: 에이전트마다 select_action vs. 정책별 select_actions 한 번
+
+결과는 초당 처리한 에이전트-스텝 수로 보고한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.batched_actions --num-agents 3 100 10000
+"""
+import argparse
+import time
+import torch
+from policies.ppo.ppo_policy import PPOPolicy
+from policies.hierarchical.high_level import HighLevelPolicy
+
+
+def _time_per_call(fn, min_time: float = 0.2) -> float:
+    fn()  # 워밍업
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def run(policy, num_agents: int) -> dict:
+    observations = [{'patients': [], 'obstacles': [], 'rescue_signals': []} for _ in range(num_agents)]
+    # 에이전트별 경로는 느리므로 일부만 재서 전체로 환산
+    sample = observations[:min(num_agents, 500)]
+    per_agent = _time_per_call(lambda: [policy.select_action(obs) for obs in sample]) / len(sample) * num_agents
+    batched = _time_per_call(lambda: policy.select_actions(observations))
+    actions = policy.select_actions(observations)
+    if actions.shape != (num_agents, 2) or actions.dtype.kind != 'i':
+        raise AssertionError(f"unexpected actions {actions.shape} {actions.dtype}")
+    return {
+        'num_agents': num_agents,
+        'per_agent_steps_per_s': num_agents / per_agent,
+        'batched_steps_per_s': num_agents / batched,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[3, 100, 10000])
+    parser.add_argument('--state-dim', type=int, default=64)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    policies = {
+        'PPOPolicy': PPOPolicy(args.state_dim, 2),
+        'HighLevelPolicy': HighLevelPolicy(args.state_dim, 4),
+    }
+    print(f"{'policy':>16} {'agents':>7} {'per-agent(agent/s)':>19} {'batched(agent/s)':>17} {'speedup':>8}")
+    for name, policy in policies.items():
+        for num_agents in args.num_agents:
+            r = run(policy, num_agents)
+            print(f"{name:>16} {num_agents:>7} {r['per_agent_steps_per_s']:>19.0f} "
+                  f"{r['batched_steps_per_s']:>17.0f} "
+                  f"{r['batched_steps_per_s'] / r['per_agent_steps_per_s']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
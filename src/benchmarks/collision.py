@@ -0,0 +1,64 @@
+"""이동 가능 여부 확인 벤치마크: 장애물 선형 탐색 vs. occupancy grid 조회
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.collision --counts 100 1000 10000 100000
+"""
+import argparse
+import random
+import time
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.constants import ObstacleType
+from agents.types.drone import DroneAgent
+from agents.types.wheeled import WheeledAgent
+
+
+def run(num_obstacles: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    env = RescueEnv()
+    start = time.perf_counter()
+    for _ in range(num_obstacles):
+        pos = (rng.randint(0, env.width), rng.randint(0, env.height))
+        obstacle_type = ObstacleType.AERIAL if rng.random() < 0.5 else ObstacleType.NORMAL
+        env.add_obstacle(pos, obstacle_type)
+    build_time = time.perf_counter() - start
+    
+    agents = [DroneAgent((0, 0), 0), WheeledAgent((0, 0), 1)]
+    # 선형 탐색은 장애물 수에 비례하므로 질의 수를 줄여 비슷한 시간에 끝나게 함
+    num_queries = max(20, 200000 // max(len(env.obstacles), 1))
+    queries = [(agents[i % 2], (rng.randint(0, env.width), rng.randint(0, env.height)))
+               for i in range(num_queries)]
+    
+    start = time.perf_counter()
+    expected = [env._scan_valid_move(agent, pos) for agent, pos in queries]
+    scan_time = (time.perf_counter() - start) / num_queries
+    
+    start = time.perf_counter()
+    actual = [env._is_valid_move(agent, pos) for agent, pos in queries]
+    grid_time = (time.perf_counter() - start) / num_queries
+    
+    if expected != actual:
+        raise AssertionError(f"occupancy grid disagrees with linear scan at {num_obstacles} obstacles")
+    
+    return {
+        'obstacles': len(env.obstacles),
+        'build_ms': build_time * 1000,
+        'scan_us': scan_time * 1e6,
+        'grid_us': grid_time * 1e6,
+        'speedup': scan_time / grid_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    args = parser.parse_args()
+    
+    print(f"{'obstacles':>10} {'build(ms)':>10} {'scan(us)':>10} {'grid(us)':>10} {'speedup':>9}")
+    for count in args.counts:
+        r = run(count)
+        print(f"{r['obstacles']:>10} {r['build_ms']:>10.1f} {r['scan_us']:>10.2f} "
+              f"{r['grid_us']:>10.2f} {r['speedup']:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
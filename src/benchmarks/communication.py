@@ -0,0 +1,112 @@
+"""긴 에피소드 통신 벤치마크: 전체 기록 리스트 vs. 링 버퍼 + 커서 채널
+
+매 스텝 모든 에이전트가 메시지를 하나씩 보내고 받는다. 메모리는 tracemalloc 으로 잰
+채널이 붙잡고 있는 메모리, 시간은 체크포인트 직전 구간의 스텝당 평균이다.
+
+--swarm 을 주면 대신 에이전트 수별로 전체 방송과 거리 제한 방송(comm_range)의
+스텝당 비용과 평균 fan-out 을 비교한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.communication --steps 100000 --num-agents 8
+    python -m benchmarks.communication --swarm 100 1000 5000 --comm-range 50
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from typing import List, Dict, Any
+from environments.rescue.communication_channel import CommunicationChannel
+
+
+class _HistoryChannel:
+    """변경 전 CommunicationChannel: 모든 메시지를 보관하고 매번 전체를 훑음"""
+    
+    def __init__(self):
+        self.messages = []
+    
+    def broadcast(self, sender_id: int, message: Dict[str, Any]):
+        self.messages.append((sender_id, message))
+    
+    def receive(self, agent_id: int) -> List[Dict[str, Any]]:
+        return [msg for sender, msg in self.messages if sender != agent_id]
+
+
+def run(channel, steps: int, num_agents: int, checkpoints: List[int], time_limit: float) -> list:
+    results = []
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = interval_start = time.perf_counter()
+    last_step = 0
+    for step in range(1, steps + 1):
+        if hasattr(channel, 'advance'):
+            channel.advance(step)
+        for agent_id in range(num_agents):
+            channel.broadcast(agent_id, {'type': 'position', 'data': (step, agent_id)})
+            channel.receive(agent_id)
+        if step in checkpoints:
+            now = time.perf_counter()
+            results.append({
+                'step': step,
+                'memory_kb': (tracemalloc.get_traced_memory()[0] - base) / 1024,
+                'step_us': (now - interval_start) / (step - last_step) * 1e6,
+            })
+            interval_start, last_step = now, step
+            if now - start > time_limit:
+                break
+    tracemalloc.stop()
+    return results
+
+
+def run_swarm(num_agents: int, comm_range, steps: int = 5, size: float = 2000.0) -> dict:
+    """모든 에이전트가 매 스텝 방송하고 수신하는 큰 군집"""
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0, size, size=(num_agents, 2))
+    channel = CommunicationChannel(capacity=4 * num_agents, comm_range=comm_range)
+    ids = list(range(num_agents))
+    start = time.perf_counter()
+    for step in range(1, steps + 1):
+        channel.advance(step)
+        channel.update_positions(ids, positions)
+        for agent_id in ids:
+            channel.broadcast(agent_id, {'type': 'position', 'data': agent_id})
+        for agent_id in ids:
+            channel.receive(agent_id)
+    elapsed = time.perf_counter() - start
+    stats = channel.pop_stats()
+    return {'step_ms': elapsed / steps * 1000, 'fan_out_mean': stats['fan_out_mean']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--steps', type=int, default=100000)
+    parser.add_argument('--num-agents', type=int, default=8)
+    parser.add_argument('--capacity', type=int, default=1024)
+    parser.add_argument('--time-limit', type=float, default=30.0,
+                        help='이 시간(초)을 넘기면 해당 채널 측정을 중단')
+    parser.add_argument('--swarm', type=int, nargs='*',
+                        help='거리 제한 방송 비교에 쓸 에이전트 수 목록')
+    parser.add_argument('--comm-range', type=float, default=50.0)
+    args = parser.parse_args()
+    
+    if args.swarm:
+        print(f"{'agents':>7} {'global(ms)':>11} {'ranged(ms)':>11} {'fan-out':>8}")
+        for num_agents in args.swarm:
+            broadcast = run_swarm(num_agents, None)
+            ranged = run_swarm(num_agents, args.comm_range)
+            print(f"{num_agents:>7} {broadcast['step_ms']:>11.2f} {ranged['step_ms']:>11.2f} "
+                  f"{ranged['fan_out_mean']:>8.1f}")
+        return
+    
+    checkpoints = [c for c in [100, 1000, 3000, 10000, 30000, 100000] if c <= args.steps]
+    channels = {
+        'history': _HistoryChannel(),
+        'ring': CommunicationChannel(capacity=args.capacity),
+    }
+    print(f"{'channel':<8} {'step':>8} {'memory(KB)':>11} {'step(us)':>10}")
+    for name, channel in channels.items():
+        for r in run(channel, args.steps, args.num_agents, checkpoints, args.time_limit):
+            print(f"{name:<8} {r['step']:>8} {r['memory_kb']:>11.1f} {r['step_us']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""탐색 지도 (CoverageMap) 벤치마크: 차이 스텐실 갱신 vs. 매 스텝 시야 원 전체 표시
+
+맵 크기와 에이전트 속도마다 무작위로 걷는 에이전트들의 탐색 지도를 --steps 스텝 갱신하며
+(a) CoverageMap.update (새로 시야에 들어온 칸만 검사) 와 (b) 매 스텝 원 전체를 검사하는 기준
+(max_shift=-1 로 차이 스텐실을 끈 CoverageMap) 의 스텝당 시간과 검사한 칸 수를 비교한다.
+두 지도가 같은지(parity), 팀 지도 메모리(비트 압축 vs. bool)도 보고한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.coverage --maps 800x600 4000x3000 --speeds 1 2 5 --num-agents 200
+"""
+import argparse
+import time
+import numpy as np
+from environments.rescue.coverage import CoverageMap
+
+
+def _walk(coverage: CoverageMap, start: np.ndarray, speed: int, steps: int, view_range: float,
+          width: int, height: int, seed: int) -> float:
+    rng = np.random.default_rng(seed)
+    positions = start.copy()
+    view_ranges = np.full(len(positions), view_range)
+    coverage.update(positions, view_ranges)
+    total = 0.0
+    for _ in range(steps):
+        positions += rng.integers(-speed, speed + 1, size=positions.shape)
+        np.clip(positions, 0, [width, height], out=positions)
+        begin = time.perf_counter()
+        coverage.update(positions, view_ranges)
+        total += time.perf_counter() - begin
+    return total / steps * 1e3
+
+
+def run(map_size: str, num_agents: int, speed: int, steps: int, view_range: float, seed: int = 0) -> dict:
+    width, height = map(int, map_size.split('x'))
+    start = np.random.default_rng(seed).integers(0, [width, height], size=(num_agents, 2)).astype(np.float64)
+    incremental = CoverageMap(width, height, 20)
+    full = CoverageMap(width, height, 20, max_shift=-1)
+    incremental_ms = _walk(incremental, start, speed, steps, view_range, width, height, seed)
+    full_ms = _walk(full, start, speed, steps, view_range, width, height, seed)
+    return {
+        'incremental_ms': incremental_ms,
+        'full_ms': full_ms,
+        'checked': incremental.cells_checked / steps / num_agents,
+        'full_checked': full.cells_checked / steps / num_agents,
+        'fraction': incremental.fraction(),
+        'parity': bool(np.array_equal(incremental.agent_bits, full.agent_bits)
+                       and np.array_equal(incremental.team_bits, full.team_bits)
+                       and np.array_equal(incremental.agent_blocks, full.agent_blocks)),
+        'packed_kb': incremental.team_bits.nbytes / 1024,
+        'bool_kb': incremental.rows * incremental.cols / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--maps', nargs='+', default=['800x600', '4000x3000'])
+    parser.add_argument('--speeds', type=int, nargs='+', default=[1, 2, 5, 20])
+    parser.add_argument('--num-agents', type=int, default=200)
+    parser.add_argument('--view-range', type=float, default=150)
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'map':>10} {'speed':>6} {'full(ms)':>9} {'incr(ms)':>9} {'speedup':>8} {'cells/agent':>12} "
+          f"{'full cells':>11} {'covered':>8} {'team KB':>8} {'bool KB':>8}  parity")
+    for map_size in args.maps:
+        for speed in args.speeds:
+            r = run(map_size, args.num_agents, speed, args.steps, args.view_range)
+            print(f"{map_size:>10} {speed:>6} {r['full_ms']:>9.2f} {r['incremental_ms']:>9.2f} "
+                  f"{r['full_ms'] / r['incremental_ms']:>7.1f}x {r['checked']:>12.1f} {r['full_checked']:>11.1f} "
+                  f"{r['fraction']:>8.1%} {r['packed_kb']:>8.1f} {r['bool_kb']:>8.1f}  {r['parity']}")
+
+
+if __name__ == '__main__':
+    main()
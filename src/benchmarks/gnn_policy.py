@@ -0,0 +1,79 @@
+"""GNN 정책 처리량 벤치마크: 에이전트별 MLP(PPOPolicy.select_action) vs. 그래프 한 번의 forward
+
+GNN 쪽 시간에는 그래프 생성(GraphBuilder)과 torch 변환까지 포함한다.
+결과는 초당 처리한 에이전트-스텝 수로 보고한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.gnn_policy --num-agents 3 100 1000 10000
+    python -m benchmarks.gnn_policy --num-agents 100 --num-envs 64
+"""
+import argparse
+import time
+import numpy as np
+import torch
+from policies.ppo.ppo_policy import PPOPolicy
+from policies.gnn.gnn_policy import GNNPolicy
+from policies.gnn.graph_builder import BatchedGraphBuilder
+
+
+def _time_per_call(fn, min_time: float = 0.2) -> float:
+    fn()  # 워밍업
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def run(num_agents: int, num_envs: int = 1, radius: float = 50.0, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    torch.manual_seed(seed)
+    total_agents = num_envs * num_agents
+    size = np.sqrt(num_agents * np.pi * radius ** 2 / 8)
+    positions = rng.uniform(0, size, size=(num_envs, num_agents, 2))
+    type_codes = rng.integers(0, 2, size=num_agents)
+    
+    # 에이전트별 경로: 에이전트마다 _preprocess_state + forward + .item()
+    mlp = PPOPolicy(state_dim=64, action_dim=2)
+    sample = min(total_agents, 200)
+    mlp_time = _time_per_call(lambda: [mlp.select_action({}) for _ in range(sample)]) / sample * total_agents
+    
+    gnn = GNNPolicy(radius=radius)
+    builder = BatchedGraphBuilder(num_envs, radius=radius)
+    gnn_time = _time_per_call(lambda: gnn.select_actions(builder.build(positions, type_codes)))
+    graph = builder.build(positions, type_codes)
+    forward_time = _time_per_call(lambda: gnn.select_actions(graph.to_torch()))
+    
+    return {
+        'agents': total_agents,
+        'edges': graph.num_edges,
+        'mlp_agent_steps_per_s': total_agents / mlp_time,
+        'gnn_agent_steps_per_s': total_agents / gnn_time,
+        'gnn_ms': gnn_time * 1000,
+        'forward_ms': forward_time * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[3, 100, 1000, 10000])
+    parser.add_argument('--num-envs', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+    
+    print(f"{'agents':>7} {'edges':>8} {'mlp(agent/s)':>13} {'gnn(agent/s)':>13} {'gnn(ms)':>8} "
+          f"{'forward(ms)':>12} {'speedup':>8}")
+    for num_agents in args.num_agents:
+        r = run(num_agents, args.num_envs)
+        print(f"{r['agents']:>7} {r['edges']:>8} {r['mlp_agent_steps_per_s']:>13.0f} "
+              f"{r['gnn_agent_steps_per_s']:>13.0f} {r['gnn_ms']:>8.2f} {r['forward_ms']:>12.2f} "
+              f"{r['gnn_agent_steps_per_s'] / r['mlp_agent_steps_per_s']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
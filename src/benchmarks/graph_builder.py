@@ -0,0 +1,120 @@
+"""에이전트 그래프 생성 벤치마크: 매 스텝 새로 생성 vs. GraphBuilder 점진적 갱신
+
+에이전트가 매 스텝 조금씩 움직이는 상황에서 radius 그래프를 만든다.
+결과 간선 집합은 전수 거리 계산 결과와 비교해 검증한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.graph_builder --num-agents 100 1000 10000 --steps 50
+    python -m benchmarks.graph_builder --num-agents 100 --num-envs 64  # 여러 환경을 한 그래프로
+"""
+import argparse
+import time
+import numpy as np
+from environments.base.agent_registry import UNKNOWN_AGENT_TYPE
+from policies.gnn.graph_builder import GraphBuilder, BatchedGraphBuilder, NUM_NODE_TYPES
+
+
+def _brute_force_edges(positions: np.ndarray, radius: float) -> set:
+    delta = positions[:, None, :] - positions[None, :, :]
+    distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+    source, target = np.nonzero(distance <= radius)
+    return {(s, t) for s, t in zip(source.tolist(), target.tolist()) if s != t}
+
+
+def _random_walk(rng, num_agents: int, steps: int, size: float, speed: float) -> np.ndarray:
+    start = rng.uniform(0, size, size=(num_agents, 2))
+    moves = rng.uniform(-speed, speed, size=(steps, num_agents, 2))
+    return np.clip(start + np.cumsum(moves, axis=0), 0, size)
+
+
+def run(num_agents: int, steps: int = 50, radius: float = 50.0, speed: float = 2.0,
+        k: int = None, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    # 에이전트 밀도를 일정하게 유지 (반경 안에 평균 약 8개)
+    size = np.sqrt(num_agents * np.pi * radius ** 2 / 8)
+    trajectory = _random_walk(rng, num_agents, steps, size, speed)
+    
+    scratch = GraphBuilder(radius, k=k, skin=0.0)
+    incremental = GraphBuilder(radius, k=k)
+    # 종류를 모르는 에이전트(UNKNOWN_AGENT_TYPE)도 섞음
+    type_codes = rng.integers(UNKNOWN_AGENT_TYPE, 2, size=num_agents)
+    
+    start = time.perf_counter()
+    for positions in trajectory:
+        scratch.reset()
+        scratch.build(positions, type_codes)
+    scratch_time = (time.perf_counter() - start) / steps
+    
+    start = time.perf_counter()
+    for positions in trajectory:
+        graph = incremental.build(positions, type_codes)
+    incremental_time = (time.perf_counter() - start) / steps
+    
+    if k is None and num_agents <= 2000:
+        edges = set(zip(*graph.edge_index.tolist()))
+        if edges != _brute_force_edges(trajectory[-1], radius):
+            raise AssertionError("incremental graph differs from brute force")
+    # 간선 종류는 GNNPolicy 의 임베딩 인덱스 범위 안이어야 함
+    if graph.num_edges and not 0 <= graph.edge_type.min() <= graph.edge_type.max() < NUM_NODE_TYPES ** 2:
+        raise AssertionError("edge types out of embedding range")
+    
+    return {
+        'num_agents': num_agents,
+        'edges': graph.num_edges,
+        'scratch_ms': scratch_time * 1000,
+        'incremental_ms': incremental_time * 1000,
+        'rebuilds': incremental.stats['rebuilds'],
+        'partial_updates': incremental.stats['partial_updates'],
+    }
+
+
+def run_batched(num_envs: int, num_agents: int, steps: int = 50, radius: float = 50.0,
+                speed: float = 2.0, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    size = np.sqrt(num_agents * np.pi * radius ** 2 / 8)
+    trajectory = np.stack([_random_walk(rng, num_agents, steps, size, speed)
+                           for _ in range(num_envs)], axis=1)  # [T, N, A, 2]
+    type_codes = rng.integers(0, 2, size=num_agents)
+    builder = BatchedGraphBuilder(num_envs, radius=radius)
+    
+    start = time.perf_counter()
+    for positions in trajectory:
+        graph = builder.build(positions, type_codes)
+    elapsed = (time.perf_counter() - start) / steps
+    
+    # 서로 다른 환경의 노드 사이에는 간선이 없어야 함
+    if (graph.batch[graph.edge_index[0]] != graph.batch[graph.edge_index[1]]).any():
+        raise AssertionError("batched graph has edges across environments")
+    return {
+        'num_envs': num_envs,
+        'nodes': graph.num_nodes,
+        'edges': graph.num_edges,
+        'build_ms': elapsed * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--num-envs', type=int, default=None)
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--radius', type=float, default=50.0)
+    parser.add_argument('--k', type=int, default=None)
+    args = parser.parse_args()
+    
+    if args.num_envs is not None:
+        print(f"{'envs':>6} {'agents':>7} {'nodes':>8} {'edges':>9} {'build(ms)':>10}")
+        for num_agents in args.num_agents:
+            r = run_batched(args.num_envs, num_agents, args.steps, args.radius)
+            print(f"{r['num_envs']:>6} {num_agents:>7} {r['nodes']:>8} {r['edges']:>9} {r['build_ms']:>10.2f}")
+        return
+    
+    print(f"{'agents':>7} {'edges':>9} {'scratch(ms)':>12} {'incremental(ms)':>16} {'rebuilds':>9} {'partial':>8} {'speedup':>8}")
+    for num_agents in args.num_agents:
+        r = run(num_agents, args.steps, args.radius, k=args.k)
+        print(f"{num_agents:>7} {r['edges']:>9} {r['scratch_ms']:>12.2f} {r['incremental_ms']:>16.2f} "
+              f"{r['rebuilds']:>9} {r['partial_updates']:>8} {r['scratch_ms'] / r['incremental_ms']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""주요 진입점의 import 시간 벤치마크 (python -X importtime)
+
+진입점마다 새 인터프리터를 띄워 -X importtime 출력의 최상위 모듈 누적 시간을 합한다.
+cold 는 빈 PYTHONPYCACHEPREFIX 로 바이트코드 캐시 없이 (모든 모듈을 다시 컴파일), warm 은 캐시가 있는
+상태로 --repeats 번 실행한 중앙값이다. 무거운 의존성(torch, pygame, yaml)이 딸려 오는지도 표시한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeats 10 --no-cold --top 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+SRC = Path(__file__).resolve().parent.parent
+CONFIG = SRC.parent / 'configs' / 'rescue_mission.yaml'
+
+ENTRY_POINTS = {
+    'utils.registry': "import utils.registry",
+    'scenario validate': f"from utils.scenario import ScenarioBuilder; ScenarioBuilder({str(CONFIG)!r}).validate()",
+    'rescue_env': "import environments.rescue.rescue_env",
+    'vec_rescue_env': "import environments.rescue.vec_rescue_env",
+    'subproc_vec_env': "import environments.rescue.subproc_vec_env",
+    'ppo_policy': "import policies.ppo.ppo_policy",
+    'main': "import main",
+}
+
+HEAVY_MODULES = ('torch', 'pygame', 'yaml')
+
+
+def measure(code: str, pycache_prefix: Optional[str] = None) -> Tuple[float, float, List[Tuple[float, str]]]:
+    """(import 시간 ms, 프로세스 전체 시간 ms, [(self 시간 ms, 모듈)]) 를 반환"""
+    env = dict(os.environ)
+    env.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    if pycache_prefix is not None:
+        env['PYTHONPYCACHEPREFIX'] = pycache_prefix
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=SRC, env=env,
+                            capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1e3
+    if result.returncode != 0:
+        raise RuntimeError(f"failed to run {code!r}:\n{result.stderr[-2000:]}")
+
+    total_us, modules = 0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not name[1:].startswith(' '):  # 최상위 import
+            total_us += int(cumulative_us)
+        modules.append((int(self_us) / 1e3, name.strip()))
+    return total_us / 1e3, wall_ms, modules
+
+
+def run(name: str, code: str, repeats: int, cold: bool, top: int) -> Dict[str, object]:
+    cold_ms = None
+    if cold:
+        with tempfile.TemporaryDirectory(prefix='pycache-') as prefix:
+            cold_ms, _, _ = measure(code, prefix)
+    samples = [measure(code) for _ in range(repeats)]
+    modules = samples[-1][2]
+    loaded = {module for _, module in modules}
+    return {
+        'entry': name,
+        'cold_ms': cold_ms,
+        'warm_ms': float(np.median([s[0] for s in samples])),
+        'wall_ms': float(np.median([s[1] for s in samples])),
+        'heavy': [module for module in HEAVY_MODULES if module in loaded],
+        'top': sorted(modules, reverse=True)[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', nargs='+', choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--no-cold', action='store_true', help="바이트코드 캐시 없는 실행은 건너뜀 (느림)")
+    parser.add_argument('--top', type=int, default=0, help="self 시간이 큰 모듈을 몇 개 보여줄지")
+    args = parser.parse_args()
+
+    print(f"{'entry':<18} {'cold(ms)':>9} {'warm(ms)':>9} {'process(ms)':>12}  heavy deps")
+    for name in args.entries:
+        r = run(name, ENTRY_POINTS[name], args.repeats, not args.no_cold, args.top)
+        cold = f"{r['cold_ms']:9.1f}" if r['cold_ms'] is not None else f"{'-':>9}"
+        print(f"{name:<18} {cold} {r['warm_ms']:9.1f} {r['wall_ms']:12.1f}  {', '.join(r['heavy']) or '-'}")
+        for self_ms, module in r['top']:
+            print(f"{'':<20}{self_ms:8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
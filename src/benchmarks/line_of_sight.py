@@ -0,0 +1,119 @@
+"""가림 판정 (LineOfSight) 벤치마크: 시야 질의 비용, 캐시 효과, 정확도
+
+에이전트 수 x 장애물 수 조합마다 _compute_visibility 를 (a) 가림 판정 없이, (b) 모든 에이전트가 움직여
+모든 쌍을 다시 추적할 때, (c) --moving 비율의 에이전트만 움직일 때(나머지 쌍은 캐시) 잰다.
+보이는 (에이전트, 대상) 쌍 중 가려진 비율도 보고한다. 정확도는 광선 위를 0.25px 간격으로 촘촘히
+표본 추출한 기준 판정과 DDA 결과가 일치하는 비율이다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.line_of_sight --num-agents 100 300 --obstacles 1000 4000
+"""
+import argparse
+import time
+import numpy as np
+from environments.rescue.line_of_sight import LineOfSight
+from benchmarks.suite import make_rescue_env
+
+
+def _reference(los: LineOfSight, origins: np.ndarray, targets: np.ndarray, layers: np.ndarray,
+               radius: float) -> np.ndarray:
+    """광선 위 표본점의 칸을 모두 검사하는 느린 기준 판정 (trace 와 같은 시작/대상 칸 규칙)"""
+    c = los.cell_size
+    visible = np.ones(len(origins), dtype=bool)
+    for i, (origin, target, layer) in enumerate(zip(origins, targets, layers)):
+        samples = int(np.hypot(*(target - origin)) * 4) + 2
+        points = origin + np.linspace(0, 1, samples)[:, None] * (target - origin)
+        cells = np.floor(points / c).astype(np.int64)
+        cells = cells[np.r_[True, (np.diff(cells, axis=0) != 0).any(axis=1)]]
+        start, end = np.floor(origin / c).astype(np.int64), np.floor(target / c).astype(np.int64)
+        for cell in cells:
+            if (cell == start).all() or (cell == end).all():
+                continue
+            if los.opaque[layer * los.rows * los.cols + cell[1] * los.cols + cell[0]]:
+                visible[i] = (np.abs((cell + 0.5) * c - target) < radius + c / 2).all()
+                break
+    return visible
+
+
+def accuracy(env, pairs: int, seed: int = 0) -> float:
+    los = env.visibility.line_of_sight
+    rng = np.random.default_rng(seed)
+    origins = rng.uniform(0, [env.width, env.height], size=(pairs, 2))
+    angles = rng.uniform(0, 2 * np.pi, pairs)
+    lengths = rng.uniform(0, 150, pairs)
+    targets = np.clip(origins + lengths[:, None] * np.stack([np.cos(angles), np.sin(angles)], axis=1),
+                      0, [env.width, env.height])
+    layers = rng.integers(0, 2, pairs)
+    fast = los.trace(origins, targets, layers)
+    return float(np.mean(fast == _reference(los, origins, targets, layers, 0.0)))
+
+
+def _time_visibility(env, repeats: int, move=None) -> float:
+    total = 0.0
+    for _ in range(repeats):
+        if move is not None:
+            move()
+        start = time.perf_counter()
+        env._compute_visibility()
+        total += time.perf_counter() - start
+    return total / repeats * 1e3
+
+
+def run(num_agents: int, obstacles: int, map_size: str, moving: float, repeats: int, seed: int = 0) -> dict:
+    env = make_rescue_env({'agents': num_agents, 'obstacles': obstacles, 'map': map_size}, seed)
+    count = env.registry.count
+    plain = env._compute_visibility()
+    plain_ms = _time_visibility(env, repeats)
+
+    env.visibility.line_of_sight = LineOfSight(env.occupancy)
+    env._compute_visibility()
+    los = env.visibility.line_of_sight
+    occluded = env._compute_visibility()
+    rng = np.random.default_rng(seed)
+    positions = env.registry.positions
+
+    def jitter(fraction):
+        def move():
+            rows = np.flatnonzero(rng.random(count) < fraction)
+            step = rng.choice([-1.0, 1.0], size=(len(rows), 2))
+            positions[rows] = np.clip(positions[rows] + step, 0, [env.width, env.height])
+        return move
+
+    traced = los.traced
+    all_ms = _time_visibility(env, repeats, jitter(1.0))
+    traced_all = (los.traced - traced) / repeats
+    traced, cached = los.traced, los.cached
+    partial_ms = _time_visibility(env, repeats, jitter(moving))
+    candidates = len(plain.patient_indices) + len(plain.obstacle_indices)
+    visible = len(occluded.patient_indices) + len(occluded.obstacle_indices)
+    return {
+        'plain_ms': plain_ms,
+        'all_ms': all_ms,
+        'partial_ms': partial_ms,
+        'pairs': traced_all,
+        'occluded': 1 - visible / max(candidates, 1),
+        'cache_hit': (los.cached - cached) / max(los.cached - cached + los.traced - traced, 1),
+        'accuracy': accuracy(env, 500, seed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[100, 300])
+    parser.add_argument('--obstacles', type=int, nargs='+', default=[1000, 4000])
+    parser.add_argument('--map', default='1600x1200')
+    parser.add_argument('--moving', type=float, default=0.2, help="부분 이동 실행에서 매 스텝 움직이는 에이전트 비율")
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'agents':>7} {'obstacles':>10} {'pairs':>8} {'no LOS(ms)':>11} {'all moved(ms)':>14} "
+          f"{f'{args.moving:.0%} moved(ms)':>15} {'cache hit':>10} {'occluded':>9} {'accuracy':>9}")
+    for num_agents in args.num_agents:
+        for obstacles in args.obstacles:
+            r = run(num_agents, obstacles, args.map, args.moving, args.repeats)
+            print(f"{num_agents:>7} {obstacles:>10} {r['pairs']:>8.0f} {r['plain_ms']:>11.2f} {r['all_ms']:>14.2f} "
+                  f"{r['partial_ms']:>15.2f} {r['cache_hit']:>10.1%} {r['occluded']:>9.1%} {r['accuracy']:>9.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""흐름장 내비게이션 벤치마크: 전체 재계산 vs. 점진적 수정, O(1) 조회 vs. 에이전트별 탐색
+
+맵마다 NavigationField 를 처음부터 만든 시간과, 장애물을 --changes 개 추가/제거한 뒤 update() 로
+고친 시간(과 BFS 반복 수)을 비교하고, 고친 거리장이 새로 만든 거리장과 같은지(parity) 확인한다.
+조회는 모든 에이전트의 다음 이동량을 한 번에 구하는 query() 와, 에이전트마다 격자에서 가장 가까운
+환자까지 BFS 로 경로를 찾는 기준 구현(--baseline-agents 명으로 재서 에이전트당 시간)을 비교한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.navigation --maps 800x600 1600x1200 --changes 1 10 50
+"""
+import argparse
+import time
+from collections import deque
+import numpy as np
+from environments.rescue.constants import ObstacleType
+from environments.rescue.navigation import NavigationField, FLOW_STEPS
+from benchmarks.suite import make_rescue_env
+
+
+def _bfs_move(field: NavigationField, layer: int, start, targets) -> tuple:
+    """기준 구현: start 격자점에서 가장 가까운 환자 격자점까지 BFS 후 첫 걸음"""
+    if start in targets:
+        return 0, 0
+    h_open, v_open = field.h_open[layer], field.v_open[layer]
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        c, r = node = queue.popleft()
+        if node in targets:
+            while parent[node] != start:
+                node = parent[node]
+            return node[0] - start[0], node[1] - start[1]
+        neighbours = []
+        if c > 0 and h_open[r, c - 1]:
+            neighbours.append((c - 1, r))
+        if c < field.cols - 1 and h_open[r, c]:
+            neighbours.append((c + 1, r))
+        if r > 0 and v_open[r - 1, c]:
+            neighbours.append((c, r - 1))
+        if r < field.rows - 1 and v_open[r, c]:
+            neighbours.append((c, r + 1))
+        for neighbour in neighbours:
+            if neighbour not in parent:
+                parent[neighbour] = node
+                queue.append(neighbour)
+    return 0, 0
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1e3, result
+
+
+def run_repair(env, changes: int, rng) -> dict:
+    field = NavigationField(env)
+    build_ms, _ = _timed(field.update)
+    g = env.grid_size
+    cells = rng.integers(1, [env.width // g, env.height // g], size=(changes, 2)) * g
+    added = list(dict.fromkeys(tuple(pos) for pos in cells.tolist() if tuple(pos) not in env.obstacles))
+    result = {'build_ms': build_ms, 'changes': len(added)}
+    for mode in ('add', 'remove'):
+        for pos in added:
+            if mode == 'add':
+                env.add_obstacle(pos, ObstacleType.NORMAL)
+            else:
+                env.remove_obstacle(pos)
+        iterations = field.iterations
+        repair_ms, _ = _timed(field.update)
+        fresh = NavigationField(env)
+        fresh.update()
+        result[mode + '_ms'] = repair_ms
+        result[mode + '_iterations'] = field.iterations - iterations
+        result[mode + '_parity'] = bool(np.array_equal(field.distance, fresh.distance)
+                                        and np.array_equal(field.flow, fresh.flow))
+    return result
+
+
+def run_query(env, baseline_agents: int, repeats: int = 20) -> dict:
+    field = NavigationField(env)
+    field.update()
+    count = env.registry.count
+    positions = env.registry.positions[:count]
+    can_fly = env.registry.can_fly[:count]
+    speeds = env.registry.speeds[:count]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        moves, _ = field.query(positions, can_fly, speeds)
+    query_ms = (time.perf_counter() - start) / repeats * 1e3
+
+    # 격자점 위 에이전트로 기준 구현과 첫 걸음의 거리 감소가 같은지 확인
+    g = env.grid_size
+    nodes = np.rint(positions[:baseline_agents] / g).astype(np.int64)
+    nodes = np.clip(nodes, 0, [field.cols - 1, field.rows - 1])
+    patient_nodes = {tuple(node) for node in np.clip(np.rint(np.array(env.patients) / g).astype(np.int64), 0,
+                                                       [field.cols - 1, field.rows - 1]).tolist()}
+    start = time.perf_counter()
+    steps = [_bfs_move(field, int(layer), tuple(node), patient_nodes)
+             for node, layer in zip(nodes.tolist(), can_fly[:baseline_agents])]
+    baseline_ms = (time.perf_counter() - start) * 1e3 / max(len(steps), 1)
+    layers = can_fly[:baseline_agents].astype(np.int64)
+    flow = FLOW_STEPS[field.flow[layers, nodes[:, 1], nodes[:, 0]]]
+    best = field.best_distance
+    after_flow = best[layers, nodes[:, 1] + flow[:, 1], nodes[:, 0] + flow[:, 0]]
+    steps = np.array(steps).reshape(-1, 2)
+    after_bfs = best[layers, nodes[:, 1] + steps[:, 1], nodes[:, 0] + steps[:, 0]]
+    return {
+        'agents': count,
+        'query_ms': query_ms,
+        'query_us_per_agent': query_ms * 1e3 / count,
+        'baseline_us_per_agent': baseline_ms * 1e3,
+        'agreement': bool(np.array_equal(after_flow, after_bfs)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--maps', nargs='+', default=['800x600', '1600x1200'])
+    parser.add_argument('--obstacles-per-megapixel', type=int, default=400)
+    parser.add_argument('--changes', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--agents', type=int, default=2000)
+    parser.add_argument('--baseline-agents', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'map':>10} {'changes':>8} {'build(ms)':>10} {'add(ms)':>8} {'iters':>6} {'remove(ms)':>11} "
+          f"{'iters':>6}  parity")
+    for map_size in args.maps:
+        width, height = map(int, map_size.split('x'))
+        obstacles = args.obstacles_per_megapixel * width * height // 1_000_000
+        for changes in args.changes:
+            env = make_rescue_env({'agents': 0, 'obstacles': obstacles, 'map': map_size}, args.seed)
+            r = run_repair(env, changes, np.random.default_rng(args.seed))
+            print(f"{map_size:>10} {r['changes']:>8} {r['build_ms']:>10.1f} {r['add_ms']:>8.1f} "
+                  f"{r['add_iterations']:>6} {r['remove_ms']:>11.1f} {r['remove_iterations']:>6}  "
+                  f"{r['add_parity'] and r['remove_parity']}")
+
+    print(f"\n{'map':>10} {'agents':>7} {'query(ms)':>10} {'us/agent':>9} {'BFS us/agent':>13} {'speedup':>8}  agreement")
+    for map_size in args.maps:
+        width, height = map(int, map_size.split('x'))
+        obstacles = args.obstacles_per_megapixel * width * height // 1_000_000
+        env = make_rescue_env({'agents': args.agents, 'obstacles': obstacles, 'map': map_size}, args.seed)
+        r = run_query(env, args.baseline_agents)
+        print(f"{map_size:>10} {r['agents']:>7} {r['query_ms']:>10.2f} {r['query_us_per_agent']:>9.2f} "
+              f"{r['baseline_us_per_agent']:>13.1f} {r['baseline_us_per_agent'] / r['query_us_per_agent']:>7.0f}x  "
+              f"{r['agreement']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""관찰 인코딩 벤치마크: 에이전트별 리스트 -> 텐서 변환 vs. ObservationEncoder 일괄 인코딩
+
+정상 상태에서 매 스텝 할당되는 메모리(tracemalloc)와 출력 버퍼 재할당 여부를 함께 보고하고,
+결과가 에이전트별 순수 파이썬 인코딩과 같은지 확인한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.observation_encoder --num-agents 3 100 1000
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import torch
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.observation_encoder import ObservationEncoder, FeatureBatch
+from agents.types.drone import DroneAgent
+from agents.types.wheeled import WheeledAgent
+
+
+def _make_env(num_agents: int, seed: int) -> RescueEnv:
+    rng = np.random.default_rng(seed)
+    env = RescueEnv()
+    env.setup_default_environment()
+    for pos in rng.integers(0, [env.width, env.height], size=(20, 2)).tolist():
+        env.add_patient(tuple(pos))
+    for i, pos in enumerate(rng.integers(0, [env.width, env.height], size=(num_agents, 2)).tolist()):
+        env.add_agent((DroneAgent if i % 2 == 0 else WheeledAgent)(tuple(pos), i))
+    env.reset()
+    return env
+
+
+def _python_features(encoder: ObservationEncoder, env: RescueEnv, agent, state) -> list:
+    """기존 방식: 에이전트 관찰 리스트에서 파이썬으로 특징 하나씩 계산"""
+    features = [0.0] * encoder.state_dim
+    features[encoder.type_offset + env.registry.type_code(agent)] = 1.0
+    x, y = agent.pos
+    features[encoder.position_offset] = x / env.width
+    features[encoder.position_offset + 1] = y / env.height
+    scale = agent.view_range or 1.0
+    observation = agent.get_observation(state)
+    
+    patients = [((px - x) / scale, (py - y) / scale) for px, py in observation['patients']]
+    patients.sort(key=lambda d: d[0] ** 2 + d[1] ** 2)
+    for slot, (dx, dy) in enumerate(patients[:encoder.num_patients]):
+        features[encoder.patient_offset + 3 * slot:encoder.patient_offset + 3 * slot + 3] = [dx, dy, 1.0]
+    
+    obstacles = [((ox - x) / scale, (oy - y) / scale, float(obs_type == 'AERIAL'))
+                 for (ox, oy), obs_type in observation['obstacles']]
+    obstacles.sort(key=lambda d: d[0] ** 2 + d[1] ** 2)
+    for slot, (dx, dy, aerial) in enumerate(obstacles):
+        if slot < encoder.num_obstacles:
+            features[encoder.obstacle_offset + 4 * slot:encoder.obstacle_offset + 4 * slot + 4] = [dx, dy, aerial, 1.0]
+        cx = min(max(int((dx + 1.0) * encoder.patch_size / 2), 0), encoder.patch_size - 1)
+        cy = min(max(int((dy + 1.0) * encoder.patch_size / 2), 0), encoder.patch_size - 1)
+        features[encoder.patch_offset + cy * encoder.patch_size + cx] = 1.0
+    features[encoder.message_offset] = min(len(agent.received_messages) / encoder.message_scale, 1.0)
+    return features
+
+
+def run(num_agents: int, steps: int = 20, seed: int = 0) -> dict:
+    env = _make_env(num_agents, seed)
+    rng = np.random.default_rng(seed)
+    encoder = env.observation_encoder
+    batch = FeatureBatch(encoder.state_dim)
+    
+    def step():
+        env.step([(tuple(move), None) for move in rng.integers(-2, 3, size=(num_agents, 2)).tolist()])
+    
+    # 기존 방식: 에이전트마다 리스트 -> torch.tensor -> stack
+    python_time = 0.0
+    for _ in range(3):
+        step()
+        visibility = env._compute_visibility()
+        state = dict(env._get_state(), visibility=visibility)
+        start = time.perf_counter()
+        inputs = torch.stack([torch.tensor(_python_features(encoder, env, agent, state), dtype=torch.float32)
+                              for agent in env.agents])
+        python_time += (time.perf_counter() - start) / 3
+        encoded = encoder.encode_env(env, visibility)
+        if not np.allclose(encoded, inputs.numpy(), atol=1e-6):
+            raise AssertionError("ObservationEncoder differs from per-agent encoding")
+    
+    # 일괄 인코딩 + 정책 입력 텐서 (워밍업 후 버퍼 주소가 바뀌지 않아야 함)
+    observations = env.observe()
+    batch(observations)
+    encoder_ptr, batch_ptr = encoder.tensor.data_ptr(), batch(observations).data_ptr()
+    encode_time = 0.0
+    allocated = 0
+    for _ in range(steps):
+        step()
+        visibility = env._compute_visibility()
+        start = time.perf_counter()
+        encoder.encode_env(env, visibility)
+        encode_time += (time.perf_counter() - start) / steps
+        # 임시 배열 할당량은 시간 측정과 분리해서 잼
+        tracemalloc.start()
+        encoder.encode_env(env, visibility)
+        allocated = max(allocated, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        observations = env.observe()
+        policy_input = batch(observations)
+    reallocated = encoder.tensor.data_ptr() != encoder_ptr or policy_input.data_ptr() != batch_ptr
+    
+    return {
+        'num_agents': num_agents,
+        'python_ms': python_time * 1000,
+        'encoder_ms': encode_time * 1000,
+        'peak_temp_kb': allocated / 1024,
+        'buffer_reallocated': reallocated,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[3, 100, 1000])
+    parser.add_argument('--steps', type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"{'agents':>7} {'python(ms)':>11} {'encoder(ms)':>12} {'speedup':>8} {'temp peak(KB)':>14} {'realloc':>8}")
+    for num_agents in args.num_agents:
+        r = run(num_agents, args.steps)
+        print(f"{num_agents:>7} {r['python_ms']:>11.2f} {r['encoder_ms']:>12.3f} "
+              f"{r['python_ms'] / r['encoder_ms']:>7.1f}x {r['peak_temp_kb']:>14.1f} "
+              f"{str(r['buffer_reallocated']):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""회전 관찰자 스캔 벤치마크: 객체마다 atan2 로 시야각을 검사하는 방식 vs. 극좌표 인덱스
+
+객체 수마다 (a) 모든 객체에 _is_in_view_cone 을 부르는 기준 스캔과 (b) Observer.scan (쓸고 지나간
+각도 구간만 이진 탐색) 의 스캔당 시간(중앙값)을 비교한다. Observer.scan 은 state['patients_version']
+으로 목록 변경을 판단할 때와 목록 내용 해시로 판단할 때를 따로 잰다. 인덱스의 현재 시야각 결과가
+기준 검사와 같은지(parity; 목록 중간 환자를 제자리에서 고친 뒤도 포함), 긴 에피소드 동안 감지 기록
+크기가 max_detections 에서 멈추는지도 보고한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.observer_scan --objects 1000 10000 100000 --ticks 2000
+"""
+import argparse
+import time
+import numpy as np
+from agents.entities.observer import Observer
+
+
+def baseline_scan(observer: Observer, patients) -> list:
+    """예전 스캔과 같은 객체별 검사 (시야각 전체를 매번 검사)"""
+    return [pos for pos in patients if observer._is_in_view_cone(pos)]
+
+
+def _parity(observer: Observer, patients) -> bool:
+    expected = {i for i, pos in enumerate(patients) if observer._is_in_view_cone(pos)}
+    return expected == set(observer.in_view().tolist())
+
+
+def _edit_parity(observer: Observer, patients, state: dict) -> bool:
+    """목록 중간 환자를 지금 시야각 안으로 제자리에서 옮긴 뒤 스캔해도 기준 검사와 같은지"""
+    middle = len(patients) // 2
+    angle = observer.current_angle + np.radians(observer.rotation_speed)
+    # 이미 그 자리에 있으면 바뀐 것이 없으므로 더 먼 곳으로
+    distance = 100 if patients[middle] != (int(observer.pos[0] + 100 * np.cos(angle)),
+                                           int(observer.pos[1] + 100 * np.sin(angle))) else 200
+    patients[middle] = (int(observer.pos[0] + distance * np.cos(angle)),
+                        int(observer.pos[1] + distance * np.sin(angle)))
+    if 'patients_version' in state:
+        state['patients_version'] += 1
+    detected = observer.scan(state)
+    return _parity(observer, patients) and patients[middle] in [d['position'] for d in detected]
+
+
+def _ticks(observer: Observer, patients, state: dict, ticks: int):
+    samples, largest, parity = [], 0, True
+    for tick in range(1, ticks + 1):
+        state['time'] = tick
+        start = time.perf_counter()
+        observer.scan(state)
+        samples.append(time.perf_counter() - start)
+        largest = max(largest, len(observer.detected_objects))
+        if tick % max(ticks // 5, 1) == 0:
+            parity &= _parity(observer, patients)
+    return samples, largest, parity
+
+
+def run(num_objects: int, ticks: int, baseline_ticks: int, max_detections: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    patients = [tuple(pos) for pos in rng.integers(0, 2000, size=(num_objects, 2)).tolist()]
+    observer = Observer((1000, 1000), 800, max_detections=max_detections)
+    state = {'patients': patients, 'patients_version': 0, 'time': 0}
+    observer.scan(state)  # 인덱스 생성
+    samples, largest, parity = _ticks(observer, patients, state, ticks)
+    parity &= _edit_parity(observer, patients, state)
+
+    # 버전 없이 내용 해시로 목록 변경을 판단 (매 스캔 O(환자 수) 해시)
+    hashed = Observer((1000, 1000), 800, max_detections=max_detections)
+    hashed_state = {'patients': list(patients), 'time': 0}
+    hashed.scan(hashed_state)
+    hashed_samples, _, hashed_parity = _ticks(hashed, hashed_state['patients'], hashed_state, max(ticks // 10, 1))
+    parity &= hashed_parity and _edit_parity(hashed, hashed_state['patients'], hashed_state)
+
+    reference = Observer((1000, 1000), 800)
+    baseline = []
+    for _ in range(baseline_ticks):
+        reference.current_angle = (reference.current_angle + np.radians(reference.rotation_speed)) % (2 * np.pi)
+        start = time.perf_counter()
+        baseline_scan(reference, patients)
+        baseline.append(time.perf_counter() - start)
+    return {
+        'scan_ms': float(np.median(samples)) * 1e3,
+        'hashed_ms': float(np.median(hashed_samples)) * 1e3,
+        'baseline_ms': float(np.median(baseline)) * 1e3,
+        'store': len(observer.detected_objects),
+        'largest': largest,
+        'parity': parity,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--baseline-ticks', type=int, default=5)
+    parser.add_argument('--max-detections', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'objects':>8} {'baseline(ms)':>13} {'scan(ms)':>9} {'speedup':>8} {'hashed(ms)':>11} {'store':>7} "
+          f"{'max store':>10}  parity")
+    for num_objects in args.objects:
+        r = run(num_objects, args.ticks, args.baseline_ticks, args.max_detections)
+        print(f"{num_objects:>8} {r['baseline_ms']:>13.2f} {r['scan_ms']:>9.3f} "
+              f"{r['baseline_ms'] / r['scan_ms']:>7.0f}x {r['hashed_ms']:>11.3f} {r['store']:>7} {r['largest']:>10}  {r['parity']}")
+
+
+if __name__ == '__main__':
+    main()
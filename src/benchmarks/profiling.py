@@ -0,0 +1,112 @@
+"""StepProfiler 비용 벤치마크: 꺼진 상태 / 켜진 상태의 step 시간 비교와 cProfile 핫스팟 보고서
+
+꺼진 프로파일러의 비용은 `with profiler.phase(...)` 한 번의 비용에 스텝당 단계 호출 수를 곱해
+스텝 시간 대비 비율로 추정한다.
+
+예외로 끝난 step 뒤에 cProfile 이 꺼졌는지도 확인한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.profiling --num-agents 3 100 1000 --steps 300
+    python -m benchmarks.profiling --num-agents 100 --cprofile-steps 200 --report step_profile.txt
+"""
+import argparse
+import cProfile
+import os
+import sys
+import time
+import numpy as np
+from benchmarks.suite import BASE, make_rescue_env
+from utils.profiling import StepProfiler
+
+
+def _step_ms(env, steps: int, seed: int) -> float:
+    rng = np.random.default_rng(seed)
+    moves = rng.integers(-2, 3, size=(steps, len(env.agents), 2)).tolist()
+    start = time.perf_counter()
+    for t in range(steps):
+        env.step([(tuple(move), None) for move in moves[t]])
+    return (time.perf_counter() - start) / steps * 1000
+
+
+def _disabled_phase_ns(repeats: int = 200000) -> float:
+    profiler = StepProfiler()
+    start = time.perf_counter_ns()
+    for _ in range(repeats):
+        with profiler.phase('x'):
+            pass
+    return (time.perf_counter_ns() - start) / repeats
+
+
+def check_failed_step(num_agents: int = 3) -> bool:
+    """cProfile 로 감싼 step 이 예외로 끝난 뒤 프로파일러가 꺼져 있는지"""
+    env = make_rescue_env(dict(BASE, agents=num_agents))
+    env.profiler = StepProfiler(cprofile_steps=5, cprofile_path=os.devnull)
+    try:
+        env.step([None] * len(env.agents))  # 행동 형식이 틀려 TypeError
+    except TypeError:
+        pass
+    if sys.getprofile() is not None:
+        return False
+    probe = cProfile.Profile()
+    try:
+        probe.enable()  # 다른 프로파일러가 켜져 있으면 ValueError (3.12+)
+    except ValueError:
+        return False
+    probe.disable()
+    return True
+
+
+def run(num_agents: int, steps: int = 300, seed: int = 0) -> dict:
+    params = dict(BASE, agents=num_agents)
+    disabled = make_rescue_env(params, seed)
+    disabled_ms = _step_ms(disabled, steps, seed)
+    
+    enabled = make_rescue_env(params, seed)
+    enabled.profiler = StepProfiler(enabled=True, window=steps)
+    enabled_ms = _step_ms(enabled, steps, seed)
+    summary = enabled.profiler.summary()
+    # 스텝당 profiler 호출 수 (phase 와 begin/end_step, count 호출)
+    calls_per_step = sum(stats['total_calls'] for name, stats in summary.items() if name != 'step') / steps + 3
+    
+    return {
+        'num_agents': num_agents,
+        'disabled_ms': disabled_ms,
+        'enabled_ms': enabled_ms,
+        'calls_per_step': calls_per_step,
+        'summary': summary,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[3, 100, 1000])
+    parser.add_argument('--steps', type=int, default=300)
+    parser.add_argument('--cprofile-steps', type=int, default=0, help="첫 N 스텝을 cProfile 로 감싸 보고서 작성")
+    parser.add_argument('--report', default='step_profile.txt')
+    args = parser.parse_args()
+    
+    if not check_failed_step():
+        raise AssertionError("cProfile left enabled after a failed step")
+    phase_ns = _disabled_phase_ns()
+    print(f"disabled phase(): {phase_ns:.0f} ns per call")
+    print(f"{'agents':>7} {'disabled(ms)':>13} {'enabled(ms)':>12} {'enabled cost':>13} {'calls/step':>11} "
+          f"{'disabled cost':>14}")
+    for num_agents in args.num_agents:
+        r = run(num_agents, args.steps)
+        disabled_pct = r['calls_per_step'] * phase_ns / 1e6 / r['disabled_ms'] * 100
+        print(f"{num_agents:>7} {r['disabled_ms']:>13.3f} {r['enabled_ms']:>12.3f} "
+              f"{(r['enabled_ms'] / r['disabled_ms'] - 1) * 100:>12.1f}% {r['calls_per_step']:>11.0f} "
+              f"{disabled_pct:>13.2f}%")
+        for name, stats in sorted(r['summary'].items(), key=lambda item: -item[1]['mean_ms']):
+            print(f"{'':>9}{name:<20} mean {stats['mean_ms']:8.3f} ms  p50 {stats['p50_ms']:8.3f}  "
+                  f"p99 {stats['p99_ms']:8.3f}")
+    
+    if args.cprofile_steps:
+        env = make_rescue_env(dict(BASE, agents=args.num_agents[0]))
+        env.profiler = StepProfiler(cprofile_steps=args.cprofile_steps, cprofile_path=args.report)
+        _step_ms(env, args.cprofile_steps, 0)
+        print(f"wrote cProfile hotspot report for {args.cprofile_steps} steps to {args.report}")
+
+
+if __name__ == '__main__':
+    main()
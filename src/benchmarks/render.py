@@ -0,0 +1,150 @@
+"""렌더링 벤치마크: 매 프레임 전체를 다시 그리는 방식 vs. 캐시된 배경 레이어
+
+맵 크기별로 장애물/환자/에이전트 수를 면적에 비례해 늘리고 초당 프레임 수를 잰다.
+기본은 그리기 비용만 보도록 'human' 모드(SDL dummy 드라이버)이고, --render-mode rgb_array 는
+프레임 배열 복사 비용까지 포함한다.
+움직이는 요소를 뺀 장면에서 두 방식의 프레임이 픽셀 단위로 같은지도 확인한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.render --sizes 800x600 1600x1200 3200x2400 --frames 30
+    python -m benchmarks.render --render-mode rgb_array
+"""
+import argparse
+import math
+import os
+import time
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.constants import ObstacleType, Colors, RescueConfig
+from agents.types.drone import DroneAgent
+from agents.types.wheeled import WheeledAgent
+
+
+class _RedrawEveryFrame(RescueEnv):
+    """비교 대상: 매 프레임 폰트를 새로 만들고 그리드/장애물/라벨과 화면 두 배 크기의 시야각 표면을 다시 그림"""
+    
+    def render(self):
+        if not self._ensure_screen(self.width, self.height, "Rescue Mission"):
+            return None
+        import pygame
+        self.screen.fill(Colors.WHITE)
+        surface = pygame.Surface((self.width * 2, self.height * 2), pygame.SRCALPHA)
+        points = [(self.observer.pos[0], self.observer.pos[1])]
+        start_angle = self.observer.current_angle - self.observer.fov/2
+        end_angle = self.observer.current_angle + self.observer.fov/2
+        for i in range(51):
+            angle = start_angle + (end_angle - start_angle) * i / 50
+            points.append((self.observer.pos[0] + math.cos(angle) * self.observer.view_range,
+                           self.observer.pos[1] + math.sin(angle) * self.observer.view_range))
+        pygame.draw.polygon(surface, (0, 0, 255, 30), points)
+        self.screen.blit(surface, (0, 0))
+        
+        for x in range(0, self.width, self.grid_size):
+            pygame.draw.line(self.screen, Colors.BLACK, (x, 0), (x, self.height))
+        for y in range(0, self.height, self.grid_size):
+            pygame.draw.line(self.screen, Colors.BLACK, (0, y), (self.width, y))
+        font = pygame.font.Font(None, 20)
+        for i, pos in enumerate(self.patients):
+            pygame.draw.circle(self.screen, Colors.RED, pos, RescueConfig.PATIENT_RADIUS)
+            self.screen.blit(font.render(f"Patient {i+1}", True, Colors.RED), (pos[0] - 30, pos[1] - 20))
+        font = pygame.font.Font(None, 20)
+        for pos, obs_type in self.obstacles.items():
+            color = Colors.PURPLE if obs_type == ObstacleType.AERIAL else Colors.BLACK
+            pygame.draw.rect(self.screen, color, pygame.Rect(int(pos[0] - RescueConfig.OBSTACLE_SIZE/2),
+                                                             int(pos[1] - RescueConfig.OBSTACLE_SIZE/2),
+                                                             RescueConfig.OBSTACLE_SIZE, RescueConfig.OBSTACLE_SIZE))
+            label = f"{'Aerial' if obs_type == ObstacleType.AERIAL else 'Normal'} Obs"
+            self.screen.blit(font.render(label, True, color), (pos[0] - 35, pos[1] - 25))
+        font = pygame.font.Font(None, 20)
+        positions = self.registry.positions[:self.registry.count].tolist()
+        for i, (pos, type_name) in enumerate(zip(positions, self.registry.type_names)):
+            pygame.draw.circle(self.screen, Colors.GREEN, pos, RescueConfig.AGENT_RADIUS)
+            self.screen.blit(font.render(f"{type_name} {i+1}", True, Colors.GREEN), (pos[0] - 35, pos[1] - 20))
+        font = pygame.font.Font(None, 20)
+        self.screen.blit(font.render("Observer", True, Colors.BLUE),
+                         (self.observer.pos[0] - 30, self.observer.pos[1] - 25))
+        pygame.draw.circle(self.screen, Colors.BLUE, self.observer.pos, RescueConfig.OBSERVER_RADIUS)
+        return self._present()
+
+
+def _make_env(env_cls, width: int, height: int, seed: int, dynamic: bool = True,
+              render_mode: str = 'rgb_array') -> RescueEnv:
+    rng = np.random.default_rng(seed)
+    env = env_cls(width, height, render_mode=render_mode)
+    scale = width * height / (800 * 600)
+    grid = RescueConfig.DEFAULT_GRID_SIZE
+    cells = rng.choice((width // grid) * (height // grid), size=int(40 * scale), replace=False)
+    for cell in cells.tolist():
+        pos = ((cell % (width // grid)) * grid, (cell // (width // grid)) * grid)
+        env.add_obstacle(pos, ObstacleType.AERIAL if cell % 3 == 0 else ObstacleType.NORMAL)
+    if dynamic:
+        for pos in rng.integers(0, [width, height], size=(int(10 * scale), 2)).tolist():
+            env.add_patient(tuple(pos))
+        for i, pos in enumerate(rng.integers(0, [width, height], size=(int(10 * scale), 2)).tolist()):
+            env.add_agent((DroneAgent if i % 2 == 0 else WheeledAgent)(tuple(pos), i))
+    env.reset()
+    return env
+
+
+def _fps(env: RescueEnv, frames: int, seed: int):
+    rng = np.random.default_rng(seed)
+    moves = rng.integers(-2, 3, size=(frames, len(env.agents), 2)).tolist()
+    env.render()  # 첫 프레임(pygame 초기화, 배경 레이어 생성)은 제외
+    start = time.perf_counter()
+    for t in range(frames):
+        env.step([(tuple(move), None) for move in moves[t]])
+        env.render()
+    render_steps = time.perf_counter() - start
+    # 같은 스텝만 진행한 시간을 빼서 렌더링 비용만 남김
+    start = time.perf_counter()
+    for t in range(frames):
+        env.step([(tuple(move), None) for move in moves[t]])
+    steps_only = time.perf_counter() - start
+    return frames / max(render_steps - steps_only, 1e-9)
+
+
+def run(width: int, height: int, frames: int = 30, render_mode: str = 'human', seed: int = 0) -> dict:
+    legacy = _make_env(_RedrawEveryFrame, width, height, seed, render_mode=render_mode)
+    legacy_fps = _fps(legacy, frames, seed)
+    legacy.close()
+    cached = _make_env(RescueEnv, width, height, seed, render_mode=render_mode)
+    cached_fps = _fps(cached, frames, seed)
+    cached.close()
+    
+    # 정적 레이어 확인: 움직이는 요소(에이전트, 환자, 시야각)를 빼면 두 프레임이 같아야 함
+    static = [_make_env(env_cls, width, height, seed, dynamic=False) for env_cls in (_RedrawEveryFrame, RescueEnv)]
+    for env in static:
+        env.observer.view_range = 0
+    if not np.array_equal(static[0].render(), static[1].render()):
+        raise AssertionError("cached background layer differs from the full redraw")
+    for env in static:
+        env.close()
+    return {
+        'size': f"{width}x{height}",
+        'obstacles': len(cached.obstacles),
+        'agents': len(cached.agents),
+        'legacy_fps': legacy_fps,
+        'cached_fps': cached_fps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', nargs='+', default=['800x600', '1600x1200', '3200x2400'])
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--render-mode', choices=['human', 'rgb_array'], default='human')
+    args = parser.parse_args()
+    
+    print(f"{'size':>10} {'obstacles':>10} {'agents':>7} {'redraw fps':>11} {'cached fps':>11} {'speedup':>8}")
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split('x'))
+        r = run(width, height, args.frames, args.render_mode)
+        print(f"{r['size']:>10} {r['obstacles']:>10} {r['agents']:>7} {r['legacy_fps']:>11.1f} "
+              f"{r['cached_fps']:>11.1f} {r['cached_fps'] / r['legacy_fps']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""롤아웃 버퍼 벤치마크: 경험 딕셔너리 목록 + 파이썬 GAE vs. RolloutBuffer
+
+드론(에이전트 0, 1)과 바퀴 에이전트(2)가 서로 다른 PPOPolicy 를 쓰면서 하나의 버퍼를 공유한다.
+GAE 결과는 (환경, 에이전트)별 파이썬 루프와 비교해 검증한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.rollout_buffer --num-envs 16 64 --num-steps 128
+"""
+import argparse
+import time
+import numpy as np
+import torch
+from policies.ppo.ppo_policy import PPOPolicy
+from policies.ppo.rollout_buffer import RolloutBuffer
+
+AGENT_GROUPS = {'drone': [0, 1], 'wheeled': [2]}
+
+
+def _python_gae(experiences, last_values, num_envs, num_agents, gamma, gae_lambda):
+    """경험 딕셔너리 목록에서 (환경, 에이전트)마다 GAE 계산"""
+    advantages = {}
+    for env in range(num_envs):
+        for agent in range(num_agents):
+            advantage = 0.0
+            next_value = last_values[env][agent]
+            for t in reversed(range(len(experiences))):
+                step = experiences[t][(env, agent)]
+                not_done = 1.0 - step['done']
+                delta = step['reward'] + gamma * next_value * not_done - step['value']
+                advantage = delta + gamma * gae_lambda * not_done * advantage
+                advantages[(t, env, agent)] = advantage
+                next_value = step['value']
+    return advantages
+
+
+def run(num_envs: int, num_steps: int = 128, obs_dim: int = 64, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    torch.manual_seed(seed)
+    num_agents = 3
+    policies = {name: PPOPolicy(obs_dim, 2, update_epochs=1) for name in AGENT_GROUPS}
+    buffer = RolloutBuffer(num_steps, num_envs, num_agents, obs_dim)
+    observations = rng.standard_normal((num_steps, num_envs, num_agents, obs_dim)).astype(np.float32)
+    rewards = rng.standard_normal((num_steps, num_envs, num_agents)).astype(np.float32)
+    dones = rng.random((num_steps, num_envs)) < 0.02
+    
+    # 수집: 정책별로 자기 에이전트 열을 한 번에 행동 선택하고 버퍼에 기록
+    actions = np.zeros((num_envs, num_agents, 2), dtype=np.float32)
+    log_probs = np.zeros((num_envs, num_agents), dtype=np.float32)
+    values = np.zeros((num_envs, num_agents), dtype=np.float32)
+    start = time.perf_counter()
+    for t in range(num_steps):
+        for name, columns in AGENT_GROUPS.items():
+            obs = observations[t][:, columns].reshape(-1, obs_dim)
+            action, log_prob, value = policies[name].act(obs)
+            actions[:, columns] = action.view(num_envs, len(columns), 2).numpy()
+            log_probs[:, columns] = log_prob.view(num_envs, len(columns)).numpy()
+            values[:, columns] = value.view(num_envs, len(columns)).numpy()
+        buffer.add(observations[t], actions, log_probs, values, rewards[t], dones[t])
+    collect_time = time.perf_counter() - start
+    
+    # 비교 대상: 같은 경험을 스텝별 딕셔너리로 보관하던 방식
+    recorded_values = buffer.values.numpy()
+    experiences = [{(env, agent): {'reward': float(rewards[t, env, agent]), 'done': float(dones[t, env]),
+                                   'value': float(recorded_values[t, env, agent])}
+                    for env in range(num_envs) for agent in range(num_agents)}
+                   for t in range(num_steps)]
+    last_values = rng.standard_normal((num_envs, num_agents)).astype(np.float32)
+    
+    start = time.perf_counter()
+    expected = _python_gae(experiences, last_values.tolist(), num_envs, num_agents,
+                           buffer.gamma, buffer.gae_lambda)
+    python_gae_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    buffer.compute_returns_and_advantages(last_values)
+    gae_time = time.perf_counter() - start
+    
+    expected_array = np.array([expected[(t, env, agent)] for t in range(num_steps)
+                               for env in range(num_envs) for agent in range(num_agents)])
+    if not np.allclose(buffer.advantages.numpy().reshape(-1), expected_array, atol=1e-3):
+        raise AssertionError("vectorized GAE differs from the per-agent loop")
+    
+    start = time.perf_counter()
+    for name, columns in AGENT_GROUPS.items():
+        policies[name].update({'buffer': buffer, 'agent_indices': columns})
+    update_time = time.perf_counter() - start
+    
+    return {
+        'num_envs': num_envs,
+        'samples': num_steps * num_envs * num_agents,
+        'collect_ms': collect_time * 1000,
+        'python_gae_ms': python_gae_time * 1000,
+        'gae_ms': gae_time * 1000,
+        'update_ms': update_time * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, nargs='+', default=[16, 64])
+    parser.add_argument('--num-steps', type=int, default=128)
+    args = parser.parse_args()
+    
+    print(f"{'envs':>5} {'samples':>8} {'collect(ms)':>12} {'python GAE(ms)':>15} {'GAE(ms)':>8} "
+          f"{'speedup':>8} {'update(ms)':>11}")
+    for num_envs in args.num_envs:
+        r = run(num_envs, args.num_steps)
+        print(f"{num_envs:>5} {r['samples']:>8} {r['collect_ms']:>12.1f} {r['python_gae_ms']:>15.1f} "
+              f"{r['gae_ms']:>8.2f} {r['python_gae_ms'] / r['gae_ms']:>7.0f}x {r['update_ms']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""시나리오 컴파일 캐시 벤치마크: 직접 배치 vs. 컴파일(첫 실행) vs. 캐시 불러오기(이후 실행)
+
+직접 배치는 지금까지처럼 add_obstacle 을 장애물마다 부르고 첫 step 에서 시야 인덱스를 만드는 비용이고,
+캐시 불러오기는 새 ScenarioBuilder (새 워커와 같음) 가 아티팩트를 memory-map 해서 환경을 만드는 비용이다.
+불러온 환경이 직접 배치한 환경과 같은 장애물/occupancy/시야 결과를 내는지도 확인한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.scenario --maps 800x600 4000x3000 --obstacles 200 20000
+"""
+import argparse
+import shutil
+import tempfile
+import time
+import numpy as np
+from utils.scenario import ScenarioBuilder
+from utils.registry import registry
+
+
+def scenario(width: int, height: int, obstacles: int, seed: int = 0) -> dict:
+    return {
+        'environment': {
+            'type': 'rescue', 'width': width, 'height': height, 'grid_size': 20,
+            'layout': 'default',
+            'random_obstacles': {'count': obstacles, 'seed': seed, 'aerial_fraction': 0.3},
+        },
+        'agents': [
+            {'type': 'drone', 'params': {'pos': [100, 100], 'id': 0}},
+            {'type': 'wheeled', 'params': {'pos': [100, 160], 'id': 1}},
+        ],
+    }
+
+
+def _timed(fn, repeats: int = 1):
+    best, result = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3, result
+
+
+def _direct(config: dict):
+    """캐시 없이 배치하고 시야 인덱스까지 만든 환경"""
+    builder = ScenarioBuilder(config, cache_dir=None)
+    env = builder.build_environment()
+    builder.build_agents(env)
+    env.reset()
+    env._compute_visibility()
+    return env
+
+
+def _check_parity(reference, loaded) -> bool:
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, [reference.width, reference.height], size=(256, 2))
+    radii = rng.uniform(50, 300, size=256)
+    expected = reference.visibility.query(centers, radii, np.array(reference.patients))
+    loaded._compute_visibility()
+    actual = loaded.visibility.query(centers, radii, np.array(loaded.patients))
+    return (reference.obstacles == loaded.obstacles and reference.patients == loaded.patients
+            and np.array_equal(reference.occupancy.blocked, loaded.occupancy.blocked)
+            and np.array_equal(expected.obstacle_offsets, actual.obstacle_offsets)
+            and np.array_equal(expected.obstacle_indices, actual.obstacle_indices)
+            and reference._get_state()['obstacles'] == loaded._get_state()['obstacles'])
+
+
+def run(width: int, height: int, obstacles: int, repeats: int = 5) -> dict:
+    config = scenario(width, height, obstacles)
+    cache_dir = tempfile.mkdtemp(prefix='scenario-bench-')
+    try:
+        direct_ms, reference = _timed(lambda: _direct(config))
+        cold_ms, _ = _timed(lambda: ScenarioBuilder(config, cache_dir=cache_dir).build())
+        warm_ms, loaded = _timed(lambda: ScenarioBuilder(config, cache_dir=cache_dir).build(), repeats)
+        return {
+            'map': f"{width}x{height}",
+            'obstacles': len(reference.obstacles),
+            'direct_ms': direct_ms,
+            'cold_ms': cold_ms,
+            'warm_ms': warm_ms,
+            'parity': _check_parity(reference, loaded),
+        }
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--maps', nargs='+', default=['800x600', '4000x3000'])
+    parser.add_argument('--obstacles', type=int, nargs='+', default=[200, 20000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    # torch 등 모듈 import 비용은 측정에서 제외
+    for name in ('rescue', 'warehouse'):
+        registry.get_environment(name)
+    for name in ('drone', 'wheeled', 'observer'):
+        registry.get_agent(name)
+    print(f"{'map':>10} {'obstacles':>10} {'direct(ms)':>11} {'compile(ms)':>12} {'cached(ms)':>11} "
+          f"{'speedup':>8} {'parity':>7}")
+    for size in args.maps:
+        width, height = map(int, size.split('x'))
+        for obstacles in args.obstacles:
+            r = run(width, height, obstacles, args.repeats)
+            print(f"{r['map']:>10} {r['obstacles']:>10} {r['direct_ms']:>11.1f} {r['cold_ms']:>12.1f} "
+                  f"{r['warm_ms']:>11.1f} {r['direct_ms'] / r['warm_ms']:>7.1f}x {str(r['parity']):>7}")
+
+
+if __name__ == '__main__':
+    main()
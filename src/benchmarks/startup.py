@@ -0,0 +1,86 @@
+"""환경 생성 비용 벤치마크: headless vs. 창 모드
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.startup --num-envs 100
+"""
+import argparse
+import multiprocessing as mp
+import os
+import time
+from typing import Dict, Any
+
+
+def _rss_mb() -> float:
+    """현재 프로세스의 RSS (MB)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(env_name: str, render_mode, num_envs: int, queue):
+    """새 프로세스에서 환경 num_envs개를 만들고 시간/메모리를 측정"""
+    if render_mode == 'human' and not os.environ.get('DISPLAY'):
+        # 디스플레이가 없는 서버에서도 창 모드 비용을 잴 수 있도록
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    if env_name == 'rescue':
+        from environments.rescue.rescue_env import RescueEnv as Env
+    else:
+        from environments.warehouse.warehouse_env import WarehouseEnv as Env
+    import_time = time.perf_counter() - start
+    
+    envs = []
+    start = time.perf_counter()
+    for _ in range(num_envs):
+        env = Env(render_mode=render_mode)
+        if render_mode is not None:
+            # 예전 동작(생성자에서 창 생성)과 같은 비용을 만들기 위해 한 번 렌더링
+            env.render()
+        envs.append(env)
+    construct_time = time.perf_counter() - start
+    
+    queue.put({
+        'env': env_name,
+        'render_mode': str(render_mode),
+        'num_envs': num_envs,
+        'import_s': import_time,
+        'construct_s': construct_time,
+        'per_env_ms': construct_time / num_envs * 1000,
+        'rss_delta_mb': _rss_mb() - rss_before,
+    })
+
+
+def run(num_envs: int = 100) -> list:
+    ctx = mp.get_context('spawn')
+    results = []
+    for env_name in ['rescue', 'warehouse']:
+        for render_mode in [None, 'rgb_array', 'human']:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_measure, args=(env_name, render_mode, num_envs, queue))
+            proc.start()
+            result: Dict[str, Any] = queue.get()
+            proc.join()
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, default=100)
+    args = parser.parse_args()
+    
+    print(f"{'env':<10} {'render_mode':<10} {'import(s)':>10} {'per env(ms)':>12} {'RSS(MB)':>9}")
+    for r in run(args.num_envs):
+        print(f"{r['env']:<10} {r['render_mode']:<10} {r['import_s']:>10.3f} "
+              f"{r['per_env_ms']:>12.3f} {r['rss_delta_mb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""RescueEnv.step 상태 생성 비용 벤치마크: 호출마다 재생성 vs. 버전별 스냅샷 캐시
+
+'rebuild' 는 변경 전 step 처럼 두 번의 observer 스캔과 에이전트별 _get_state 호출을
+모두 전체 재생성으로 수행한다. 할당량은 tracemalloc 으로 잰 스텝당 임시 메모리 최대치다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.state_snapshot --num-obstacles 100 1000 10000
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.constants import ObstacleType
+from agents.types.drone import DroneAgent
+from agents.types.wheeled import WheeledAgent
+
+
+class _RebuildEveryCall(RescueEnv):
+    """변경 전처럼 호출마다 상태 전체를 다시 만드는 환경"""
+    
+    def _get_state(self):
+        self.invalidate_state()
+        return super()._get_state()
+    
+    def step(self, actions):
+        # 변경 전 step 에 있던 두 번째 observer 스캔과 에이전트별 상태 생성
+        self.observer.scan(self._get_state())
+        for _ in self.agents:
+            self._get_state()
+        return super().step(actions)
+
+
+def _make_env(env_class, num_obstacles: int, num_agents: int) -> RescueEnv:
+    rng = np.random.default_rng(0)
+    env = env_class()
+    env.setup_default_environment()
+    while len(env.obstacles) < num_obstacles:
+        pos = (int(rng.integers(0, env.width)), int(rng.integers(0, env.height)))
+        env.add_obstacle(pos, ObstacleType.AERIAL)
+    for i in range(num_agents):
+        env.add_agent(DroneAgent((100, 100 + i), i) if i % 2 == 0 else WheeledAgent((100, 100 + i), i))
+    env.reset()
+    return env
+
+
+def _measure(env: RescueEnv, steps: int) -> dict:
+    actions = [((1, 0), None)] * len(env.agents)
+    env.step(actions)  # 워밍업 (정적 캐시 생성)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(actions)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    peaks = []
+    for _ in range(steps):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        env.step(actions)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return {'step_us': elapsed / steps * 1e6, 'peak_kb': float(np.median(peaks)) / 1024}
+
+
+def run(num_obstacles: int, num_agents: int = 3, steps: int = 100) -> dict:
+    return {
+        'num_obstacles': num_obstacles,
+        'rebuild': _measure(_make_env(_RebuildEveryCall, num_obstacles, num_agents), steps),
+        'cached': _measure(_make_env(RescueEnv, num_obstacles, num_agents), steps),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-obstacles', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--num-agents', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=100)
+    args = parser.parse_args()
+    
+    print(f"{'obstacles':>10} {'rebuild(us)':>12} {'cached(us)':>11} {'rebuild(KB)':>12} {'cached(KB)':>11}")
+    for num_obstacles in args.num_obstacles:
+        r = run(num_obstacles, args.num_agents, args.steps)
+        print(f"{num_obstacles:>10} {r['rebuild']['step_us']:>12.1f} {r['cached']['step_us']:>11.1f} "
+              f"{r['rebuild']['peak_kb']:>12.1f} {r['cached']['peak_kb']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
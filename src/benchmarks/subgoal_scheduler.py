@@ -0,0 +1,101 @@
+"""서브골 스케줄러 벤치마크: 매 스텝 HighLevelPolicy forward vs. SubgoalScheduler
+
+같은 환경에서 (a) 모든 에이전트가 매 스텝 HighLevelPolicy.select_actions 를 부르는 경우와
+(b) SubgoalScheduler 가 서브골을 캐시하고 사건이 있을 때만 다시 계획하는 경우를 비교한다.
+상위 정책이 처리한 에이전트 수(에이전트-스텝당), forward 호출 수, 행동 선택 시간(과 배속), 전체 스텝 처리량,
+재계획 사유별 횟수를 보고한다. --message-rate 로 에이전트가 메시지를 보내면 message 사건이 생긴다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.subgoal_scheduler --num-agents 30 300 --replan-every 5 10 20
+"""
+import argparse
+import time
+import numpy as np
+from agents.base.base_policy import select_actions_by_policy
+from policies.hierarchical.high_level import HighLevelPolicy
+from policies.hierarchical.subgoal_scheduler import SubgoalScheduler
+from benchmarks.suite import make_rescue_env
+
+
+def _messages(rng, count: int, rate: float):
+    senders = rng.random(count) < rate
+    return [{'type': 'help'} if sent else None for sent in senders.tolist()]
+
+
+def run_baseline(policy: HighLevelPolicy, num_agents: int, obstacles: int, steps: int,
+                 message_rate: float, seed: int = 0) -> dict:
+    env = make_rescue_env({'agents': num_agents, 'obstacles': obstacles, 'map': '800x600'}, seed)
+    for agent in env.agents:
+        agent.policy = policy
+    rng = np.random.default_rng(seed)
+    observations = env.observe()
+    policy_time = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        movements = select_actions_by_policy(env.agents, observations)
+        policy_time += time.perf_counter() - t0
+        messages = _messages(rng, num_agents, message_rate)
+        _, observations, _, _ = env.step(list(zip(map(tuple, movements.tolist()), messages)))
+    elapsed = time.perf_counter() - start
+    return {
+        'inferred_agents': steps * num_agents,
+        'forward_calls': steps,
+        'policy_ms': policy_time / steps * 1e3,
+        'steps_per_s': steps / elapsed,
+    }
+
+
+def run_scheduler(policy: HighLevelPolicy, num_agents: int, obstacles: int, steps: int,
+                  message_rate: float, replan_every: int, seed: int = 0) -> dict:
+    env = make_rescue_env({'agents': num_agents, 'obstacles': obstacles, 'map': '800x600'}, seed)
+    scheduler = SubgoalScheduler(policy, replan_every=replan_every)
+    rng = np.random.default_rng(seed)
+    observations = env.observe()
+    policy_time = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        movements = scheduler.act(env, observations)
+        policy_time += time.perf_counter() - t0
+        messages = _messages(rng, num_agents, message_rate)
+        _, observations, _, _ = env.step(list(zip(map(tuple, movements.tolist()), messages)))
+    elapsed = time.perf_counter() - start
+    stats = scheduler.stats()
+    return {
+        'inferred_agents': stats['replans'],
+        'forward_calls': stats['high_level_calls'],
+        'policy_ms': policy_time / steps * 1e3,
+        'steps_per_s': steps / elapsed,
+        'replan_rate': stats['replan_rate'],
+        'reasons': stats['reasons'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[30, 300])
+    parser.add_argument('--replan-every', type=int, nargs='+', default=[5, 10, 20])
+    parser.add_argument('--obstacles', type=int, default=200)
+    parser.add_argument('--steps', type=int, default=300)
+    parser.add_argument('--message-rate', type=float, default=0.0)
+    parser.add_argument('--state-dim', type=int, default=64)
+    args = parser.parse_args()
+
+    policy = HighLevelPolicy(args.state_dim, 2)
+    print(f"{'agents':>7} {'mode':>12} {'inferred/agent-step':>20} {'forwards':>9} {'policy(ms)':>11} "
+          f"{'policy x':>9} {'steps/s':>8} {'speedup':>8}  replan reasons")
+    for num_agents in args.num_agents:
+        base = run_baseline(policy, num_agents, args.obstacles, args.steps, args.message_rate)
+        print(f"{num_agents:>7} {'every step':>12} {1.0:>20.3f} {base['forward_calls']:>9} "
+              f"{base['policy_ms']:>11.3f} {'1.0x':>9} {base['steps_per_s']:>8.0f} {'1.0x':>8}")
+        for replan_every in args.replan_every:
+            r = run_scheduler(policy, num_agents, args.obstacles, args.steps, args.message_rate, replan_every)
+            reasons = ', '.join(f"{reason} {count}" for reason, count in r['reasons'].items() if count)
+            print(f"{num_agents:>7} {f'k={replan_every}':>12} {r['replan_rate']:>20.3f} {r['forward_calls']:>9} "
+                  f"{r['policy_ms']:>11.3f} {base['policy_ms'] / r['policy_ms']:>8.1f}x {r['steps_per_s']:>8.0f} "
+                  f"{r['steps_per_s'] / base['steps_per_s']:>7.1f}x  {reasons}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""멀티프로세스 환경 확장성 벤치마크: 워커 수별 env-steps/sec
+
+워커마다 같은 수의 환경(--envs-per-worker)을 맡기므로 코어가 충분하면 처리량이 워커 수에
+비례해야 한다. 기준으로 한 프로세스의 VecRescueEnv 처리량도 함께 보고한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.subproc_vec_env --workers 1 2 4 8 16 32 --envs-per-worker 64
+    python -m benchmarks.subproc_vec_env --workers 4 --kill-worker  # 워커 강제 종료 후 재시작 확인
+"""
+import argparse
+import functools
+import os
+import signal
+import time
+import numpy as np
+from environments.rescue.vec_rescue_env import VecRescueEnv
+from environments.rescue.subproc_vec_env import SubprocVecEnv
+from benchmarks.vec_env import make_env
+
+
+def run_single(num_envs: int, steps: int, max_steps: int = 200, seed: int = 0) -> float:
+    rng = np.random.default_rng(seed)
+    vec_env = VecRescueEnv([make_env(max_steps) for _ in range(num_envs)])
+    vec_env.reset()
+    actions = rng.integers(-2, 3, size=(steps,) + vec_env.positions.shape)
+    start = time.perf_counter()
+    for t in range(steps):
+        vec_env.step(actions[t])
+    return num_envs * steps / (time.perf_counter() - start)
+
+
+def run(num_workers: int, envs_per_worker: int, steps: int, max_steps: int = 200,
+        kill_worker: bool = False, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    num_envs = num_workers * envs_per_worker
+    env = SubprocVecEnv(functools.partial(make_env, max_steps), num_envs, num_workers, max_steps=max_steps)
+    try:
+        observations = env.reset()
+        actions = rng.integers(-2, 3, size=(steps,) + observations.shape).astype(np.int64)
+        env.step(actions[0])  # 워밍업
+        restarted = []
+        start = time.perf_counter()
+        for t in range(steps):
+            if kill_worker and t == steps // 2:
+                os.kill(env._processes[0].pid, signal.SIGKILL)
+            _, _, _, info = env.step(actions[t])
+            restarted += info.get('restarted', [])
+        elapsed = time.perf_counter() - start
+    finally:
+        env.close()
+    return {
+        'workers': num_workers,
+        'envs': num_envs,
+        'env_steps_per_s': num_envs * steps / elapsed,
+        'restarted': restarted,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--envs-per-worker', type=int, default=64)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--kill-worker', action='store_true')
+    args = parser.parse_args()
+
+    print(f"CPU cores: {os.cpu_count()}")
+    single = run_single(args.envs_per_worker, args.steps)
+    print(f"single process VecRescueEnv ({args.envs_per_worker} envs): {single:,.0f} env-steps/s")
+    print(f"{'workers':>8} {'envs':>6} {'env-steps/s':>13} {'scaling':>8} {'restarted':>10}")
+    base = None
+    for num_workers in args.workers:
+        r = run(num_workers, args.envs_per_worker, args.steps, kill_worker=args.kill_worker)
+        base = base or r['env_steps_per_s'] / num_workers
+        print(f"{num_workers:>8} {r['envs']:>6} {r['env_steps_per_s']:>13,.0f} "
+              f"{r['env_steps_per_s'] / base:>7.1f}x {str(r['restarted']):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""환경 처리량 벤치마크 스위트 (python -m benchmarks)
+
+기준 시나리오에서 한 번에 한 축(에이전트 수, 장애물 수, 맵 크기, 메시지 비율, 환자 수)씩 바꿔 가며
+RescueEnv.step 을 서브시스템(이동, Observer 스캔, 통신, 관찰, 정책)별로 나눠 재고,
+전체 RescueEnv.step / WarehouseEnv.step 도 함께 잰다. 각 항목마다 초당 스텝 수, p50/p99 지연,
+파이썬 할당 최대치(tracemalloc, torch 내부 할당은 제외)를 JSON 으로 저장하고,
+--baseline 을 주면 같은 (case, subsystem) 항목과 비교해 느려진 항목을 표시하고 종료 코드 1 로 끝낸다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks --quick --output results.json
+    python -m benchmarks --sweep agents obstacles --output new.json --baseline results.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.constants import ObstacleType, RescueConfig
+from environments.warehouse.warehouse_env import WarehouseEnv
+from agents.types.drone import DroneAgent
+from agents.types.wheeled import WheeledAgent
+from agents.entities.observer import Observer as EntityObserver
+
+BASE = {'agents': 30, 'obstacles': 200, 'map': '800x600', 'message_rate': 0.1, 'patients': 1000}
+SWEEPS = {
+    'agents': [3, 100, 1000],
+    'obstacles': [100, 1000, 10000],
+    'map': ['800x600', '1600x1200', '3200x2400'],
+    'message_rate': [0.0, 0.5, 1.0],
+    'patients': [100, 10000, 100000],
+}
+QUICK_SWEEPS = {
+    'agents': [3, 100],
+    'obstacles': [100, 1000],
+    'map': ['800x600', '1600x1200'],
+    'message_rate': [0.0, 1.0],
+    'patients': [100, 10000],
+}
+SUBSYSTEMS = ('communication', 'observer_scan', 'movement', 'observations', 'policy')
+
+
+def _map_size(value: str) -> Tuple[int, int]:
+    width, height = (int(v) for v in value.split('x'))
+    return width, height
+
+
+def _random_cells(rng, width: int, height: int, count: int) -> List[Tuple[int, int]]:
+    """격자 칸 위의 서로 다른 위치 count 개"""
+    grid = RescueConfig.DEFAULT_GRID_SIZE
+    cols, rows = width // grid, height // grid
+    cells = rng.choice(cols * rows, size=min(count, cols * rows), replace=False)
+    return [(int(c % cols) * grid + grid // 2, int(c // cols) * grid + grid // 2) for c in cells]
+
+
+def make_rescue_env(params: Dict[str, Any], seed: int = 0) -> RescueEnv:
+    rng = np.random.default_rng(seed)
+    width, height = _map_size(params['map'])
+    env = RescueEnv(width, height)
+    for i, pos in enumerate(_random_cells(rng, width, height, params['obstacles'])):
+        env.add_obstacle(pos, ObstacleType.AERIAL if i % 3 == 0 else ObstacleType.NORMAL)
+    for pos in rng.integers(0, [width, height], size=(20, 2)).tolist():
+        env.add_patient(tuple(pos))
+    for i, pos in enumerate(rng.integers(0, [width, height], size=(params['agents'], 2)).tolist()):
+        env.add_agent((DroneAgent if i % 2 == 0 else WheeledAgent)(tuple(pos), i))
+    env.reset()
+    return env
+
+
+def make_warehouse_env(params: Dict[str, Any], seed: int = 0) -> WarehouseEnv:
+    """장애물 수만큼 선반을 두고 같은 수의 에이전트를 배치"""
+    rng = np.random.default_rng(seed)
+    width, height = _map_size(params['map'])
+    env = WarehouseEnv(width, height)
+    env.reset()
+    env.shelves.extend(_random_cells(rng, width, height, params['obstacles']))
+    for i, pos in enumerate(rng.integers(0, [width, height], size=(params['agents'], 2)).tolist()):
+        env.add_agent(WheeledAgent(tuple(pos), i))
+    return env
+
+
+def _rescue_subsystems(env: RescueEnv, params: Dict[str, Any], seed: int) -> List[Tuple[str, Callable[[], None]]]:
+    """RescueEnv.step 과 같은 순서로 나눈 단계들 (앞 단계 결과를 ctx 로 넘김)"""
+    from policies.ppo.ppo_policy import PPOPolicy
+    rng = np.random.default_rng(seed)
+    policy = PPOPolicy(env.observation_encoder.state_dim, 2)
+    count = len(env.agents)
+    ctx = {'detected': [], 'movements': np.zeros((count, 2)), 'observations': env.observe()}
+    
+    def communication():
+        channel = env.comm_channel
+        channel.advance(env.time)
+        channel.update_positions(env.registry.ids[:count].tolist() + [env.observer.id],
+                                 np.vstack([env.registry.positions[:count], env.observer.pos]))
+        channel.broadcast(-1, {'type': 'observation', 'data': ctx['detected']})
+        senders = rng.random(count) < params['message_rate']
+        for agent, send in zip(env.agents, senders.tolist()):
+            if send:
+                channel.broadcast(agent.id, {'type': 'status', 'pos': agent.pos})
+            agent.process_messages(channel.receive(agent.id))
+    
+    # RescueEnv 의 Observer 는 회전만 하는 타입이므로, 극좌표 인덱스로 스캔하는 회전 관찰자를
+    # 맵 중앙에 두고 환자 params['patients'] 명 (목록은 고정, patients_version 으로 표시) 을 스캔
+    scanner = EntityObserver((env.width // 2, env.height // 2), max(env.width, env.height) // 2)
+    scan_state = {'patients': [tuple(pos) for pos in rng.integers(0, [env.width, env.height],
+                                                                  size=(params['patients'], 2)).tolist()],
+                  'patients_version': 0, 'time': 0}
+    
+    def observer_scan():
+        scan_state['time'] = env.time
+        ctx['detected'] = scanner.scan(scan_state)
+    
+    def movement():
+        env._move_agents(ctx['movements'])
+        env.time += 1
+    
+    def observations():
+        visibility = env._compute_visibility()
+        state = env._get_state()
+        state['visibility'] = visibility
+        ctx['observations'] = env._get_observations(state, visibility)
+    
+    def policy_inference():
+        ctx['movements'] = policy.select_actions(ctx['observations']).astype(np.float64)
+    
+    return list(zip(SUBSYSTEMS, (communication, observer_scan, movement, observations, policy_inference)))
+
+
+def _rescue_step(env: RescueEnv, params: Dict[str, Any], seed: int) -> Callable[[], None]:
+    rng = np.random.default_rng(seed)
+    count = len(env.agents)
+    
+    def step():
+        moves = rng.integers(-2, 3, size=(count, 2)).tolist()
+        senders = (rng.random(count) < params['message_rate']).tolist()
+        env.step([(tuple(move), {'type': 'status'} if send else None) for move, send in zip(moves, senders)])
+    return step
+
+
+def _warehouse_step(env: WarehouseEnv, seed: int) -> Callable[[], None]:
+    rng = np.random.default_rng(seed)
+    count = len(env.agents)
+    
+    def step():
+        env.step([('move', tuple(move)) for move in rng.integers(-2, 3, size=(count, 2)).tolist()])
+    return step
+
+
+def _measure(stages: List[Tuple[str, Callable[[], None]]], steps: int, time_budget: float,
+             warmup: int = 2, memory_steps: int = 3) -> Dict[str, Dict[str, float]]:
+    """stages 를 순서대로 반복 실행하며 단계별 지연을 잼 (time_budget 초를 넘으면 일찍 멈춤, 최소 3회)
+    
+    할당 최대치는 지연 측정과 분리해 tracemalloc 으로 몇 번 더 돌려서 잰다.
+    """
+    for _ in range(warmup):
+        for _, stage in stages:
+            stage()
+    latencies = {name: [] for name, _ in stages}
+    start = time.perf_counter()
+    for i in range(steps):
+        for name, stage in stages:
+            t0 = time.perf_counter_ns()
+            stage()
+            latencies[name].append(time.perf_counter_ns() - t0)
+        if i >= 2 and time.perf_counter() - start > time_budget:
+            break
+    
+    peaks = {name: 0 for name, _ in stages}
+    tracemalloc.start()
+    for _ in range(memory_steps):
+        for name, stage in stages:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            stage()
+            peaks[name] = max(peaks[name], tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    
+    results = {}
+    for name, values in latencies.items():
+        ms = np.array(values, dtype=np.float64) / 1e6
+        results[name] = {
+            'samples': len(ms),
+            'steps_per_s': 1000.0 / ms.mean(),
+            'mean_ms': float(ms.mean()),
+            'p50_ms': float(np.percentile(ms, 50)),
+            'p99_ms': float(np.percentile(ms, 99)),
+            'peak_kb': peaks[name] / 1024,
+        }
+    return results
+
+
+def run_case(params: Dict[str, Any], steps: int = 200, time_budget: float = 2.0, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """한 시나리오의 서브시스템별/전체 스텝 측정 결과 {subsystem: 지표}"""
+    env = make_rescue_env(params, seed)
+    results = _measure(_rescue_subsystems(env, params, seed), steps, time_budget)
+    env = make_rescue_env(params, seed)
+    results.update(_measure([('rescue_step', _rescue_step(env, params, seed))], steps, time_budget))
+    env = make_warehouse_env(params, seed)
+    results.update(_measure([('warehouse_step', _warehouse_step(env, seed))], steps, time_budget))
+    return results
+
+
+def run_suite(sweeps: Dict[str, list], steps: int = 200, time_budget: float = 2.0, seed: int = 0,
+              log: Optional[Callable[[str], None]] = print) -> Dict[str, Any]:
+    """BASE 에서 한 축씩 바꾼 시나리오들을 재고 JSON 으로 저장할 딕셔너리를 반환"""
+    results = []
+    seen = set()
+    for sweep, values in sweeps.items():
+        for value in values:
+            params = dict(BASE, **{sweep: value})
+            case = ','.join(f"{key}={params[key]}" for key in BASE)
+            if case in seen:  # 다른 축에서 이미 잰 기준 시나리오
+                continue
+            seen.add(case)
+            for subsystem, metrics in run_case(params, steps, time_budget, seed).items():
+                results.append(dict(case=case, sweep=sweep, params=params, subsystem=subsystem, **metrics))
+            if log is not None:
+                log(f"measured {case}")
+    return {'meta': _metadata(steps, time_budget, seed), 'results': results}
+
+
+def _metadata(steps: int, time_budget: float, seed: int) -> Dict[str, Any]:
+    import torch
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'torch': torch.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'steps': steps,
+        'time_budget': time_budget,
+        'seed': seed,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2,
+            p99_threshold: float = 1.0, min_ms: float = 0.01, min_kb: float = 64.0) -> List[Dict[str, Any]]:
+    """baseline 과 같은 (case, subsystem) 항목을 비교해 회귀 목록을 반환
+    
+    p50 지연이나 할당 최대치가 threshold 비율 이상 늘면 회귀로 본다. p99 는 표본이 적으면 흔들리므로
+    더 느슨한 p99_threshold 를 쓴다. min_ms / min_kb 보다 작은 차이는 무시한다.
+    """
+    previous = {(r['case'], r['subsystem']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get((result['case'], result['subsystem']))
+        if old is None:
+            continue
+        for metric, limit, minimum in (('p50_ms', threshold, min_ms), ('p99_ms', p99_threshold, min_ms),
+                                       ('peak_kb', threshold, min_kb)):
+            before, after = old[metric], result[metric]
+            if after - before > minimum and after > before * (1 + limit):
+                regressions.append({'case': result['case'], 'subsystem': result['subsystem'], 'metric': metric,
+                                    'baseline': before, 'current': after,
+                                    'change_pct': (after / before - 1) * 100 if before else float('inf')})
+    return regressions
+
+
+def _print_results(report: Dict[str, Any]):
+    print(f"{'case':<72} {'subsystem':<15} {'steps/s':>10} {'p50(ms)':>9} {'p99(ms)':>9} {'peak(KB)':>9}")
+    for r in report['results']:
+        print(f"{r['case']:<72} {r['subsystem']:<15} {r['steps_per_s']:>10,.0f} {r['p50_ms']:>9.3f} "
+              f"{r['p99_ms']:>9.3f} {r['peak_kb']:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sweep', nargs='+', choices=list(SWEEPS), default=list(SWEEPS))
+    parser.add_argument('--quick', action='store_true', help="작은 스윕 (CI/빠른 확인용)")
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--time-budget', type=float, default=2.0, help="항목당 최대 측정 시간(초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="결과 JSON 경로")
+    parser.add_argument('--baseline', default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀로 볼 p50/메모리 증가 비율")
+    parser.add_argument('--p99-threshold', type=float, default=1.0, help="회귀로 볼 p99 증가 비율")
+    args = parser.parse_args(argv)
+    
+    sweeps = QUICK_SWEEPS if args.quick else SWEEPS
+    report = run_suite({name: sweeps[name] for name in args.sweep}, args.steps, args.time_budget, args.seed)
+    _print_results(report)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.p99_threshold)
+        report['baseline'] = args.baseline
+        report['regressions'] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['case']} {r['subsystem']} {r['metric']}: "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ({r['change_pct']:+.0f}%)")
+        if not regressions:
+            print(f"no regressions against {args.baseline}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.output}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
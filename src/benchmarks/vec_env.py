@@ -0,0 +1,81 @@
+"""VecRescueEnv 처리량 벤치마크 및 RescueEnv 와의 결과 일치 확인
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.vec_env --num-envs 64 --steps 500
+"""
+import argparse
+import time
+import numpy as np
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.vec_rescue_env import VecRescueEnv
+from agents.types.drone import DroneAgent
+from agents.types.wheeled import WheeledAgent
+
+
+def make_env(max_steps: int) -> RescueEnv:
+    """main.py 와 같은 기본 시나리오"""
+    env = RescueEnv(max_steps=max_steps)
+    env.setup_default_environment()
+    env.add_agent(DroneAgent((100, 100), 0))
+    env.add_agent(DroneAgent((100, 130), 1))
+    env.add_agent(WheeledAgent((100, 160), 2))
+    env.reset()
+    return env
+
+
+def run(num_envs: int, steps: int, max_steps: int = 200, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    envs = [make_env(max_steps) for _ in range(num_envs)]
+    vec_env = VecRescueEnv([make_env(max_steps) for _ in range(num_envs)])
+    vec_env.reset()
+    # 장애물에 부딪히도록 한쪽으로 치우친 무작위 이동
+    all_actions = rng.integers(-3, 6, size=(steps, num_envs, vec_env.num_agents, 2))
+    
+    start = time.perf_counter()
+    reference = []
+    for actions in all_actions:
+        positions = []
+        for env, env_actions in zip(envs, actions):
+            _, _, done, _ = env.step([(tuple(a), None) for a in env_actions.tolist()])
+            positions.append([agent.pos for agent in env.agents])
+            if done:
+                env.reset()
+        reference.append((positions, [[agent.pos for agent in env.agents] for env in envs]))
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    results = []
+    for actions in all_actions:
+        results.append(vec_env.step(actions))
+    vec_time = time.perf_counter() - start
+    
+    for (before_reset, after_reset), (positions, dones, info) in zip(reference, results):
+        if not np.array_equal(positions, np.array(after_reset)):
+            raise AssertionError("VecRescueEnv diverged from RescueEnv")
+        if dones.any() and not np.array_equal(info['final_positions'], np.array(before_reset)[dones]):
+            raise AssertionError("VecRescueEnv final positions diverged from RescueEnv")
+    
+    agent_steps = steps * num_envs * vec_env.num_agents
+    return {
+        'num_envs': num_envs,
+        'loop_agent_steps_per_s': agent_steps / loop_time,
+        'vec_agent_steps_per_s': agent_steps / vec_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, nargs='+', default=[1, 16, 64, 256])
+    parser.add_argument('--steps', type=int, default=500)
+    args = parser.parse_args()
+    
+    print(f"{'envs':>6} {'RescueEnv loop':>16} {'VecRescueEnv':>14} {'speedup':>8}   (agent-steps/s)")
+    for num_envs in args.num_envs:
+        r = run(num_envs, args.steps)
+        print(f"{r['num_envs']:>6} {r['loop_agent_steps_per_s']:>16.0f} "
+              f"{r['vec_agent_steps_per_s']:>14.0f} "
+              f"{r['vec_agent_steps_per_s'] / r['loop_agent_steps_per_s']:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
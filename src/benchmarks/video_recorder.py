@@ -0,0 +1,144 @@
+"""녹화 오버헤드 벤치마크: 녹화 없이 vs. k 스텝마다 rgb_array 프레임을 압축 청크로 저장
+
+rgb_array 프레임 복사(array3d vs. pixels2d 뷰)를 비교하고, 녹화 간격별로 시뮬레이션 루프가
+느려진 비율(벽시계), 루프 스레드가 capture 에 쓴 CPU 시간(쓰기 스레드 제외)과 그 비율, 루프가
+쓰기 스레드를 기다린 시간을 보고한다. 저장한 에피소드를 다시 읽어 프레임 수와 첫 프레임 내용도 확인한다.
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.video_recorder --every 1 10 50 200 --steps 2000
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from benchmarks.vec_env import make_env
+from utils.video_recorder import VideoRecorder
+
+
+def _readback_ms(env, repeats: int = 50):
+    """같은 화면에서 프레임 배열을 얻는 비용: 채널별 복사(array3d) vs. 픽셀 뷰 일괄 복사"""
+    import pygame
+    env.render()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        expected = np.transpose(pygame.surfarray.array3d(env.screen), (1, 0, 2))
+    array3d_ms = (time.perf_counter() - start) / repeats * 1000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        frame = env._present()
+    view_ms = (time.perf_counter() - start) / repeats * 1000
+    if not np.array_equal(frame, expected):
+        raise AssertionError("pixel view frame differs from array3d")
+    return array3d_ms, view_ms
+
+
+def _loop(steps: int, seed: int, recorder=None):
+    """(초당 스텝 수, 루프 스레드 CPU 시간, 그중 capture 에 쓴 CPU 시간, 첫 렌더링 준비 시간)
+    
+    CPU 시간은 time.thread_time 이라 쓰기 스레드의 변환/압축은 들어가지 않는다. 녹화할 때는
+    pygame 초기화와 정적 레이어/폰트 생성 (환경마다 한 번) 을 루프 전에 따로 잰다.
+    """
+    rng = np.random.default_rng(seed)
+    env = make_env(None)
+    env.render_mode = 'rgb_array'
+    setup_time = 0.0
+    if recorder is not None:
+        setup_start = time.perf_counter()
+        env.render()
+        setup_time = time.perf_counter() - setup_start
+    moves = rng.integers(-2, 3, size=(steps, len(env.agents), 2)).tolist()
+    capture_time = 0.0
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+    for t in range(steps):
+        env.step([(tuple(move), None) for move in moves[t]])
+        if recorder is not None:
+            capture_start = time.thread_time()
+            recorder.capture(env)
+            capture_time += time.thread_time() - capture_start
+    loop_cpu = time.thread_time() - cpu_start
+    if recorder is not None:
+        recorder.close()  # 남은 청크 쓰기까지 포함
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps / elapsed, loop_cpu, capture_time, setup_time
+
+
+def _record(directory: str, every: int, steps: int, chunk_size: int, seed: int):
+    recorder = VideoRecorder(directory, every=every, chunk_size=chunk_size)
+    return _loop(steps, seed, recorder) + (recorder,)
+
+
+def run(every: int, steps: int = 500, chunk_size: int = 32, seed: int = 0, repeats: int = 3) -> dict:
+    # 잡음을 줄이려고 기준 루프와 녹화 루프를 각각 여러 번 돌려 가장 빠른 것을 씀
+    baseline, baseline_cpu, _, _ = max((_loop(steps, seed) for _ in range(repeats)), key=lambda r: r[0])
+    with tempfile.TemporaryDirectory() as root:
+        directories = [os.path.join(root, str(i)) for i in range(repeats)]
+        runs = [_record(directory, every, steps, chunk_size, seed) for directory in directories]
+        best = max(range(repeats), key=lambda i: runs[i][0])
+        recorded, _, capture_time, setup_time, recorder = runs[best]
+        directory = directories[best]
+        # 프레임 전체를 메모리에 올리지 않도록 청크별로 steps 만 읽고 첫 프레임만 비교
+        paths = sorted(glob.glob(os.path.join(directory, '*.npz')))
+        recorded_steps = np.concatenate([np.load(path)['steps'] for path in paths])
+        if len(recorded_steps) != steps // every or not (recorded_steps % every == 0).all():
+            raise AssertionError("recorded episode has the wrong frames")
+        first_frame = np.load(paths[0])['frames'][0]
+        # 첫 프레임은 같은 시나리오를 같은 스텝까지 진행해 그린 프레임과 같아야 함
+        env = make_env(None)
+        env.render_mode = 'rgb_array'
+        moves = np.random.default_rng(seed).integers(-2, 3, size=(every, len(env.agents), 2)).tolist()
+        for t in range(every):
+            env.step([(tuple(move), None) for move in moves[t]])
+        if not np.array_equal(first_frame, env.render()):
+            raise AssertionError("recorded frame differs from the rendered frame")
+        env.close()
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 2**20
+    return {
+        'every': every,
+        'frames': len(recorded_steps),
+        'baseline_steps_per_s': baseline,
+        'recorded_steps_per_s': recorded,
+        'overhead_pct': (baseline / recorded - 1) * 100,
+        'loop_pct': capture_time / baseline_cpu * 100,
+        'capture_ms_per_frame': capture_time * 1000 / len(recorded_steps),
+        'setup_ms': setup_time * 1000,
+        'write_ms_per_frame': recorder.write_seconds * 1000 / len(recorded_steps),
+        'wait_ms': recorder.wait_seconds * 1000,
+        'size_mb': size_mb,
+        'raw_mb': len(recorded_steps) * first_frame.nbytes / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--every', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--chunk-size', type=int, default=32)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    env = make_env(None)
+    env.render_mode = 'rgb_array'
+    array3d_ms, view_ms = _readback_ms(env)
+    env.close()
+    print(f"frame readback: array3d {array3d_ms:.2f} ms, pixel view {view_ms:.2f} ms")
+    # 코어가 하나면 쓰기 스레드의 압축도 루프와 같은 코어를 나눠 쓰므로 overhead 에 포함된다
+    print(f"CPU cores: {os.cpu_count()}")
+    print(f"{'every':>6} {'frames':>7} {'base steps/s':>13} {'rec steps/s':>12} {'overhead':>9} {'loop CPU':>9} "
+          f"{'capture ms/frame':>17} {'setup(ms)':>10} {'write ms/frame':>15} {'wait(ms)':>9} {'MB (raw)':>14}")
+    for every in args.every:
+        r = run(every, args.steps, args.chunk_size, repeats=args.repeats)
+        print(f"{r['every']:>6} {r['frames']:>7} {r['baseline_steps_per_s']:>13,.0f} "
+              f"{r['recorded_steps_per_s']:>12,.0f} {r['overhead_pct']:>8.1f}% {r['loop_pct']:>8.1f}% "
+              f"{r['capture_ms_per_frame']:>17.2f} {r['setup_ms']:>10.1f} {r['write_ms_per_frame']:>15.2f} {r['wait_ms']:>9.1f} "
+              f"{r['size_mb']:>6.1f} ({r['raw_mb']:.0f})")
+
+
+if __name__ == '__main__':
+    main()
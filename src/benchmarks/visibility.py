@@ -0,0 +1,80 @@
+"""시야 질의 벤치마크: 에이전트별 스칼라 루프 vs. VisibilityEngine 일괄 계산
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.visibility --num-agents 3 100 1000 --num-obstacles 1000 10000 100000
+"""
+import argparse
+import time
+import numpy as np
+from environments.rescue.visibility import VisibilityEngine
+
+
+def _scalar_visible(pos, view_range, points) -> list:
+    """기존 get_observation 과 같은 객체별 np.sqrt 판정"""
+    visible = []
+    for i, obj_pos in enumerate(points):
+        dx = obj_pos[0] - pos[0]
+        dy = obj_pos[1] - pos[1]
+        if np.sqrt(dx**2 + dy**2) <= view_range:
+            visible.append(i)
+    return visible
+
+
+def run(num_agents: int, num_obstacles: int, num_patients: int = 50,
+        width: int = 2000, height: int = 2000, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    obstacles = rng.integers(0, [width, height], size=(num_obstacles, 2)).astype(np.float64)
+    patients = rng.integers(0, [width, height], size=(num_patients, 2)).astype(np.float64)
+    positions = rng.integers(0, [width, height], size=(num_agents, 2)).astype(np.float64)
+    view_ranges = rng.choice([100.0, 150.0], size=num_agents)
+    
+    engine = VisibilityEngine()
+    start = time.perf_counter()
+    engine.set_obstacles(obstacles)
+    build_time = time.perf_counter() - start
+    
+    repeats = 5
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = engine.query(positions, view_ranges, patients)
+    engine_time = (time.perf_counter() - start) / repeats
+    
+    # 스칼라 루프는 느리므로 일부 에이전트만 재서 전체로 환산하고 결과도 비교
+    sample = min(num_agents, 10)
+    obstacle_list = obstacles.tolist()
+    patient_list = patients.tolist()
+    start = time.perf_counter()
+    for row in range(sample):
+        pos = positions[row].tolist()
+        expected_patients = _scalar_visible(pos, view_ranges[row], patient_list)
+        expected_obstacles = _scalar_visible(pos, view_ranges[row], obstacle_list)
+        visible_patients, visible_obstacles = result.visible(row)
+        if visible_patients.tolist() != expected_patients or visible_obstacles.tolist() != expected_obstacles:
+            raise AssertionError(f"visible sets differ for agent {row}")
+    scalar_time = (time.perf_counter() - start) / sample * num_agents
+    
+    return {
+        'num_agents': num_agents,
+        'num_obstacles': num_obstacles,
+        'build_ms': build_time * 1000,
+        'scalar_ms': scalar_time * 1000,
+        'engine_ms': engine_time * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-agents', type=int, nargs='+', default=[3, 100, 1000])
+    parser.add_argument('--num-obstacles', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    
+    print(f"{'agents':>7} {'obstacles':>10} {'index(ms)':>10} {'scalar(ms)':>11} {'engine(ms)':>11} {'speedup':>8}")
+    for num_obstacles in args.num_obstacles:
+        for num_agents in args.num_agents:
+            r = run(num_agents, num_obstacles)
+            print(f"{num_agents:>7} {num_obstacles:>10} {r['build_ms']:>10.2f} {r['scalar_ms']:>11.2f} "
+                  f"{r['engine_ms']:>11.3f} {r['scalar_ms'] / r['engine_ms']:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+from typing import List, Tuple, Union
+import numpy as np
+
+# 에이전트 종류 코드 (클래스 이름 기준이므로 하위 클래스도 같은 코드를 가짐)
+AGENT_TYPE_CODES = {
+    'DroneAgent': 0,
+    'WheeledAgent': 1,
+    'Observer': 2,
+}
+UNKNOWN_AGENT_TYPE = -1
+
+class AgentRegistry:
+    """환경 내 에이전트 상태를 연속된 NumPy 배열로 보관하는 struct-of-arrays 저장소
+    
+    행 i 가 i번째로 등록된 에이전트에 대응한다. 등록된 에이전트 객체의 pos, speed,
+    view_range 는 해당 행을 읽고 쓰는 얇은 뷰가 되므로, 이동/관찰/렌더링은
+    positions[:count] 같은 배열 전체에 대해 한 번에 수행할 수 있다.
+    positions 는 일괄 계산을 위해 float64 로 저장하지만, pos / position_tuples 는 정수 좌표를
+    int 튜플로 돌려주므로 dict 키, 비교, occupancy 조회는 등록 전과 같이 동작한다.
+    """
+    
+    def __init__(self, capacity: int = 8):
+        self.count = 0
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.type_codes = np.full(capacity, UNKNOWN_AGENT_TYPE, dtype=np.int8)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.speeds = np.zeros(capacity, dtype=np.float64)
+        self.view_ranges = np.zeros(capacity, dtype=np.float64)
+        self.type_names: List[str] = []
+    
+    def add(self, agent) -> int:
+        """에이전트를 새 행에 등록하고 객체를 그 행의 뷰로 전환"""
+        if self.count == len(self.ids):
+            self._grow(2 * len(self.ids))
+        row = self.count
+        self.positions[row] = agent.pos
+        self.type_codes[row] = self.type_code(agent)
+        self.ids[row] = agent.id
+        self.speeds[row] = getattr(agent, 'speed', 0)
+        self.view_ranges[row] = getattr(agent, 'view_range', 0)
+        self.type_names.append(type(agent).__name__)
+        self.count += 1
+        agent.attach(self, row)
+        return row
+    
+    def position(self, row: int) -> Tuple[Union[int, float], Union[int, float]]:
+        """row 의 위치 튜플 (정수 좌표면 int 로 돌려줘 등록 전과 같은 형태를 유지)"""
+        x, y = self.positions[row].tolist()
+        if x.is_integer() and y.is_integer():
+            return (int(x), int(y))
+        return (x, y)
+    
+    def position_tuples(self) -> List[Tuple[Union[int, float], Union[int, float]]]:
+        """모든 행의 위치 튜플 목록 (position 과 같은 규칙, 모두 정수 좌표면 한 번에 변환)"""
+        positions = self.positions[:self.count]
+        if (np.mod(positions, 1) == 0).all():
+            return list(map(tuple, positions.astype(np.int64).tolist()))
+        return [self.position(row) for row in range(self.count)]
+    
+    @property
+    def can_fly(self) -> np.ndarray:
+        """AERIAL 장애물을 넘을 수 있는 에이전트(드론) 여부 [count]"""
+        return self.type_codes[:self.count] == AGENT_TYPE_CODES['DroneAgent']
+    
+    @staticmethod
+    def type_code(agent) -> int:
+        for cls in type(agent).__mro__:
+            if cls.__name__ in AGENT_TYPE_CODES:
+                return AGENT_TYPE_CODES[cls.__name__]
+        return UNKNOWN_AGENT_TYPE
+    
+    def _grow(self, capacity: int):
+        for name in ['positions', 'type_codes', 'ids', 'speeds', 'view_ranges']:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
@@ -1,15 +1,34 @@
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional
+import numpy as np
 from agents.base.base_agent import BaseAgent
+from environments.base.agent_registry import AgentRegistry
+from utils.profiling import StepProfiler
 
 class BaseEnvironment(ABC):
     """다양한 환경에서 사용할 수 있는 기본 환경 클래스"""
     
-    def __init__(self):
+    # None: 렌더링 없음(headless), 'human': 화면 창, 'rgb_array': 오프스크린 프레임 반환
+    RENDER_MODES = (None, 'human', 'rgb_array')
+    
+    def __init__(self, render_mode: Optional[str] = None, render_every: int = 1,
+                 profiler: Optional[StepProfiler] = None):
+        if render_mode not in self.RENDER_MODES:
+            raise ValueError(f"Unknown render_mode '{render_mode}', expected one of {self.RENDER_MODES}")
+        if render_every < 1:
+            raise ValueError("render_every must be at least 1")
         self.agents: List[BaseAgent] = []
+        self.registry = AgentRegistry()  # 에이전트 상태 배열 (agents[i] 는 registry 의 i번째 행)
         self.state: Dict[str, Any] = {}
         self.time: int = 0
-        
+        # step 단계별 시간 측정 (기본은 꺼진 프로파일러라 비용이 거의 없음)
+        self.profiler = profiler if profiler is not None else StepProfiler()
+        self.render_mode = render_mode
+        self.render_every = render_every  # 시뮬레이션 render_every 스텝마다 한 번만 그림
+        self.screen = None  # 첫 render() 호출 시 생성
+        self._frame = None  # rgb_array 모드에서 재사용하는 픽셀 버퍼
+    
     @abstractmethod
     def reset(self) -> Dict[str, Any]:
         """환경을 초기화하고 초기 상태를 반환"""
@@ -25,9 +44,113 @@ class BaseEnvironment(ABC):
         """환경을 시각화"""
         pass
     
+    def close(self):
+        """렌더링 자원 해제"""
+        if self.screen is not None and self.render_mode == 'human':
+            import pygame
+            pygame.display.quit()
+        self.screen = None
+        self._frame = None
+    
+    def pump_events(self) -> bool:
+        """human 모드 창의 이벤트를 처리하고, 창이 닫혔으면 False 를 반환
+        
+        창이 아직 없으면 먼저 한 번 그려서 만든다 (human 이 아니거나 창이 없으면 항상 True).
+        """
+        if self.render_mode != 'human':
+            return True
+        if self.screen is None:
+            self.render()
+            if self.screen is None:
+                return True
+        import pygame
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        return True
+    
+    def _ensure_screen(self, width: int, height: int, caption: str) -> bool:
+        """첫 렌더링 시점에 pygame을 초기화하고 그릴 표면을 준비 (headless 이거나 그릴 스텝이 아니면 False)"""
+        if self.render_mode is None or self.time % self.render_every != 0:
+            return False
+        if self.screen is None:
+            import pygame
+            pygame.init()
+            if self.render_mode == 'human':
+                self.screen = pygame.display.set_mode((width, height))
+                pygame.display.set_caption(caption)
+            else:
+                # 디스플레이 없이도 동작하는 오프스크린 표면
+                self.screen = pygame.Surface((width, height))
+        return True
+    
+    def _present(self) -> Optional[np.ndarray]:
+        """그린 결과를 화면에 표시하거나 (H, W, 3) RGB 프레임으로 반환
+        
+        32비트 표면은 픽셀 뷰(pixels2d)를 재사용 버퍼에 통째로 복사하고, 반환값은 그 버퍼의
+        채널 뷰이므로 다음 render 에서 덮어써진다. 보관하려면 복사해야 한다.
+        """
+        import pygame
+        if self.render_mode == 'human':
+            pygame.display.flip()
+            return None
+        
+        width, height = self.screen.get_size()
+        channels = self._rgb_byte_offsets()
+        if channels is None:
+            # 32비트가 아닌 표면은 채널별 복사로 대체
+            return np.transpose(pygame.surfarray.array3d(self.screen), (1, 0, 2))
+        if self._frame is None or self._frame.shape != (height, width):
+            self._frame = np.empty((height, width), dtype=np.uint32)
+        pixels = pygame.surfarray.pixels2d(self.screen)  # (W, H) 뷰, 표면을 잠금
+        np.copyto(self._frame, pixels.T)
+        del pixels  # 잠금 해제
+        return self._frame.view(np.uint8).reshape(height, width, 4)[:, :, channels]
+    
+    def render_into(self, pixels: np.ndarray) -> Optional[slice]:
+        """rgb_array 프레임의 32비트 픽셀을 중간 버퍼 없이 pixels [H, W, 4] uint8 에 바로 그리고 RGB 채널 슬라이스를 반환
+        
+        화면이 아직 없거나, 32비트 표면이 아니거나, pixels 모양이 화면과 다르거나, 그릴 스텝이 아니면
+        None 이며 이때는 render() 를 쓴다.
+        """
+        if self.render_mode != 'rgb_array' or self.screen is None:
+            return None
+        channels = self._rgb_byte_offsets()
+        width, height = self.screen.get_size()
+        if channels is None or pixels.shape != (height, width, 4) or not pixels.flags.c_contiguous:
+            return None
+        previous, self._frame = self._frame, pixels.view(np.uint32).reshape(height, width)
+        try:
+            drawn = self.render() is not None
+        finally:
+            self._frame = previous
+        return channels if drawn else None
+    
+    def packed_frame(self) -> Optional[Tuple[np.ndarray, slice]]:
+        """마지막 rgb_array 프레임의 32비트 픽셀 [H, W, 4] uint8 와 RGB 채널 슬라이스 (없으면 None)
+        
+        녹화처럼 프레임을 보관해야 할 때 채널 재배열 없이 그대로 복사할 수 있게 한다.
+        """
+        if self._frame is None:
+            return None
+        height, width = self._frame.shape
+        return self._frame.view(np.uint8).reshape(height, width, 4), self._rgb_byte_offsets()
+    
+    def _rgb_byte_offsets(self):
+        """32비트 픽셀 안에서 R, G, B 바이트 위치를 가리키는 슬라이스 (해당 없으면 None)"""
+        if self.screen.get_bytesize() != 4 or sys.byteorder != 'little':
+            return None
+        red, green, blue = (shift // 8 for shift in self.screen.get_shifts()[:3])
+        if (red, green, blue) == (2, 1, 0):
+            return slice(2, None, -1)
+        if (red, green, blue) == (0, 1, 2):
+            return slice(0, 3)
+        return None
+    
     def add_agent(self, agent: BaseAgent):
         """에이전트를 환경에 추가"""
         self.agents.append(agent)
+        self.registry.add(agent)
     
     @abstractmethod
     def get_observation_space(self) -> Dict[str, Any]:
@@ -37,4 +160,4 @@ class BaseEnvironment(ABC):
     @abstractmethod
     def get_action_space(self) -> Dict[str, Any]:
         """행동 공간의 정보를 반환"""
-        pass 
\ No newline at end of file
+        pass
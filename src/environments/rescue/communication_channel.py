@@ -1,20 +1,218 @@
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Callable, Deque
+import numpy as np
+from environments.rescue.spatial_index import UniformGridIndex
+
+def estimate_message_size(message: Any) -> int:
+    """메시지의 대략적인 크기(바이트)"""
+    return len(repr(message))
 
 class CommunicationChannel:
-    """에이전트 간 통신을 관리하는 클래스"""
+    """에이전트 간 통신을 관리하는 클래스
+    
+    메시지는 고정 크기(capacity) 링 버퍼에 순번과 함께 저장된다.
+    - 전체 방송: 에이전트마다 마지막으로 읽은 위치(커서)를 기억해 새 메시지만 읽는다.
+    - 거리 제한 방송: 보낸 에이전트의 통신 반경(comm_range) 안에 있는 에이전트를
+      현재 위치의 공간 해시로 찾아 각자의 수신함에 순번만 넣는다.
+    따라서 receive 는 O(새 메시지 수)이고 메모리는 capacity 로 고정된다.
+    max_messages_per_step / max_bytes_per_step 를 주면 에이전트가 한 스텝에 받을 수
+    있는 양이 제한되고 초과분은 버려진다. 읽기 전에 덮어써진 메시지 수는 overflow 에 기록된다.
+    """
+    
+    def __init__(self, capacity: int = 1024, ttl: Optional[int] = None,
+                 comm_range: Optional[float] = None,
+                 max_messages_per_step: Optional[int] = None,
+                 max_bytes_per_step: Optional[int] = None,
+                 message_size: Callable[[Any], int] = estimate_message_size):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.ttl = ttl  # 보낸 뒤 ttl 스텝 동안만 수신 가능 (None이면 만료 없음)
+        self.comm_range = comm_range  # 기본 통신 반경 (None이면 전체 방송)
+        self.max_messages_per_step = max_messages_per_step
+        self.max_bytes_per_step = max_bytes_per_step
+        self.message_size = message_size
+        self.time = 0
+        self._senders: List[Optional[int]] = [None] * capacity
+        self._messages: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._topics: List[Optional[str]] = [None] * capacity
+        self._sent_at: List[int] = [0] * capacity
+        self._sizes: List[int] = [0] * capacity
+        self._next_seq = 0  # 다음 메시지의 순번
+        # 전체 방송 메시지의 순번 목록 (링 버퍼)과 에이전트별 커서
+        self._broadcast_seqs: List[int] = [0] * capacity
+        self._next_broadcast = 0
+        self._cursors: Dict[int, int] = {}
+        # 거리 제한 방송으로 받은 메시지 순번
+        self._inboxes: Dict[int, Deque[int]] = {}
+        self._subscriptions: Dict[int, frozenset] = {}
+        self._comm_ranges: Dict[int, float] = {}
+        self.overflow: Dict[int, int] = {}  # 에이전트별로 읽기 전에 덮어써진 메시지 수
+        
+        # 현재 에이전트 위치와 공간 해시 (update_positions 로 갱신)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._positions = np.zeros((0, 2), dtype=np.float64)
+        self._rows: Dict[int, int] = {}
+        self._neighbors: Optional[Tuple[np.ndarray, np.ndarray]] = None  # 반경 이웃 (CSR)
+        
+        # 스텝별 수신량과 전달 통계
+        self._received_count: Dict[int, int] = {}
+        self._received_bytes: Dict[int, int] = {}
+        self._reset_stats()
+    
+    def advance(self, time: int):
+        """현재 시뮬레이션 스텝 설정 (TTL 만료와 스텝별 수신 한도 기준)"""
+        if time != self.time:
+            self._received_count.clear()
+            self._received_bytes.clear()
+        self.time = time
+    
+    def set_comm_range(self, agent_id: int, comm_range: Optional[float]):
+        """에이전트별 통신 반경 설정 (None이면 기본값 사용)"""
+        if comm_range is None:
+            self._comm_ranges.pop(agent_id, None)
+        else:
+            self._comm_ranges[agent_id] = comm_range
+        self._neighbors = None
+    
+    def update_positions(self, ids: Iterable[int], positions: np.ndarray):
+        """거리 제한 방송에 사용할 에이전트 위치 갱신"""
+        self._ids = np.asarray(list(ids), dtype=np.int64)
+        self._positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self._rows = {agent_id: row for row, agent_id in enumerate(self._ids.tolist())}
+        self._neighbors = None  # 첫 거리 제한 방송 때 모든 에이전트에 대해 한 번에 계산
     
-    def __init__(self):
-        self.messages = []  # 메시지 저장소
+    def broadcast(self, sender_id: int, message: Dict[str, Any], topic: Optional[str] = None):
+        """메시지 전달 (통신 반경이 있으면 반경 안의 에이전트에게만, topic 을 생략하면 message['type'])"""
+        if topic is None and isinstance(message, dict):
+            topic = message.get('type')
+        seq = self._next_seq
+        slot = seq % self.capacity
+        self._senders[slot] = sender_id
+        self._messages[slot] = message
+        self._topics[slot] = topic
+        self._sent_at[slot] = self.time
+        self._sizes[slot] = self.message_size(message) if self.max_bytes_per_step is not None else 0
+        self._next_seq += 1
+        self._stats['sent'] += 1
         
-    def broadcast(self, sender_id: int, message: Dict[str, Any]):
-        """모든 에이전트에게 메시지 전달"""
-        self.messages.append((sender_id, message))
+        recipients = self._recipients_in_range(sender_id)
+        if recipients is None:
+            self._broadcast_seqs[self._next_broadcast % self.capacity] = seq
+            self._next_broadcast += 1
+            fan_out = max(len(self._rows) - (sender_id in self._rows), 0)
+        else:
+            for agent_id in recipients:
+                inbox = self._inboxes.get(agent_id)
+                if inbox is None:
+                    inbox = self._inboxes[agent_id] = deque(maxlen=self.capacity)
+                inbox.append(seq)
+            fan_out = len(recipients)
+        self._stats['fan_out_total'] += fan_out
+        self._stats['fan_out_max'] = max(self._stats['fan_out_max'], fan_out)
+    
+    def subscribe(self, agent_id: int, topics: Optional[Iterable[str]]):
+        """에이전트가 수신할 토픽 설정 (None이면 모든 토픽)"""
+        if topics is None:
+            self._subscriptions.pop(agent_id, None)
+        else:
+            self._subscriptions[agent_id] = frozenset(topics)
+    
+    def receive(self, agent_id: int, topics: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """특정 에이전트가 지난 receive 이후 새로 받은 메시지 반환"""
+        if topics is None:
+            topics = self._subscriptions.get(agent_id)
+        elif not isinstance(topics, frozenset):
+            topics = frozenset(topics)
         
-    def receive(self, agent_id: int) -> List[Dict[str, Any]]:
-        """특정 에이전트가 수신할 메시지 반환"""
-        # 자신이 보낸 메시지를 제외한 모든 메시지 반환
-        return [msg for sender, msg in self.messages if sender != agent_id]
+        seqs = self._new_broadcast_seqs(agent_id)
+        inbox = self._inboxes.get(agent_id)
+        if inbox:
+            seqs = sorted(seqs + list(inbox)) if seqs else list(inbox)
+            inbox.clear()
         
+        oldest = max(self._next_seq - self.capacity, 0)
+        count = self._received_count.get(agent_id, 0)
+        size = self._received_bytes.get(agent_id, 0)
+        received = []
+        for seq in seqs:
+            if seq < oldest:
+                self.overflow[agent_id] = self.overflow.get(agent_id, 0) + 1
+                continue
+            slot = seq % self.capacity
+            # 자신이 보낸 메시지, 만료된 메시지, 구독하지 않은 토픽은 제외
+            if self._senders[slot] == agent_id:
+                continue
+            if self.ttl is not None and self.time - self._sent_at[slot] >= self.ttl:
+                continue
+            if topics is not None and self._topics[slot] not in topics:
+                continue
+            # 스텝별 수신 한도를 넘으면 버림
+            if ((self.max_messages_per_step is not None and count >= self.max_messages_per_step) or
+                    (self.max_bytes_per_step is not None and size + self._sizes[slot] > self.max_bytes_per_step)):
+                self._stats['dropped'] += 1
+                continue
+            count += 1
+            size += self._sizes[slot]
+            received.append(self._messages[slot])
+        self._received_count[agent_id] = count
+        self._received_bytes[agent_id] = size
+        self._stats['delivered'] += len(received)
+        return received
+    
+    def pop_stats(self) -> Dict[str, Any]:
+        """지난 호출 이후의 전달 통계를 반환하고 초기화"""
+        stats = self._stats
+        fan_out_total = stats.pop('fan_out_total')
+        stats['fan_out_mean'] = fan_out_total / stats['sent'] if stats['sent'] else 0.0
+        self._reset_stats()
+        return stats
+    
+    @property
+    def messages(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """버퍼에 남아 있는 (보낸 에이전트, 메시지) 목록 (오래된 순)"""
+        oldest = max(self._next_seq - self.capacity, 0)
+        return [(self._senders[seq % self.capacity], self._messages[seq % self.capacity])
+                for seq in range(oldest, self._next_seq)]
+    
     def clear(self):
         """메시지 저장소 초기화"""
-        self.messages.clear() 
\ No newline at end of file
+        self._senders = [None] * self.capacity
+        self._messages = [None] * self.capacity
+        self._topics = [None] * self.capacity
+        self._next_seq = 0
+        self._next_broadcast = 0
+        self._cursors.clear()
+        self._inboxes.clear()
+        self._received_count.clear()
+        self._received_bytes.clear()
+        self.overflow.clear()
+        self._reset_stats()
+    
+    def _new_broadcast_seqs(self, agent_id: int) -> List[int]:
+        """커서 이후의 전체 방송 메시지 순번"""
+        oldest = max(self._next_broadcast - self.capacity, 0)
+        cursor = self._cursors.get(agent_id, oldest)
+        if cursor < oldest:
+            self.overflow[agent_id] = self.overflow.get(agent_id, 0) + oldest - cursor
+            cursor = oldest
+        self._cursors[agent_id] = self._next_broadcast
+        return [self._broadcast_seqs[i % self.capacity] for i in range(cursor, self._next_broadcast)]
+    
+    def _recipients_in_range(self, sender_id: int) -> Optional[List[int]]:
+        """보낸 에이전트의 통신 반경 안에 있는 에이전트 id (전체 방송이면 None)"""
+        comm_range = self._comm_ranges.get(sender_id, self.comm_range)
+        row = self._rows.get(sender_id)
+        if comm_range is None or row is None:
+            return None
+        if self._neighbors is None:
+            ranges = np.array([self._comm_ranges.get(agent_id, self.comm_range) or 0.0
+                               for agent_id in self._ids.tolist()], dtype=np.float64)
+            index = UniformGridIndex(self._positions, max(ranges.max(initial=0.0), 1.0))
+            self._neighbors = index.query_radius_batch(self._positions, ranges)
+        offsets, rows = self._neighbors
+        neighbor_rows = rows[offsets[row]:offsets[row + 1]]
+        return [agent_id for agent_id in self._ids[neighbor_rows].tolist() if agent_id != sender_id]
+    
+    def _reset_stats(self):
+        self._stats = {'sent': 0, 'delivered': 0, 'dropped': 0, 'fan_out_total': 0, 'fan_out_max': 0}
@@ -0,0 +1,202 @@
+from typing import Dict, Tuple
+import numpy as np
+
+TWO_PI = 2 * np.pi
+
+class CoverageMap:
+    """grid_size 격자점 위의 에이전트별 / 팀 탐색 여부를 비트로 압축해 보관하는 커버리지 지도
+    
+    에이전트 시야는 가장 가까운 격자점을 중심으로 한 반경 view_range 의 원(스텐실)으로 근사한다.
+    에이전트가 격자점 (mx, my) 만큼 옮겨 가면 새 원에서 이전 원을 뺀 칸 (이동량별로 캐시한 차이
+    스텐실) 만 검사하므로, 한 스텝 비용은 맵 넓이가 아니라 이동 거리(속도)에 비례한다.
+    첫 스텝, 시야 반경이 바뀌었을 때, 캐시 범위보다 크게 움직였을 때만 원 전체를 쓴다.
+    Observer 의 시야각은 회전으로 앞쪽 경계가 쓸고 지나간 각도 구간의 격자점만 팀 지도에 더한다.
+    
+    비트는 [에이전트, 행, ceil(열 / 8)] uint8 (열 방향 little-endian) 로 저장하며, 관찰 채널용
+    channel_size x channel_size 블록별 탐색 칸 수도 새로 탐색한 칸만큼 함께 늘린다.
+    """
+    
+    def __init__(self, width: int, height: int, grid_size: int, channel_size: int = 8,
+                 reward_per_cell: float = 0.01, max_shift: int = 4):
+        self.grid_size = grid_size
+        self.cols = width // grid_size + 1
+        self.rows = height // grid_size + 1
+        self.channel_size = channel_size
+        self.reward_per_cell = reward_per_cell  # 팀 지도에 새로 더한 칸당 보상
+        self.max_shift = max_shift  # 차이 스텐실을 캐시할 최대 격자 이동량 (축마다)
+        self.block_rows = -(-self.rows // channel_size)
+        self.block_cols = -(-self.cols // channel_size)
+        # 블록별 격자점 수 (관찰 채널 정규화용)
+        rows = np.minimum(np.arange(channel_size) * self.block_rows + self.block_rows, self.rows) \
+            - np.minimum(np.arange(channel_size) * self.block_rows, self.rows)
+        cols = np.minimum(np.arange(channel_size) * self.block_cols + self.block_cols, self.cols) \
+            - np.minimum(np.arange(channel_size) * self.block_cols, self.cols)
+        self.block_cells = np.maximum(rows[:, None] * cols[None, :], 1).astype(np.float32)
+        self._stencils: Dict[Tuple[int, int, int], np.ndarray] = {}
+        self._cone_key = None
+        self._cone_bearings = np.zeros(0)
+        self._cone_cells = np.zeros((0, 2), dtype=np.int64)
+        self.reset()
+    
+    def reset(self):
+        """모든 탐색 기록을 지움 (에이전트 수는 다음 update 에서 맞춤)"""
+        packed = -(-self.cols // 8)
+        self.agent_bits = np.zeros((0, self.rows, packed), dtype=np.uint8)
+        self.team_bits = np.zeros((self.rows, packed), dtype=np.uint8)
+        self.agent_blocks = np.zeros((0, self.channel_size, self.channel_size), dtype=np.int32)
+        self.team_blocks = np.zeros((self.channel_size, self.channel_size), dtype=np.int32)
+        self.team_cells = 0
+        self._nodes = np.zeros((0, 2), dtype=np.int64)
+        self._radii = np.zeros(0, dtype=np.int64)
+        self._cone_angle = None
+        self.cells_checked = 0  # 통계: 검사한 (에이전트, 칸) 수
+    
+    def update(self, positions: np.ndarray, view_ranges: np.ndarray) -> np.ndarray:
+        """에이전트 시야에 새로 들어온 칸을 표시하고, 에이전트별로 팀 지도에 새로 더한 칸 수 [A] 를 반환"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        num_agents = len(positions)
+        self._grow(num_agents)
+        nodes = np.clip(np.rint(positions / self.grid_size).astype(np.int64), 0, [self.cols - 1, self.rows - 1])
+        radii = np.floor(np.asarray(view_ranges, dtype=np.float64) / self.grid_size).astype(np.int64)
+        shift = nodes - self._nodes[:num_agents]
+        full = ((radii != self._radii[:num_agents]) | (self._nodes[:num_agents, 0] < 0)
+                | (np.abs(shift) > self.max_shift).any(axis=1))
+        shift[full] = self.max_shift + 1  # 원 전체를 뜻하는 키
+        moved = full | shift.any(axis=1)
+        self._nodes[:num_agents] = nodes
+        self._radii[:num_agents] = radii
+        
+        agents, cells = [], []
+        rows = np.flatnonzero(moved)
+        if len(rows):
+            keys = np.stack([radii[rows], shift[rows, 0], shift[rows, 1]], axis=1)
+            unique, group = np.unique(keys, axis=0, return_inverse=True)
+            group = group.reshape(-1)
+            for g, (radius, mx, my) in enumerate(unique.tolist()):
+                members = rows[group == g]
+                stencil = self._stencil(radius, mx, my)
+                agents.append(np.repeat(members, len(stencil)))
+                cells.append((nodes[members, None, :] + stencil[None]).reshape(-1, 2))
+        gained = np.zeros(num_agents, dtype=np.int64)
+        if not agents:
+            return gained
+        agents = np.concatenate(agents)
+        cells = np.concatenate(cells)
+        inside = ((cells >= 0) & (cells < [self.cols, self.rows])).all(axis=1)
+        agents, cells = agents[inside], cells[inside]
+        self.cells_checked += len(agents)
+        
+        # 에이전트 지도에 없던 칸만 표시
+        xs, ys = cells[:, 0], cells[:, 1]
+        byte, bit = xs >> 3, (1 << (xs & 7)).astype(np.uint8)
+        new = (self.agent_bits[agents, ys, byte] & bit) == 0
+        agents, xs, ys, byte, bit = agents[new], xs[new], ys[new], byte[new], bit[new]
+        np.bitwise_or.at(self.agent_bits, (agents, ys, byte), bit)
+        np.add.at(self.agent_blocks, (agents, ys // self.block_rows, xs // self.block_cols), 1)
+        
+        # 팀 지도에 없던 칸은 (같은 스텝에 여럿이 봤으면 앞 에이전트에게) 보상으로 셈
+        new = (self.team_bits[ys, byte] & bit) == 0
+        _, first = np.unique(ys[new] * self.cols + xs[new], return_index=True)
+        winners = np.flatnonzero(new)[first]
+        self._mark_team(xs[winners], ys[winners])
+        gained += np.bincount(agents[winners], minlength=num_agents)
+        return gained
+    
+    def update_cone(self, pos: Tuple[float, float], view_range: float, fov: float, angle: float) -> int:
+        """Observer 시야각 (pos 에서 angle 방향, 폭 fov) 이 지난 호출 이후 새로 쓴 격자점을 팀 지도에 더함"""
+        key = (tuple(pos), view_range)
+        if key != self._cone_key:
+            self._index_cone(pos, view_range)
+            self._cone_key = key
+            self._cone_angle = None
+        half = fov / 2
+        if self._cone_angle is None or (angle - self._cone_angle) % TWO_PI >= fov:
+            low, high = angle - half, angle + half
+        else:
+            low, high = self._cone_angle + half, angle + half
+        self._cone_angle = angle
+        cells = self._cone_cells[self._bearing_range(low, high)]
+        if not len(cells):
+            return 0
+        xs, ys = cells[:, 0], cells[:, 1]
+        new = (self.team_bits[ys, xs >> 3] & (1 << (xs & 7)).astype(np.uint8)) == 0
+        self.cells_checked += len(cells)
+        self._mark_team(xs[new], ys[new])
+        return int(np.count_nonzero(new))
+    
+    def fraction(self) -> float:
+        """팀이 탐색한 격자점 비율"""
+        return self.team_cells / (self.rows * self.cols)
+    
+    def team_coverage(self) -> np.ndarray:
+        """팀 지도 [R, C] bool"""
+        return np.unpackbits(self.team_bits, axis=1, count=self.cols, bitorder='little').astype(bool)
+    
+    def agent_coverage(self, row: int) -> np.ndarray:
+        """에이전트 행 row 의 지도 [R, C] bool"""
+        return np.unpackbits(self.agent_bits[row], axis=1, count=self.cols, bitorder='little').astype(bool)
+    
+    def channels(self, num_agents: int) -> np.ndarray:
+        """관찰 채널 [A, 2, channel_size, channel_size]: 블록별 자기 / 팀 탐색 비율"""
+        out = np.empty((num_agents, 2, self.channel_size, self.channel_size), dtype=np.float32)
+        np.divide(self.agent_blocks[:num_agents], self.block_cells, out=out[:, 0])
+        out[:, 1] = self.team_blocks / self.block_cells
+        return out
+    
+    def _mark_team(self, xs: np.ndarray, ys: np.ndarray):
+        np.bitwise_or.at(self.team_bits, (ys, xs >> 3), (1 << (xs & 7)).astype(np.uint8))
+        np.add.at(self.team_blocks, (ys // self.block_rows, xs // self.block_cols), 1)
+        self.team_cells += len(xs)
+    
+    def _grow(self, num_agents: int):
+        current = len(self.agent_bits)
+        if num_agents <= current:
+            return
+        extra = num_agents - current
+        self.agent_bits = np.concatenate(
+            [self.agent_bits, np.zeros((extra,) + self.agent_bits.shape[1:], dtype=np.uint8)])
+        self.agent_blocks = np.concatenate(
+            [self.agent_blocks, np.zeros((extra,) + self.agent_blocks.shape[1:], dtype=np.int32)])
+        self._nodes = np.concatenate([self._nodes, np.full((extra, 2), -1, dtype=np.int64)])
+        self._radii = np.concatenate([self._radii, np.full(extra, -1, dtype=np.int64)])
+    
+    def _stencil(self, radius: int, mx: int, my: int) -> np.ndarray:
+        """중심 기준 오프셋 [K, 2]: 격자점 (mx, my) 만큼 옮긴 뒤 새로 시야에 들어온 칸 (max_shift 초과면 원 전체)"""
+        key = (radius, mx, my)
+        stencil = self._stencils.get(key)
+        if stencil is None:
+            span = np.arange(-radius, radius + 1)
+            dx, dy = np.meshgrid(span, span)
+            disk = dx**2 + dy**2 <= radius**2
+            stencil = np.stack([dx[disk], dy[disk]], axis=1)
+            if abs(mx) <= self.max_shift and abs(my) <= self.max_shift:
+                # 이전 중심 기준으로 (오프셋 + 이동량) 이 원 밖이면 새 칸
+                previous = stencil + [mx, my]
+                stencil = stencil[(previous ** 2).sum(axis=1) > radius**2]
+            self._stencils[key] = stencil
+        return stencil
+    
+    def _index_cone(self, pos: Tuple[float, float], view_range: float):
+        # 고정된 Observer 위치 기준으로 반경 안 격자점을 방위각 순으로 정렬
+        g = self.grid_size
+        xs, ys = np.meshgrid(np.arange(self.cols), np.arange(self.rows))
+        dx = xs.ravel() * g - pos[0]
+        dy = ys.ravel() * g - pos[1]
+        inside = dx**2 + dy**2 <= view_range**2
+        bearings = np.arctan2(dy[inside], dx[inside]) % TWO_PI
+        order = np.argsort(bearings, kind='stable')
+        self._cone_bearings = bearings[order]
+        self._cone_cells = np.stack([xs.ravel()[inside], ys.ravel()[inside]], axis=1)[order]
+    
+    def _bearing_range(self, low: float, high: float) -> np.ndarray:
+        """방위각이 [low, high] (2pi 를 넘으면 감아 돌림) 인 격자점 위치"""
+        width = high - low
+        if width >= TWO_PI:
+            return np.arange(len(self._cone_bearings))
+        low %= TWO_PI
+        high = low + width
+        start = np.searchsorted(self._cone_bearings, low, 'left')
+        if high < TWO_PI:
+            return np.arange(start, max(start, np.searchsorted(self._cone_bearings, high, 'right')))
+        end = np.searchsorted(self._cone_bearings, high - TWO_PI, 'right')
+        return np.concatenate([np.arange(start, len(self._cone_bearings)), np.arange(end)])
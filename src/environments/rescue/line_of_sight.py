@@ -0,0 +1,134 @@
+from typing import Dict, Any, Tuple
+import numpy as np
+from environments.rescue.occupancy_grid import OccupancyGrid
+
+class LineOfSight:
+    """occupancy 격자 위 일괄 DDA 광선 추적으로 (관찰자, 대상) 쌍이 장애물에 가려지는지 계산
+    
+    occupancy.blocked 를 cell_size 칸으로 줄인 불투명 격자 (칸 중심 좌표가 막혀 있으면 불투명) 에서
+    Amanatides-Woo DDA 로 모든 쌍의 광선을 한꺼번에 한 칸씩 전진시키고, 끝난 광선은 매 반복 제외한다.
+    시작 칸과 대상 칸은 검사하지 않으며, 대상 반경 (radius) 안의 칸에서 처음 막히면 대상 자신에 닿은 것으로
+    본다 (장애물은 앞면이 보이면 보임). 층은 OccupancyGrid 와 같아서 see_over_aerial 이면 can_fly 인
+    관찰자는 AERIAL 장애물 너머를 본다.
+    
+    filter() 결과는 대상 종류별로 (관찰자 행, 대상 인덱스) 쌍마다 캐시하며, 관찰자와 대상이 모두 지난
+    호출 이후 움직이지 않았고 장애물 버전이 그대로인 쌍은 다시 추적하지 않는다.
+    """
+    
+    def __init__(self, occupancy: OccupancyGrid, cell_size: int = 10, see_over_aerial: bool = True):
+        self.occupancy = occupancy
+        self.cell_size = cell_size
+        self.see_over_aerial = see_over_aerial
+        self.version = None  # 불투명 격자를 만든 장애물 버전
+        self.opaque = np.zeros(0, dtype=bool)  # [2 * rows * cols] (층, y 칸, x 칸 순으로 펼침)
+        self.cols = occupancy.width // cell_size + 1
+        self.rows = occupancy.height // cell_size + 1
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        # 통계: 추적한 광선 수 / 캐시로 건너뛴 쌍 수 / DDA 반복 수
+        self.traced = 0
+        self.cached = 0
+        self.iterations = 0
+    
+    def update(self, version: Any):
+        """장애물 버전이 바뀌었으면 불투명 격자를 다시 만들고 캐시를 비움"""
+        if version == self.version and len(self.opaque):
+            return
+        c = self.cell_size
+        xs = np.minimum(np.arange(self.cols) * c + c // 2, self.occupancy.width)
+        ys = np.minimum(np.arange(self.rows) * c + c // 2, self.occupancy.height)
+        self.opaque = (self.occupancy.blocked[:, ys][:, :, xs] > 0).ravel()
+        self.version = version
+        self._cache.clear()
+    
+    def layers(self, can_fly: np.ndarray) -> np.ndarray:
+        if not self.see_over_aerial:
+            return np.full(len(can_fly), OccupancyGrid.GROUND, dtype=np.int64)
+        return np.where(can_fly, OccupancyGrid.AERIAL, OccupancyGrid.GROUND).astype(np.int64)
+    
+    def filter(self, kind: str, offsets: np.ndarray, indices: np.ndarray, positions: np.ndarray,
+               can_fly: np.ndarray, targets: np.ndarray, radius: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR 후보 (offsets [A+1], indices) 중 가려지지 않은 것만 남긴 CSR 을 반환
+        
+        positions [A, 2], can_fly [A] 는 관찰자, targets [T, 2] 는 indices 가 가리키는 대상 위치이다.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        targets = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+        can_fly = np.asarray(can_fly, dtype=bool)
+        num_agents = len(positions)
+        rows = np.repeat(np.arange(num_agents), np.diff(offsets))
+        keys = rows * max(len(targets), 1) + indices
+        visible = np.empty(len(indices), dtype=bool)
+        
+        # 지난 호출과 같은 끝점의 쌍은 캐시 결과를 씀
+        stale = np.ones(len(indices), dtype=bool)
+        previous = self._cache.get(kind)
+        if previous is not None and len(previous['targets']) == len(targets) and len(previous['keys']):
+            moved = np.ones(num_agents, dtype=bool)
+            common = min(num_agents, len(previous['positions']))
+            moved[:common] = ((positions[:common] != previous['positions'][:common]).any(axis=1)
+                              | (can_fly[:common] != previous['can_fly'][:common]))
+            target_moved = (targets != previous['targets']).any(axis=1)
+            slot = np.minimum(np.searchsorted(previous['keys'], keys), len(previous['keys']) - 1)
+            hit = (previous['keys'][slot] == keys) & ~moved[rows] & ~target_moved[indices]
+            visible[hit] = previous['visible'][slot[hit]]
+            stale = ~hit
+        
+        pairs = np.flatnonzero(stale)
+        rows_traced = rows[pairs]
+        visible[pairs] = self.trace(positions[rows_traced], targets[indices[pairs]],
+                                    self.layers(can_fly[rows_traced]), radius)
+        self.traced += len(pairs)
+        self.cached += len(indices) - len(pairs)
+        
+        order = np.argsort(keys, kind='stable')
+        self._cache[kind] = {'keys': keys[order], 'visible': visible[order], 'positions': positions.copy(),
+                             'can_fly': can_fly.copy(), 'targets': targets.copy()}
+        new_offsets = np.zeros(num_agents + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[visible], minlength=num_agents), out=new_offsets[1:])
+        return new_offsets, indices[visible]
+    
+    def trace(self, origins: np.ndarray, targets: np.ndarray, layers: np.ndarray,
+              radius: float = 0.0) -> np.ndarray:
+        """광선 origins[i] -> targets[i] 가 layers[i] 층에서 가려지지 않았는지 [N] (캐시 없음)"""
+        c = self.cell_size
+        visible = np.ones(len(origins), dtype=bool)
+        if not len(origins):
+            return visible
+        origins = np.asarray(origins, dtype=np.float64)
+        targets = np.asarray(targets, dtype=np.float64)
+        start = np.floor(origins / c).astype(np.int64)
+        end = np.floor(targets / c).astype(np.int64)
+        delta = targets - origins
+        steps = np.sign(delta).astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_delta = np.where(delta != 0, c / np.abs(delta), np.inf)
+            # 다음 칸 경계까지의 광선 매개변수 t (0: 시작, 1: 대상)
+            t_max = np.where(delta != 0, ((start + (steps > 0)) * c - origins) / delta, np.inf)
+        # 시작/대상 칸 사이에 지나는 칸 수
+        between = np.abs(end - start).sum(axis=1) - 1
+        
+        active = np.flatnonzero(between > 0)
+        cell = start[active]
+        t_max, t_delta, steps = t_max[active], t_delta[active], steps[active]
+        remaining = between[active]
+        base = layers[active] * (self.rows * self.cols)
+        reach = radius + c / 2
+        target = targets[active]
+        while len(active):
+            self.iterations += 1
+            # t_max 가 작은 축으로 한 칸 전진
+            axis = (t_max[:, 1] < t_max[:, 0]).astype(np.int64)
+            lanes = np.arange(len(active))
+            cell[lanes, axis] += steps[lanes, axis]
+            t_max[lanes, axis] += t_delta[lanes, axis]
+            remaining -= 1
+            np.clip(cell, 0, [self.cols - 1, self.rows - 1], out=cell)
+            hit = self.opaque[base + cell[:, 1] * self.cols + cell[:, 0]]
+            own = (np.abs((cell + 0.5) * c - target) < reach).all(axis=1)
+            blocked = hit & ~own
+            visible[active[blocked]] = False
+            keep = ~hit & (remaining > 0)
+            if not keep.all():
+                active, cell, t_max, t_delta, steps = active[keep], cell[keep], t_max[keep], t_delta[keep], steps[keep]
+                remaining, base, target = remaining[keep], base[keep], target[keep]
+        return visible
@@ -0,0 +1,223 @@
+from typing import Optional, Tuple
+import numpy as np
+
+# 닿을 수 없는 격자점의 거리 (+1 해도 넘치지 않는 값)
+INF = np.iinfo(np.int32).max // 2
+
+# 흐름 방향 코드 -> 격자 한 칸 이동 (0 은 정지)
+FLOW_STEPS = np.array([[0, 0], [-1, 0], [1, 0], [0, -1], [0, 1]], dtype=np.int64)
+
+class NavigationField:
+    """grid_size 격자점 위의 환자별 BFS 거리장과, 가장 가까운 환자 쪽 흐름장 (GROUND/AERIAL 층별)
+    
+    격자점 (c * grid_size, r * grid_size) 사이의 가로/세로 간선은 그 선분 위의 모든 정수 좌표가
+    occupancy 층에서 통과 가능할 때만 열려 있다 (드론은 AERIAL 층이라 AERIAL 장애물을 넘음).
+    distance[layer, patient, r, c] 는 그 환자의 격자점까지의 간선 수 (닿을 수 없으면 INF) 이다.
+    
+    update() 는 장애물 버전이 바뀌었을 때만 간선을 다시 계산하고 거리장을 점진적으로 고친다.
+    - 닫힌 간선: 최단 경로에 쓰이던 (층, 환자) 거리장에서만, 더 이상 거리 d-1 인 이웃이 없는 격자점을
+      INF 로 무효화하는 것을 반복한 뒤 남은 값에서 BFS 완화를 다시 퍼뜨린다.
+    - 열린 간선: 지름길이 되는 거리장에서만 양 끝점부터 완화를 퍼뜨린다.
+    반복 횟수는 바뀐 영역의 깊이만큼이다. 환자 목록이 바뀌면 처음부터 다시 만든다.
+    query() 는 에이전트마다 격자점의 흐름 방향 (또는 간선 위라면 더 가까운 끝점) 을 한 번 조회한다.
+    """
+    
+    def __init__(self, env):
+        self.env = env
+        self.grid_size = env.grid_size
+        self.cols = env.width // env.grid_size + 1
+        self.rows = env.height // env.grid_size + 1
+        self.distance: Optional[np.ndarray] = None  # [2, P, R, C] int32
+        self.best_distance = np.full((2, self.rows, self.cols), INF, dtype=np.int32)  # 가장 가까운 환자까지
+        self.flow = np.zeros((2, self.rows, self.cols), dtype=np.int8)  # FLOW_STEPS 코드
+        self.h_open = np.zeros((2, self.rows, self.cols - 1), dtype=bool)  # (r, c) - (r, c+1)
+        self.v_open = np.zeros((2, self.rows - 1, self.cols), dtype=bool)  # (r, c) - (r+1, c)
+        self._obstacle_version = -1
+        self._patients: Optional[Tuple] = None
+        # 통계: 전체 재계산 / 점진적 수정 횟수와 BFS 완화 반복 수
+        self.full_builds = 0
+        self.repairs = 0
+        self.iterations = 0
+    
+    @property
+    def max_distance(self) -> int:
+        """격자에서 가능한 가장 긴 경로 길이 (특징 정규화용)"""
+        return self.rows * self.cols
+    
+    def update(self) -> bool:
+        """장애물/환자가 바뀌었으면 거리장을 갱신 (바뀐 것이 있었으면 True)"""
+        env = self.env
+        patients = tuple(map(tuple, env.patients))
+        if patients != self._patients or self.distance is None:
+            self._compute_edges()
+            self._build(patients)
+            return True
+        if env._obstacle_version == self._obstacle_version:
+            return False
+        old_h, old_v = self.h_open, self.v_open
+        self._compute_edges()
+        distance = self.distance
+        # 거리 차가 1 인 간선만 최단 경로 트리에 쓰일 수 있으므로, 그런 간선이 닫힌 (층, 환자) 거리장만 무효화
+        gap_h = np.abs(distance[..., :, 1:] - distance[..., :, :-1])
+        gap_v = np.abs(distance[..., 1:, :] - distance[..., :-1, :])
+        closed = (((old_h & ~self.h_open)[:, None] & (gap_h == 1)).any(axis=(2, 3))
+                  | ((old_v & ~self.v_open)[:, None] & (gap_v == 1)).any(axis=(2, 3)))
+        # 열린 간선은 양 끝 거리 차가 1 보다 클 때만 지름길이 됨
+        shortcut_h = (self.h_open & ~old_h)[:, None] & (gap_h > 1)
+        shortcut_v = (self.v_open & ~old_v)[:, None] & (gap_v > 1)
+        seeds = np.zeros(distance.shape, dtype=bool)
+        seeds[..., :, :-1] |= shortcut_h
+        seeds[..., :, 1:] |= shortcut_h
+        seeds[..., :-1, :] |= shortcut_v
+        seeds[..., 1:, :] |= shortcut_v
+        pairs = np.nonzero(closed)
+        if len(pairs[0]):
+            part = distance[pairs]
+            self.iterations += _invalidate(part, self.h_open[pairs[0]], self.v_open[pairs[0]])
+            distance[pairs] = part
+            seeds[pairs] = part < INF  # 무효화된 영역을 둘러싼 값부터 다시 퍼뜨림
+        pairs = np.nonzero(seeds.any(axis=(2, 3)))
+        if len(pairs[0]):
+            part = distance[pairs]
+            self.iterations += _relax(part, self.h_open[pairs[0]], self.v_open[pairs[0]], seeds[pairs])
+            distance[pairs] = part
+        self._update_flow()
+        self.repairs += 1
+        return True
+    
+    def load(self, distance: np.ndarray):
+        """미리 계산한 거리장 (현재 장애물/환자 배치의 것) 을 BFS 없이 사용"""
+        env = self.env
+        expected = (2, len(env.patients), self.rows, self.cols)
+        if distance.shape != expected:
+            raise ValueError(f"distance shape {distance.shape} does not match {expected}")
+        self._compute_edges()
+        self.distance = np.array(distance, dtype=np.int32)
+        self._patients = tuple(map(tuple, env.patients))
+        self._update_flow()
+    
+    def query(self, positions: np.ndarray, can_fly: np.ndarray,
+              speeds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """모든 에이전트의 (가장 가까운 환자 쪽 정수 이동량 [A, 2], 남은 격자 거리 [A] (닿을 수 없으면 inf))
+        
+        격자점 위면 흐름 방향의 이웃 격자점, 간선 위면 (끝점 거리 + 남은 간선 비율) 이 작은 끝점,
+        그 밖에서는 가장 가까운 격자점을 향해 축마다 최대 speed 만큼 움직인다.
+        """
+        self.update()
+        g = self.grid_size
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        layers = np.asarray(can_fly, dtype=np.int64)
+        cells = positions / g
+        base = np.floor(cells)
+        on_line = cells == base
+        base = np.clip(base.astype(np.int64), 0, [self.cols - 1, self.rows - 1])
+        nearest = np.clip(np.rint(cells).astype(np.int64), 0, [self.cols - 1, self.rows - 1])
+        best = self.best_distance
+        targets = nearest.copy()
+        cost = best[layers, nearest[:, 1], nearest[:, 0]].astype(np.float64)
+        
+        at_node = on_line.all(axis=1)
+        rows = np.flatnonzero(at_node)
+        targets[rows] += FLOW_STEPS[self.flow[layers[rows], nearest[rows, 1], nearest[rows, 0]]]
+        for axis in (0, 1):
+            # axis 방향 간선 위 (다른 축은 격자선 위)
+            rows = np.flatnonzero(~on_line[:, axis] & on_line[:, 1 - axis])
+            if not len(rows):
+                continue
+            low = base[rows].copy()
+            high = low.copy()
+            high[:, axis] = np.minimum(high[:, axis] + 1, (self.cols, self.rows)[axis] - 1)
+            fraction = cells[rows, axis] - low[:, axis]
+            low_cost = best[layers[rows], low[:, 1], low[:, 0]] + fraction
+            high_cost = best[layers[rows], high[:, 1], high[:, 0]] + (1 - fraction)
+            to_high = high_cost < low_cost
+            targets[rows] = np.where(to_high[:, None], high, low)
+            cost[rows] = np.minimum(low_cost, high_cost)
+        
+        step = np.floor(np.maximum(np.asarray(speeds, dtype=np.float64), 1.0))[:, None]
+        moves = np.clip(targets * g - positions, -step, step)
+        reachable = cost < INF
+        moves[~reachable] = 0
+        return np.rint(moves).astype(np.int64), np.where(reachable, cost, np.inf)
+    
+    def features(self, moves: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        """관찰 특징 [A, 3]: 이동 방향 부호 (dx, dy) 와 정규화한 거리 (닿을 수 없으면 1)"""
+        out = np.empty((len(moves), 3), dtype=np.float32)
+        out[:, :2] = np.sign(moves)
+        out[:, 2] = np.minimum(distances / self.max_distance, 1.0)
+        return out
+    
+    def _compute_edges(self):
+        """occupancy.blocked 의 격자선에서 간선 열림 여부 계산"""
+        g = self.grid_size
+        blocked = self.env.occupancy.blocked
+        xs = np.arange(self.cols - 1) * g
+        ys = np.arange(self.rows - 1) * g
+        # 격자선 위 막힌 칸 수의 누적합으로 길이 g 선분마다 막힌 칸이 있는지 확인
+        lines = np.cumsum(blocked[:, ::g, :(self.cols - 1) * g + 1][:, :self.rows] > 0, axis=2)
+        lines = np.concatenate([np.zeros(lines.shape[:2] + (1,), dtype=lines.dtype), lines], axis=2)
+        self.h_open = lines[:, :, xs + g + 1] - lines[:, :, xs] == 0
+        lines = np.cumsum(blocked[:, :(self.rows - 1) * g + 1, ::g][:, :, :self.cols] > 0, axis=1)
+        lines = np.concatenate([np.zeros((2, 1, lines.shape[2]), dtype=lines.dtype), lines], axis=1)
+        self.v_open = lines[:, ys + g + 1, :] - lines[:, ys, :] == 0
+        self._obstacle_version = self.env._obstacle_version
+    
+    def _build(self, patients: Tuple):
+        g = self.grid_size
+        self.distance = np.full((2, len(patients), self.rows, self.cols), INF, dtype=np.int32)
+        if patients:
+            nodes = np.clip(np.rint(np.asarray(patients, dtype=np.float64) / g).astype(np.int64),
+                            0, [self.cols - 1, self.rows - 1])
+            self.distance[:, np.arange(len(patients)), nodes[:, 1], nodes[:, 0]] = 0
+        self._patients = patients
+        self.iterations += _relax(self.distance, self.h_open[:, None], self.v_open[:, None], self.distance == 0)
+        self._update_flow()
+        self.full_builds += 1
+    
+    def _update_flow(self):
+        """가장 가까운 환자까지의 거리와, 그 거리가 줄어드는 이웃 방향"""
+        best = self.distance.min(axis=1) if self.distance.shape[1] else np.full_like(self.best_distance, INF)
+        self.best_distance = best
+        neighbour = np.full((5,) + best.shape, INF, dtype=np.int32)
+        neighbour[0] = best
+        neighbour[1][..., :, 1:] = np.where(self.h_open, best[..., :, :-1], INF)
+        neighbour[2][..., :, :-1] = np.where(self.h_open, best[..., :, 1:], INF)
+        neighbour[3][..., 1:, :] = np.where(self.v_open, best[..., :-1, :], INF)
+        neighbour[4][..., :-1, :] = np.where(self.v_open, best[..., 1:, :], INF)
+        # 정지 (코드 0) 는 이미 목표이거나 닿을 수 없을 때만 남음
+        self.flow = np.argmin(neighbour, axis=0).astype(np.int8)
+
+def _relax(distance: np.ndarray, h_open: np.ndarray, v_open: np.ndarray, changed: np.ndarray) -> int:
+    """changed 격자점에서 시작해 더 짧은 거리가 없을 때까지 이웃으로 퍼뜨림 (distance 를 제자리에서 고침)
+    
+    distance [..., R, C] 와 h_open [..., R, C-1], v_open [..., R-1, C] 는 앞쪽 차원이 브로드캐스트 가능해야 한다.
+    반복 (BFS 층) 수를 반환한다.
+    """
+    iterations = 0
+    while changed.any():
+        iterations += 1
+        candidate = np.where(changed, distance + 1, INF)
+        new = distance.copy()
+        np.minimum(new[..., :, 1:], np.where(h_open, candidate[..., :, :-1], INF), out=new[..., :, 1:])
+        np.minimum(new[..., :, :-1], np.where(h_open, candidate[..., :, 1:], INF), out=new[..., :, :-1])
+        np.minimum(new[..., 1:, :], np.where(v_open, candidate[..., :-1, :], INF), out=new[..., 1:, :])
+        np.minimum(new[..., :-1, :], np.where(v_open, candidate[..., 1:, :], INF), out=new[..., :-1, :])
+        changed = new < distance
+        distance[...] = new
+    return iterations
+
+def _invalidate(distance: np.ndarray, h_open: np.ndarray, v_open: np.ndarray) -> int:
+    """거리 d-1 인 이웃으로 이어지지 않는 (목표가 아닌) 격자점을 INF 로 만드는 것을 더 없을 때까지 반복"""
+    iterations = 0
+    while True:
+        iterations += 1
+        need = distance - 1
+        supported = distance == 0
+        supported[..., :, 1:] |= h_open & (distance[..., :, :-1] == need[..., :, 1:])
+        supported[..., :, :-1] |= h_open & (distance[..., :, 1:] == need[..., :, :-1])
+        supported[..., 1:, :] |= v_open & (distance[..., :-1, :] == need[..., 1:, :])
+        supported[..., :-1, :] |= v_open & (distance[..., 1:, :] == need[..., :-1, :])
+        orphaned = ~supported & (distance < INF)
+        if not orphaned.any():
+            return iterations
+        distance[orphaned] = INF
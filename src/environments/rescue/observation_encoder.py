@@ -0,0 +1,163 @@
+from typing import Sequence, Dict, Any, Optional
+import numpy as np
+from environments.base.agent_registry import AGENT_TYPE_CODES
+from environments.rescue.visibility import VisibilityResult
+
+class ObservationEncoder:
+    """모든 에이전트의 가시 객체를 고정 길이(state_dim) 특징 벡터로 한 번에 변환
+    
+    특징 배치 (에이전트 기준 상대 좌표는 시야 반경으로 정규화):
+    - 자기 종류 one-hot (len(AGENT_TYPE_CODES))
+    - 자기 위치 (맵 크기로 정규화, 2)
+    - 가까운 환자 num_patients 개: (dx, dy, 존재 여부)
+    - 가까운 장애물 num_obstacles 개: (dx, dy, AERIAL 여부, 존재 여부)
+    - 시야를 patch_size x patch_size 칸으로 나눈 장애물 점유 패치
+    - 받은 메시지 수 (message_scale 로 정규화)
+    - navigation 을 켜면 흐름장의 다음 이동 방향 부호 (dx, dy) 와 정규화한 환자까지의 거리 (3)
+    나머지는 0으로 채운다. 결과는 미리 할당한 버퍼에 쓰므로 에이전트 수가 늘지 않는 한
+    매 스텝 같은 배열(과 같은 메모리를 공유하는 torch 텐서)을 재사용한다.
+    """
+    
+    def __init__(self, state_dim: int = 64, num_patients: int = 4, num_obstacles: int = 4,
+                 patch_size: int = 5, message_scale: float = 10.0, navigation: bool = False):
+        self.state_dim = state_dim
+        self.num_patients = num_patients
+        self.num_obstacles = num_obstacles
+        self.patch_size = patch_size
+        self.message_scale = message_scale
+        self.navigation = navigation
+        
+        # 각 특징 구간의 시작 위치
+        self.type_offset = 0
+        self.position_offset = self.type_offset + len(AGENT_TYPE_CODES)
+        self.patient_offset = self.position_offset + 2
+        self.obstacle_offset = self.patient_offset + 3 * num_patients
+        self.patch_offset = self.obstacle_offset + 4 * num_obstacles
+        self.message_offset = self.patch_offset + patch_size * patch_size
+        self.navigation_offset = self.message_offset + 1
+        self.feature_dim = self.navigation_offset + (3 if navigation else 0)
+        if self.feature_dim > state_dim:
+            raise ValueError(f"state_dim {state_dim} is smaller than the encoded features ({self.feature_dim})")
+        
+        self.buffer = np.zeros((0, state_dim), dtype=np.float32)
+        self._tensor = None
+    
+    def encode(self, positions: np.ndarray, type_codes: np.ndarray, view_ranges: np.ndarray,
+               visibility: VisibilityResult, patients: np.ndarray, obstacles: np.ndarray,
+               aerial: np.ndarray, message_counts: np.ndarray, world_size: Sequence[float],
+               navigation: Optional[np.ndarray] = None) -> np.ndarray:
+        """에이전트별 특징 [에이전트 수, state_dim] (내부 버퍼의 뷰이므로 다음 호출에서 덮어써짐)
+        
+        patients [P, 2], obstacles [O, 2], aerial [O] 는 visibility 인덱스와 같은 순서여야 한다.
+        navigation [에이전트 수, 3] 은 NavigationField.features 결과이다 (self.navigation 일 때만 씀).
+        """
+        num_agents = len(positions)
+        if len(self.buffer) < num_agents:
+            self.buffer = np.zeros((max(num_agents, 2 * len(self.buffer)), self.state_dim), dtype=np.float32)
+            self._tensor = None
+        out = self.buffer[:num_agents]
+        out.fill(0.0)
+        
+        known = (type_codes >= 0) & (type_codes < len(AGENT_TYPE_CODES))
+        rows = np.flatnonzero(known)
+        out[rows, self.type_offset + type_codes[known]] = 1.0
+        out[:, self.position_offset:self.position_offset + 2] = positions / np.asarray(world_size)
+        out[:, self.message_offset] = np.minimum(message_counts / self.message_scale, 1.0)
+        if self.navigation and navigation is not None:
+            out[:, self.navigation_offset:self.navigation_offset + 3] = navigation
+        
+        scale = np.where(view_ranges > 0, view_ranges, 1.0)
+        # 가까운 환자 슬롯
+        rows, delta, slot = self._nearest(positions, scale, visibility.patient_offsets,
+                                          visibility.patient_indices, patients, self.num_patients)
+        columns = self.patient_offset + 3 * slot
+        out[rows, columns] = delta[:, 0]
+        out[rows, columns + 1] = delta[:, 1]
+        out[rows, columns + 2] = 1.0
+        
+        # 가까운 장애물 슬롯과 점유 패치
+        rows, delta, slot, indices = self._nearest(positions, scale, visibility.obstacle_offsets,
+                                                   visibility.obstacle_indices, obstacles,
+                                                   self.num_obstacles, return_all=True)
+        near = slot < self.num_obstacles
+        columns = self.obstacle_offset + 4 * slot[near]
+        out[rows[near], columns] = delta[near, 0]
+        out[rows[near], columns + 1] = delta[near, 1]
+        out[rows[near], columns + 2] = aerial[indices[near]]
+        out[rows[near], columns + 3] = 1.0
+        cells = np.clip(((delta + 1.0) * (self.patch_size / 2)).astype(np.int64), 0, self.patch_size - 1)
+        out[rows, self.patch_offset + cells[:, 1] * self.patch_size + cells[:, 0]] = 1.0
+        return out
+    
+    def encode_env(self, env, visibility: VisibilityResult) -> np.ndarray:
+        """RescueEnv 의 현재 에이전트 전체를 인코딩"""
+        registry = env.registry
+        count = registry.count
+        message_counts = np.fromiter((len(agent.received_messages) for agent in env.agents),
+                                     dtype=np.float32, count=count)
+        obstacles, aerial = env.obstacle_arrays()
+        navigation = None
+        if self.navigation and getattr(env, 'navigation', None) is not None:
+            navigation = env.navigation.features(env.navigation_moves, env.navigation_distances)
+        return self.encode(registry.positions[:count], registry.type_codes[:count].astype(np.int64),
+                           registry.view_ranges[:count], visibility,
+                           np.asarray(env.patients, dtype=np.float64).reshape(-1, 2),
+                           obstacles, aerial, message_counts, (env.width, env.height), navigation)
+    
+    @property
+    def tensor(self):
+        """버퍼와 메모리를 공유하는 torch 텐서 (버퍼를 다시 할당할 때만 새로 생성)"""
+        if self._tensor is None:
+            import torch
+            self._tensor = torch.from_numpy(self.buffer)
+        return self._tensor
+    
+    def _nearest(self, positions, scale, offsets, indices, points, k, return_all=False):
+        """CSR 가시 목록을 에이전트별 거리순으로 정렬하고 순위(slot)를 매김
+        
+        return_all 이 아니면 순위가 k 미만인 것만 반환한다.
+        """
+        counts = np.diff(offsets)
+        rows = np.repeat(np.arange(len(positions)), counts)
+        delta = (points[indices] - positions[rows]) / scale[rows, None]
+        distance = delta[:, 0] ** 2 + delta[:, 1] ** 2
+        # CSR 이라 행은 이미 묶여 있으므로 (행, 거리) 순 정렬 후 행 시작 위치를 빼면 순위
+        order = np.lexsort((distance, rows))
+        slot = np.arange(len(order)) - offsets[rows[order]]
+        rows, delta, indices = rows[order], delta[order], indices[order]
+        if return_all:
+            return rows, delta, slot, indices
+        near = slot < k
+        return rows[near], delta[near], slot[near]
+
+class FeatureBatch:
+    """정책 입력용으로 여러 관찰의 'features' 를 미리 할당한 버퍼에 모으는 도우미
+    
+    특징 배열 [B, state_dim] 을 직접 주면 복사 없이 torch 텐서 뷰로 바꾸고,
+    관찰 딕셔너리 목록이면 각 'features' 를 재사용 버퍼로 복사한다. 'features' 가 없는 관찰은 0 벡터이다.
+    """
+    
+    def __init__(self, state_dim: int):
+        self.state_dim = state_dim
+        self.buffer = np.zeros((0, state_dim), dtype=np.float32)
+        self._zeros = np.zeros(state_dim, dtype=np.float32)
+        self._tensor = None
+    
+    def __call__(self, states):
+        import torch
+        if isinstance(states, torch.Tensor):
+            return states
+        if isinstance(states, np.ndarray):
+            return torch.from_numpy(np.ascontiguousarray(states, dtype=np.float32))
+        if len(self.buffer) < len(states):
+            self.buffer = np.zeros((max(len(states), 2 * len(self.buffer)), self.state_dim), dtype=np.float32)
+            self._tensor = torch.from_numpy(self.buffer)
+        elif self._tensor is None:
+            self._tensor = torch.from_numpy(self.buffer)
+        if states:
+            np.stack([self.features(state) for state in states], out=self.buffer[:len(states)])
+        return self._tensor[:len(states)]
+    
+    def features(self, state: Dict[str, Any]) -> np.ndarray:
+        features = state.get('features')
+        return self._zeros if features is None else features
@@ -0,0 +1,74 @@
+import math
+from typing import Tuple, Optional
+import numpy as np
+from environments.rescue.constants import ObstacleType, RescueConfig
+
+class OccupancyGrid:
+    """정수 좌표 격자 위의 에이전트 종류별 통과 가능 여부 인덱스
+    
+    각 칸에는 그 좌표를 막는 장애물 수를 저장한다. 장애물 추가/제거 시 해당
+    장애물이 덮는 칸만 증감하므로, 이동 가능 여부 확인은 배열 조회 한 번이다.
+    충돌 판정은 RescueEnv._is_collision 과 동일하게 |dx| < threshold and |dy| < threshold.
+    """
+    
+    GROUND = 0  # 모든 장애물에 막히는 지상 에이전트
+    AERIAL = 1  # AERIAL 장애물을 넘을 수 있는 드론
+    
+    def __init__(self, width: int, height: int,
+                 threshold: float = RescueConfig.OBSTACLE_SIZE/2):
+        self.width = width
+        self.height = height
+        self.threshold = threshold
+        # blocked[layer, y, x]: 해당 좌표를 막는 장애물 수
+        self.blocked = np.zeros((2, height + 1, width + 1), dtype=np.int32)
+        
+    def add(self, pos: Tuple[float, float], obstacle_type: ObstacleType):
+        """장애물이 덮는 칸의 카운트를 증가"""
+        self._update(pos, obstacle_type, 1)
+        
+    def remove(self, pos: Tuple[float, float], obstacle_type: ObstacleType):
+        """장애물이 덮는 칸의 카운트를 감소"""
+        self._update(pos, obstacle_type, -1)
+        
+    def clear(self):
+        """모든 장애물 제거"""
+        self.blocked.fill(0)
+        
+    def is_passable(self, pos: Tuple[float, float], can_fly: bool) -> Optional[bool]:
+        """좌표의 통과 가능 여부 (격자 밖이거나 정수가 아닌 좌표는 None)"""
+        x, y = pos
+        ix, iy = int(x), int(y)
+        if ix != x or iy != y or not (0 <= ix <= self.width and 0 <= iy <= self.height):
+            return None
+        layer = self.AERIAL if can_fly else self.GROUND
+        return bool(self.blocked[layer, iy, ix] == 0)
+    
+    def passable_mask(self, xs: np.ndarray, ys: np.ndarray, can_fly: np.ndarray) -> np.ndarray:
+        """격자 내부 정수 좌표 배열에 대한 통과 가능 여부를 한 번에 계산"""
+        layers = np.where(can_fly, self.AERIAL, self.GROUND)
+        return self.blocked[layers, ys, xs] == 0
+    
+    def _update(self, pos: Tuple[float, float], obstacle_type: ObstacleType, delta: int):
+        x0, x1 = self._span(pos[0], self.width)
+        y0, y1 = self._span(pos[1], self.height)
+        if x0 > x1 or y0 > y1:
+            return
+        self.blocked[self.GROUND, y0:y1 + 1, x0:x1 + 1] += delta
+        if obstacle_type != ObstacleType.AERIAL:
+            self.blocked[self.AERIAL, y0:y1 + 1, x0:x1 + 1] += delta
+            
+    def _span(self, center: float, limit: int) -> Tuple[int, int]:
+        """|p - center| < threshold 를 만족하는 정수 p의 범위 [lo, hi] (격자 범위로 잘림)"""
+        t = self.threshold
+        lo = math.floor(center - t) + 1
+        hi = math.ceil(center + t) - 1
+        # 부동소수점 경계에서도 _is_collision 과 같은 결과가 나오도록 보정
+        while abs((lo - 1) - center) < t:
+            lo -= 1
+        while lo <= hi and not abs(lo - center) < t:
+            lo += 1
+        while abs((hi + 1) - center) < t:
+            hi += 1
+        while hi >= lo and not abs(hi - center) < t:
+            hi -= 1
+        return max(lo, 0), min(hi, limit)
@@ -1,12 +1,20 @@
-import pygame
 import math
-from typing import List, Tuple, Dict, Any, TYPE_CHECKING
+import numpy as np
+from typing import List, Tuple, Dict, Any, Optional, TYPE_CHECKING
 from environments.base.base_environment import BaseEnvironment
 from environments.rescue.constants import ObstacleType, Colors, RescueConfig
 from agents.types.drone import DroneAgent
 from agents.types.wheeled import WheeledAgent
 from agents.types.observer import Observer
 from environments.rescue.communication_channel import CommunicationChannel
+from environments.rescue.occupancy_grid import OccupancyGrid
+from environments.rescue.visibility import VisibilityEngine, VisibilityResult
+from environments.rescue.line_of_sight import LineOfSight
+from environments.rescue.spatial_index import UniformGridIndex
+from environments.rescue.observation_encoder import ObservationEncoder
+from environments.rescue.navigation import NavigationField
+from environments.rescue.coverage import CoverageMap
+from utils.profiling import StepProfiler
 
 if TYPE_CHECKING:
     from agents.base.base_agent import BaseAgent
@@ -14,156 +22,373 @@ if TYPE_CHECKING:
 class RescueEnv(BaseEnvironment):
     def __init__(self, width: int = RescueConfig.DEFAULT_WIDTH, 
                  height: int = RescueConfig.DEFAULT_HEIGHT,
-                 grid_size: int = RescueConfig.DEFAULT_GRID_SIZE):
-        super().__init__()
-        pygame.init()
+                 grid_size: int = RescueConfig.DEFAULT_GRID_SIZE,
+                 render_mode: Optional[str] = None,
+                 max_steps: Optional[int] = None,
+                 comm_channel: Optional[CommunicationChannel] = None,
+                 observation_encoder: Optional[ObservationEncoder] = None,
+                 render_every: int = 1,
+                 profiler: Optional[StepProfiler] = None,
+                 navigation: bool = False,
+                 occlusion: bool = False,
+                 coverage: bool = False):
+        # pygame은 첫 render() 호출 시에만 초기화 (headless 학습 워커는 비용 없음)
+        super().__init__(render_mode, render_every, profiler)
         self.width = width
         self.height = height
         self.grid_size = grid_size
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("Rescue Mission")
+        self.max_steps = max_steps  # None이면 에피소드가 끝나지 않음
         
         # Environment specific state
         self.patients = []
-        self.obstacles = {}
+        self.obstacles = {}  # add_obstacle / remove_obstacle 로만 변경 (occupancy와 동기화)
+        self.occupancy = OccupancyGrid(width, height)
+        # occlusion 이면 장애물에 가려진 환자/장애물은 보이지 않음 (드론은 AERIAL 장애물 너머를 봄)
+        self.visibility = VisibilityEngine(
+            line_of_sight=LineOfSight(self.occupancy) if occlusion else None,
+            obstacle_radius=self.occupancy.threshold)
+        self._obstacle_version = 0  # 장애물이 바뀔 때마다 증가
+        self._visibility_version = -1  # visibility 인덱스를 만든 시점의 장애물 버전
+        # 상태 스냅샷 캐시: 장애물 목록은 장애물 버전, 에이전트 목록은 이동 버전이 바뀔 때만 재생성
+        self._agent_version = 0
+        self._obstacle_state: List[Tuple[Tuple[int, int], str]] = []
+        self._obstacle_state_version = -1
+        self._agent_state: List[Tuple[Tuple[int, int], str]] = []
+        self._agent_state_version = -1
+        self._obstacle_arrays = (np.zeros((0, 2)), np.zeros(0, dtype=np.float32))
+        self._obstacle_arrays_version = -1
+        self.clearance: Optional[np.ndarray] = None  # 컴파일된 시나리오에서 불러온 격자점별 장애물 거리 [2, R, C]
+        # 환자 쪽 거리장/흐름장 (켜면 관찰마다 'navigation_move' 와 인코더의 navigation 특징을 채움)
+        self.navigation: Optional[NavigationField] = NavigationField(self) if navigation else None
+        self.navigation_moves = np.zeros((0, 2), dtype=np.int64)
+        self.navigation_distances = np.zeros(0)
+        # 팀/에이전트별 탐색 지도 (켜면 info['coverage'] 에 보상 항, 관찰마다 'coverage' 채널)
+        self.coverage: Optional[CoverageMap] = CoverageMap(width, height, grid_size) if coverage else None
+        # 관찰의 'features' (정책 입력용 고정 길이 벡터)를 만드는 인코더
+        self.observation_encoder = observation_encoder if observation_encoder is not None else ObservationEncoder()
         self.observer = Observer((100, 300), -1)  # Observer 추가
-        self.comm_channel = CommunicationChannel()
-        
+        self.comm_channel = comm_channel if comm_channel is not None else CommunicationChannel()
+        self._spawn_positions: List[Tuple[int, int]] = []  # reset 시 복원할 에이전트 시작 위치
+        # 렌더링 캐시: 정적 배경 레이어, 폰트와 글자 표면, 시야각 표면
+        self._background = None
+        self._background_key = None
+        self._font = None
+        self._label_cache: Dict[Tuple[str, Tuple[int, int, int]], Any] = {}
+        self._cone_surface = None
+        self._cone_polygon = None  # 시야각 표면에 지금 그려진 다각형 (다음 프레임에 지움)
+    
     def reset(self) -> Dict[str, Any]:
         """환경을 초기화하고 초기 상태를 반환"""
-        # 기존 상태는 유지하고 time만 초기화
+        # 맵(환자, 장애물)은 유지하고 시간, 에이전트 위치, 통신만 초기화
         self.time = 0
+        for agent, spawn_pos in zip(self.agents, self._spawn_positions):
+            agent.pos = spawn_pos
+        self._agent_version += 1
+        self.comm_channel.clear()
+        if self.coverage is not None:
+            # 시작 위치에서 보이는 칸은 보상 없이 미리 탐색한 것으로 둠
+            self.coverage.reset()
+            self._update_coverage()
         return self._get_state()
-        
+    
     def step(self, actions: List[Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool, Dict[str, Any]]:
-        # Observer 스캔
-        detected_objects = self.observer.scan(self._get_state())
+        profiler = self.profiler
+        profiler.begin_step()
+        try:
+            state, observations, done, info = self._run_step(actions, profiler)
+        except BaseException:
+            # 예외로 끝난 스텝에서 cProfile 이 켜진 채로 남지 않도록
+            profiler.abort_step()
+            raise
+        profile = profiler.end_step()
+        if profile is not None:
+            info['profile'] = profile
+        return state, observations, done, info
+    
+    def _run_step(self, actions: List[Any], profiler: StepProfiler) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool, Dict[str, Any]]:
+        # 통신 시각과 거리 제한 방송에 쓸 현재 위치 (Observer 포함)
+        count = self.registry.count
+        with profiler.phase('comm_sync'):
+            self.comm_channel.advance(self.time)
+            self.comm_channel.update_positions(
+                self.registry.ids[:count].tolist() + [self.observer.id],
+                np.vstack([self.registry.positions[:count], self.observer.pos]))
+        
+        # Observer 스캔 (한 스텝에 한 번)
+        with profiler.phase('observer_scan'):
+            detected_objects = self.observer.scan(self._get_state())
         
         # Observer 정보 공유
-        detected_info = self.observer.scan(self._get_state())
-        self.comm_channel.broadcast(-1, {
-            'type': 'observation',
-            'data': detected_info
-        })
-        
-        # 각 에이전트의 행동 및 통신 처리
-        for agent, action in zip(self.agents, actions):
-            # 행동 실행
-            movement, message = action  # 행동과 통신 메시지 분리
-            if message:
-                self.comm_channel.broadcast(agent.id, message)
+        with profiler.phase('observer_broadcast'):
+            self.comm_channel.broadcast(-1, {
+                'type': 'observation',
+                'data': detected_objects
+            })
+        
+        # 각 에이전트의 통신 처리 (에이전트마다 재면 꺼져 있을 때도 비용이 커서 루프 전체를 한 단계로 잼)
+        movements = []
+        received = 0
+        with profiler.phase('comm_agents'):
+            for agent, action in zip(self.agents, actions):
+                movement, message = action  # 행동과 통신 메시지 분리
+                if message:
+                    self.comm_channel.broadcast(agent.id, message)
                 
-            # 다른 에이전트들의 메시지 수신
-            received_msgs = self.comm_channel.receive(agent.id)
-            agent.process_messages(received_msgs)
-            
-            current_pos = agent.pos
-            dx, dy = movement
-            new_x = max(0, min(self.width, current_pos[0] + dx))
-            new_y = max(0, min(self.height, current_pos[1] + dy))
-            new_pos = (new_x, new_y)
-            
-            if self._is_valid_move(agent, new_pos):
-                agent.pos = new_pos
+                # 다른 에이전트들의 메시지 수신
+                received_msgs = self.comm_channel.receive(agent.id)
+                agent.process_messages(received_msgs)
+                received += len(received_msgs)
+                movements.append(movement)
+        profiler.count('messages_received', received)
+        
+        # 이동은 장애물과의 충돌만 보므로 순서와 무관하게 배열 단위로 처리
+        with profiler.phase('movement'):
+            self._move_agents(np.array(movements, dtype=np.float64).reshape(-1, 2))
+        
+        # 이동 후 시야에 새로 들어온 칸만 탐색 지도에 표시
+        coverage = None
+        if self.coverage is not None:
+            with profiler.phase('coverage'):
+                coverage = self._update_coverage()
         
         self.time += 1
-        observations = [agent.get_observation(self._get_state()) for agent in self.agents]
-        done = False
+        # 모든 에이전트의 시야를 한 번에 계산하고 각 에이전트는 자기 행만 읽음
+        with profiler.phase('visibility'):
+            visibility = self._compute_visibility()
+        with profiler.phase('observations'):
+            state = self._get_state()
+            state['visibility'] = visibility
+            observations = self._get_observations(state, visibility)
+        done = self.max_steps is not None and self.time >= self.max_steps
         
-        return self._get_state(), observations, done, {
+        info = {
             'time': self.time,
-            'detected_objects': detected_objects
+            'detected_objects': detected_objects,
+            'visibility': visibility,
+            'comm': self.comm_channel.pop_stats()
         }
+        if coverage is not None:
+            info['coverage'] = coverage
+        return state, observations, done, info
     
     def render(self):
-        """환경을 시각화"""
-        self.screen.fill(Colors.WHITE)
+        """환경을 시각화 (rgb_array 모드에서는 프레임 배열 반환)
+        
+        그리드/장애물/라벨은 캐시된 배경 레이어를 한 번 blit 하고, 매 프레임에는
+        Observer 시야각, 환자, 에이전트만 다시 그린다.
+        """
+        if not self._ensure_screen(self.width, self.height, "Rescue Mission"):
+            return None
+        import pygame
+        
+        self.screen.blit(self._background_layer(), (0, 0))
+        self._draw_observer_cone()
+        self._draw_patients()
+        self._draw_agents()
+        
+        # Observer 그리기
+        self.screen.blit(self._label("Observer", Colors.BLUE),
+                        (self.observer.pos[0] - 30, self.observer.pos[1] - 25))
+        pygame.draw.circle(self.screen, Colors.BLUE, self.observer.pos, RescueConfig.OBSERVER_RADIUS)
+        
+        return self._present()  # 화면 업데이트
+    
+    def _background_layer(self):
+        """흰 바탕 + 그리드 + 장애물(라벨 포함) 정적 레이어 (장애물이나 맵 크기가 바뀔 때만 다시 그림)"""
+        import pygame
+        key = (self._obstacle_version, self.width, self.height, self.grid_size)
+        if self._background is None or self._background_key != key:
+            # 화면과 같은 픽셀 형식으로 만들어 blit 시 변환이 없도록 함
+            self._background = pygame.Surface((self.width, self.height), 0, self.screen)
+            self._background.fill(Colors.WHITE)
+            self._draw_grid(self._background)
+            self._draw_obstacles(self._background)
+            self._background_key = key
+        return self._background
+    
+    def _label(self, text: str, color: Tuple[int, int, int]):
+        """렌더링한 글자 표면 (폰트와 글자는 한 번만 만들고 재사용)"""
+        surface = self._label_cache.get((text, color))
+        if surface is None:
+            import pygame
+            if self._font is None:
+                self._font = pygame.font.Font(None, 20)
+            surface = self._font.render(text, True, color)
+            self._label_cache[(text, color)] = surface
+        return surface
+    
+    def _draw_observer_cone(self):
+        """Observer의 시야각 영역과 경계선 그리기
+        
+        화면 크기 표면 하나를 재사용하며, 지난 프레임의 다각형만 투명색으로 지우고 새 다각형을
+        미리 곱한(premultiplied) 색으로 그려 영역 사각형만 섞는다 (픽셀별 알파 blit 보다 빠름).
+        """
+        import pygame
+        if self._cone_surface is None or self._cone_surface.get_size() != self.screen.get_size():
+            self._cone_surface = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            self._cone_polygon = None
         
-        # Observer의 시야각 영역 그리기
-        surface = pygame.Surface((self.width * 2, self.height * 2), pygame.SRCALPHA)
-        points = [(self.observer.pos[0], self.observer.pos[1])]
+        (ox, oy), view_range = self.observer.pos, self.observer.view_range
         num_points = 50
         start_angle = self.observer.current_angle - self.observer.fov/2
         end_angle = self.observer.current_angle + self.observer.fov/2
-        
+        points = [(ox, oy)]
         for i in range(num_points + 1):
             angle = start_angle + (end_angle - start_angle) * i / num_points
-            x = self.observer.pos[0] + math.cos(angle) * self.observer.view_range
-            y = self.observer.pos[1] + math.sin(angle) * self.observer.view_range
-            points.append((x, y))
+            points.append((ox + math.cos(angle) * view_range, oy + math.sin(angle) * view_range))
         
-        if len(points) > 2:
-            pygame.draw.polygon(surface, (0, 0, 255, 30), points)
-        self.screen.blit(surface, (-self.width//2, -self.height//2))
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        bounds = pygame.Rect(int(min(xs)) - 1, int(min(ys)) - 1,
+                             int(max(xs) - min(xs)) + 3, int(max(ys) - min(ys)) + 3)
+        bounds = bounds.clip(self._cone_surface.get_rect())
+        if self._cone_polygon is not None:
+            pygame.draw.polygon(self._cone_surface, (0, 0, 0, 0), self._cone_polygon)
+        # (0, 0, 255) 알파 30 을 미리 곱한 색
+        pygame.draw.polygon(self._cone_surface, (0, 0, 30, 30), points)
+        self._cone_polygon = points
+        self.screen.blit(self._cone_surface, bounds.topleft, bounds, special_flags=pygame.BLEND_PREMULTIPLIED)
         
         # Observer의 시야각 경계선 표시
-        pygame.draw.line(self.screen, Colors.BLUE, self.observer.pos,
-                        (self.observer.pos[0] + math.cos(start_angle) * self.observer.view_range,
-                         self.observer.pos[1] + math.sin(start_angle) * self.observer.view_range))
-        pygame.draw.line(self.screen, Colors.BLUE, self.observer.pos,
-                        (self.observer.pos[0] + math.cos(end_angle) * self.observer.view_range,
-                         self.observer.pos[1] + math.sin(end_angle) * self.observer.view_range))
-        
-        # 각 요소 그리기
-        self._draw_grid()        # 그리드 그리기
-        self._draw_patients()    # 환자 그리기
-        self._draw_obstacles()   # 장애물 그리기
-        self._draw_agents()      # 에이전트 그리기
-        
-        # Observer 그리기
-        font = pygame.font.Font(None, 20)
-        observer_text = font.render("Observer", True, Colors.BLUE)
-        self.screen.blit(observer_text, 
-                        (self.observer.pos[0] - 30, self.observer.pos[1] - 25))
-        pygame.draw.circle(self.screen, Colors.BLUE, self.observer.pos, RescueConfig.OBSERVER_RADIUS)
-        
-        pygame.display.flip()  # 화면 업데이트
+        pygame.draw.line(self.screen, Colors.BLUE, (ox, oy), points[1])
+        pygame.draw.line(self.screen, Colors.BLUE, (ox, oy), points[-1])
     
-    def _draw_grid(self):
+    def _draw_grid(self, surface):
         """그리드 그리기"""
+        import pygame
         for x in range(0, self.width, self.grid_size):
-            pygame.draw.line(self.screen, Colors.BLACK, (x, 0), (x, self.height))
+            pygame.draw.line(surface, Colors.BLACK, (x, 0), (x, self.height))
         for y in range(0, self.height, self.grid_size):
-            pygame.draw.line(self.screen, Colors.BLACK, (0, y), (self.width, y))
+            pygame.draw.line(surface, Colors.BLACK, (0, y), (self.width, y))
     
     def _draw_patients(self):
         """환자 그리기"""
-        font = pygame.font.Font(None, 20)
+        import pygame
         for i, patient_pos in enumerate(self.patients):
             pygame.draw.circle(self.screen, Colors.RED, 
                              (int(patient_pos[0]), int(patient_pos[1])), 
                              RescueConfig.PATIENT_RADIUS)
-            text = font.render(f"Patient {i+1}", True, Colors.RED)
-            self.screen.blit(text, 
+            self.screen.blit(self._label(f"Patient {i+1}", Colors.RED),
                             (patient_pos[0] - 30, patient_pos[1] - 20))
     
-    def _draw_obstacles(self):
+    def _draw_obstacles(self, surface):
         """장애물 그리기"""
-        font = pygame.font.Font(None, 20)
+        import pygame
         for i, (pos, obs_type) in enumerate(self.obstacles.items()):
             color = Colors.PURPLE if obs_type == ObstacleType.AERIAL else Colors.BLACK
             rect = pygame.Rect(int(pos[0] - RescueConfig.OBSTACLE_SIZE/2),
                              int(pos[1] - RescueConfig.OBSTACLE_SIZE/2),
                              RescueConfig.OBSTACLE_SIZE,
                              RescueConfig.OBSTACLE_SIZE)
-            pygame.draw.rect(self.screen, color, rect)
+            pygame.draw.rect(surface, color, rect)
             
-            text = font.render(
-                f"{'Aerial' if obs_type == ObstacleType.AERIAL else 'Normal'} Obs",
-                True, color
-            )
-            self.screen.blit(text, (pos[0] - 35, pos[1] - 25))
+            text = self._label(f"{'Aerial' if obs_type == ObstacleType.AERIAL else 'Normal'} Obs", color)
+            surface.blit(text, (pos[0] - 35, pos[1] - 25))
     
     def _draw_agents(self):
         """에이전트 그리기"""
-        font = pygame.font.Font(None, 20)
-        for i, agent in enumerate(self.agents):
-            pygame.draw.circle(self.screen, Colors.GREEN, agent.pos, RescueConfig.AGENT_RADIUS)
-            text = font.render(f"{type(agent).__name__} {i+1}", True, Colors.GREEN)
-            self.screen.blit(text, (agent.pos[0] - 35, agent.pos[1] - 20))
+        import pygame
+        positions = self.registry.positions[:self.registry.count].tolist()
+        for i, (pos, type_name) in enumerate(zip(positions, self.registry.type_names)):
+            pygame.draw.circle(self.screen, Colors.GREEN, pos, RescueConfig.AGENT_RADIUS)
+            self.screen.blit(self._label(f"{type_name} {i+1}", Colors.GREEN), (pos[0] - 35, pos[1] - 20))
+    
+    def _move_agents(self, movements: np.ndarray):
+        """앞쪽 len(movements)개 에이전트를 한 번에 이동 (맵 경계로 클램핑, 장애물은 통과 불가)"""
+        count = len(movements)
+        positions = self.registry.positions[:count]
+        new_positions = positions + movements
+        np.clip(new_positions[:, 0], 0, self.width, out=new_positions[:, 0])
+        np.clip(new_positions[:, 1], 0, self.height, out=new_positions[:, 1])
+        
+        cells = new_positions.astype(np.int64)
+        can_fly = self.registry.can_fly[:count]
+        on_grid = (cells == new_positions).all(axis=1)
+        if on_grid.all():
+            valid = self.occupancy.passable_mask(cells[:, 0], cells[:, 1], can_fly)
+        else:
+            valid = np.empty(count, dtype=bool)
+            valid[on_grid] = self.occupancy.passable_mask(
+                cells[on_grid, 0], cells[on_grid, 1], can_fly[on_grid])
+            # 정수가 아닌 좌표는 장애물 전체를 확인
+            for i in np.flatnonzero(~on_grid):
+                valid[i] = self._scan_valid_move(self.agents[i], tuple(new_positions[i]))
+        np.copyto(positions, new_positions, where=valid[:, None])
+        self._agent_version += 1
+    
+    def _compute_visibility(self) -> VisibilityResult:
+        """모든 에이전트의 시야 안에 있는 환자/장애물 인덱스 계산"""
+        if self._visibility_version != self._obstacle_version:
+            self.visibility.set_obstacles(self.obstacle_arrays()[0])
+            self._visibility_version = self._obstacle_version
+        if self.visibility.line_of_sight is not None:
+            self.visibility.line_of_sight.update(self._obstacle_version)
+        count = self.registry.count
+        return self.visibility.query(self.registry.positions[:count],
+                                     self.registry.view_ranges[:count],
+                                     self.patients, self.registry.can_fly[:count])
+    
+    def observe(self) -> List[Dict[str, Any]]:
+        """현재 상태에서 에이전트별 관찰 (reset 직후 첫 행동 선택용)"""
+        visibility = self._compute_visibility()
+        state = self._get_state()
+        state['visibility'] = visibility
+        return self._get_observations(state, visibility)
+    
+    def _get_observations(self, state: Dict[str, Any], visibility: VisibilityResult) -> List[Dict[str, Any]]:
+        """에이전트별 관찰과, 모든 에이전트를 한 번에 인코딩한 특징 행 ('features')
+        
+        'features' 는 인코더 버퍼의 뷰이므로 다음 스텝에서 덮어써진다.
+        navigation 이 켜져 있으면 흐름장의 다음 이동량 ('navigation_move') 도 넣는다.
+        """
+        if self.navigation is not None:
+            count = self.registry.count
+            self.navigation_moves, self.navigation_distances = self.navigation.query(
+                self.registry.positions[:count], self.registry.can_fly[:count], self.registry.speeds[:count])
+        features = self.observation_encoder.encode_env(self, visibility)
+        observations = [agent.get_observation(state) for agent in self.agents]
+        for observation, row in zip(observations, features):
+            observation['features'] = row
+        if self.navigation is not None:
+            for observation, move in zip(observations, self.navigation_moves):
+                observation['navigation_move'] = move
+        if self.coverage is not None:
+            for observation, channel in zip(observations, self.coverage.channels(len(observations))):
+                observation['coverage'] = channel
+        return observations
+    
+    def _update_coverage(self) -> Dict[str, Any]:
+        """에이전트 시야와 Observer 시야각으로 탐색 지도를 갱신하고 보상 항을 계산"""
+        count = self.registry.count
+        new_cells = self.coverage.update(self.registry.positions[:count], self.registry.view_ranges[:count])
+        observer_cells = self.coverage.update_cone(self.observer.pos, self.observer.view_range,
+                                                   self.observer.fov, self.observer.current_angle)
+        return {
+            'new_cells': new_cells,
+            'observer_cells': observer_cells,
+            'reward': new_cells * self.coverage.reward_per_cell,
+            'team_fraction': self.coverage.fraction(),
+        }
+    
+    def obstacle_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """장애물 위치 [O, 2] 와 AERIAL 여부 [O] (state['obstacles'] 순서, 장애물이 바뀔 때만 재생성)"""
+        if self._obstacle_arrays_version != self._obstacle_version:
+            self._obstacle_arrays = (
+                np.array(list(self.obstacles), dtype=np.float64).reshape(-1, 2),
+                np.array([obs_type == ObstacleType.AERIAL for obs_type in self.obstacles.values()],
+                         dtype=np.float32))
+            self._obstacle_arrays_version = self._obstacle_version
+        return self._obstacle_arrays
     
     def _is_valid_move(self, agent, new_pos: Tuple[int, int]) -> bool:
         """이동 가능 여부 확인"""
+        passable = self.occupancy.is_passable(new_pos, isinstance(agent, DroneAgent))
+        if passable is not None:
+            return passable
+        # 격자 밖이거나 정수가 아닌 좌표는 장애물 전체를 확인
+        return self._scan_valid_move(agent, new_pos)
+    
+    def _scan_valid_move(self, agent, new_pos: Tuple[int, int]) -> bool:
+        """모든 장애물과의 충돌을 직접 확인"""
         for obs_pos, obs_type in self.obstacles.items():
             if self._is_collision(new_pos, obs_pos):
                 if not (isinstance(agent, DroneAgent) and obs_type == ObstacleType.AERIAL):
@@ -178,14 +403,29 @@ class RescueEnv(BaseEnvironment):
         return dx < threshold and dy < threshold
     
     def _get_state(self) -> Dict[str, Any]:
-        """현재 환경 상태를 딕셔너리로 반환"""
+        """현재 환경 상태를 딕셔너리로 반환
+        
+        딕셔너리는 매번 새로 만들지만 안의 리스트들은 바뀌기 전까지 재사용하므로 읽기 전용으로 다룬다.
+        에이전트 위치를 step/reset 밖에서 직접 바꿨다면 invalidate_state() 를 호출해야 반영된다.
+        """
+        if self._obstacle_state_version != self._obstacle_version:
+            self._obstacle_state = [(pos, type.value) for pos, type in self.obstacles.items()]
+            self._obstacle_state_version = self._obstacle_version
+        if self._agent_state_version != self._agent_version:
+            self._agent_state = list(zip(self.registry.position_tuples(), self.registry.type_names))
+            self._agent_state_version = self._agent_version
         return {
             'time': self.time,
             'patients': self.patients,
-            'obstacles': [(pos, type.value) for pos, type in self.obstacles.items()],
-            'agents': [(agent.pos, type(agent).__name__) for agent in self.agents]
+            'obstacles': self._obstacle_state,
+            'agents': self._agent_state
         }
     
+    def invalidate_state(self):
+        """캐시된 상태 스냅샷을 버리고 다음 _get_state() 에서 다시 생성"""
+        self._obstacle_state_version = -1
+        self._agent_state_version = -1
+    
     def get_observation_space(self) -> Dict[str, Any]:
         return {
             'width': self.width,
@@ -207,11 +447,50 @@ class RescueEnv(BaseEnvironment):
     
     def add_obstacle(self, pos: Tuple[int, int], obstacle_type: ObstacleType):
         """장애물의 위치와 타입을 추가"""
+        if pos in self.obstacles:
+            self.occupancy.remove(pos, self.obstacles[pos])
         self.obstacles[pos] = obstacle_type
+        self.occupancy.add(pos, obstacle_type)
+        self._obstacle_version += 1
+    
+    def remove_obstacle(self, pos: Tuple[int, int]):
+        """장애물 제거"""
+        obstacle_type = self.obstacles.pop(pos)
+        self.occupancy.remove(pos, obstacle_type)
+        self._obstacle_version += 1
+    
+    def load_obstacles(self, positions: np.ndarray, aerial: np.ndarray,
+                       blocked: Optional[np.ndarray] = None,
+                       obstacle_index: Optional[UniformGridIndex] = None):
+        """장애물 배치 전체를 한 번에 교체 (컴파일된 시나리오 불러오기용)
+        
+        blocked 는 같은 배치의 occupancy.blocked, obstacle_index 는 같은 위치로 만든 공간 인덱스로,
+        주어지면 장애물마다 다시 계산하지 않고 그대로 쓴다 (이후 add/remove_obstacle 은 이 배열을 고침).
+        """
+        positions = np.asarray(positions).reshape(-1, 2)
+        aerial = np.asarray(aerial, dtype=bool)
+        types = [ObstacleType.AERIAL if flag else ObstacleType.NORMAL for flag in aerial.tolist()]
+        self.obstacles = dict(zip(map(tuple, positions.tolist()), types))
+        if blocked is None:
+            self.occupancy.clear()
+            for pos, obstacle_type in self.obstacles.items():
+                self.occupancy.add(pos, obstacle_type)
+        else:
+            if blocked.shape != self.occupancy.blocked.shape:
+                raise ValueError(f"blocked shape {blocked.shape} does not match {self.occupancy.blocked.shape}")
+            self.occupancy.blocked = blocked
+        self._obstacle_version += 1
+        self._obstacle_arrays = (positions.astype(np.float64), aerial.astype(np.float32))
+        self._obstacle_arrays_version = self._obstacle_version
+        if obstacle_index is not None:
+            self.visibility.obstacle_index = obstacle_index
+            self._visibility_version = self._obstacle_version
     
     def add_agent(self, agent: 'BaseAgent'):
         """에이전트를 환경에 추가"""
-        self.agents.append(agent)
+        self._spawn_positions.append(agent.pos)
+        super().add_agent(agent)
+        self._agent_version += 1
     
     def setup_default_environment(self):
         """기본 환경 설정 (환자, 장애물 배치 등)"""
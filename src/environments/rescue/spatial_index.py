@@ -0,0 +1,106 @@
+from typing import Tuple
+import numpy as np
+
+class UniformGridIndex:
+    """정적인 점 집합에 대한 균일 격자 공간 인덱스
+    
+    점들을 cell_size 크기의 칸으로 나누고 칸 번호 순으로 정렬해 CSR 형태로 보관한다.
+    반경 질의는 질의 원을 덮는 칸들의 점만 후보로 모은 뒤 정확한 거리로 거른다.
+    """
+    
+    def __init__(self, points: np.ndarray, cell_size: float):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        self.origin = self.points.min(axis=0) if len(self.points) else np.zeros(2)
+        
+        cells = self._cells(self.points)
+        keys = self._keys(cells[:, 0], cells[:, 1])
+        self.order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self.order]
+        # 점이 있는 칸의 키와, order 안에서 각 칸이 시작하는 위치
+        self.cell_keys, self.cell_start = np.unique(sorted_keys, return_index=True)
+        self.cell_start = np.append(self.cell_start, len(sorted_keys))
+    
+    @classmethod
+    def from_arrays(cls, points: np.ndarray, cell_size: float, origin: np.ndarray,
+                    order: np.ndarray, cell_keys: np.ndarray, cell_start: np.ndarray) -> 'UniformGridIndex':
+        """arrays() 로 저장해 둔 배열로 정렬 없이 인덱스를 복원"""
+        index = cls.__new__(cls)
+        index.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        index.cell_size = float(cell_size)
+        index.origin = np.asarray(origin, dtype=np.float64)
+        index.order = order
+        index.cell_keys = cell_keys
+        index.cell_start = cell_start
+        return index
+    
+    def arrays(self) -> dict:
+        """from_arrays 에 넘길 배열들 (cell_size 제외)"""
+        return {'points': self.points, 'origin': self.origin, 'order': self.order,
+                'cell_keys': self.cell_keys, 'cell_start': self.cell_start}
+    
+    def __len__(self) -> int:
+        return len(self.points)
+    
+    def query_radius(self, center: Tuple[float, float], radius: float) -> np.ndarray:
+        """center 로부터 거리 radius 이내인 점의 인덱스 (오름차순)"""
+        _, indices = self.query_radius_batch(np.asarray([center], dtype=np.float64),
+                                             np.asarray([radius], dtype=np.float64))
+        return indices
+    
+    def query_radius_batch(self, centers: np.ndarray, radii: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 중심에 대한 반경 질의를 한 번에 수행
+        
+        반환값은 CSR 형태 (offsets [A+1], indices): 중심 a 의 결과는
+        indices[offsets[a]:offsets[a+1]] 이며 점 인덱스 오름차순이다.
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        radii = np.asarray(radii, dtype=np.float64)
+        if radii.ndim == 0:
+            radii = np.full(len(centers), radii)
+        num_centers = len(centers)
+        if num_centers == 0 or len(self.points) == 0:
+            return np.zeros(num_centers + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        
+        # 각 중심의 질의 원을 덮는 칸 범위 [lo, hi]
+        lo = self._cells(centers - radii[:, None])
+        hi = self._cells(centers + radii[:, None])
+        span = hi - lo + 1
+        max_span = span.max(axis=0)
+        offset_x = np.tile(np.arange(max_span[0]), max_span[1])
+        offset_y = np.repeat(np.arange(max_span[1]), max_span[0])
+        in_span = (offset_x[None, :] < span[:, 0, None]) & (offset_y[None, :] < span[:, 1, None])
+        pair_center, pair_offset = np.nonzero(in_span)
+        keys = self._keys(lo[pair_center, 0] + offset_x[pair_offset],
+                          lo[pair_center, 1] + offset_y[pair_offset])
+        
+        # 점이 있는 칸만 남김
+        slots = np.searchsorted(self.cell_keys, keys)
+        slots = np.minimum(slots, len(self.cell_keys) - 1)
+        found = self.cell_keys[slots] == keys
+        pair_center, slots = pair_center[found], slots[found]
+        starts = self.cell_start[slots]
+        counts = self.cell_start[slots + 1] - starts
+        
+        # 칸별 [start, start+count) 구간을 후보 목록으로 펼침
+        total = int(counts.sum())
+        candidate_center = np.repeat(pair_center, counts)
+        run_starts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        candidates = self.order[run_starts + np.arange(total)]
+        
+        delta = self.points[candidates] - centers[candidate_center]
+        inside = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2) <= radii[candidate_center]
+        candidate_center, candidates = candidate_center[inside], candidates[inside]
+        
+        order = np.lexsort((candidates, candidate_center))
+        counts = np.bincount(candidate_center, minlength=num_centers)
+        offsets = np.zeros(num_centers + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets, candidates[order]
+    
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+    
+    @staticmethod
+    def _keys(cell_x: np.ndarray, cell_y: np.ndarray) -> np.ndarray:
+        return cell_y * (1 << 32) + cell_x
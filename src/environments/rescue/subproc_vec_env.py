@@ -0,0 +1,257 @@
+import multiprocessing as mp
+import traceback
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import numpy as np
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.vec_rescue_env import VecRescueEnv
+
+# 공유 메모리 배열 (이름 -> (뒤쪽 모양을 만드는 함수, dtype)); 앞 차원은 항상 환경 수
+_SHARED_ARRAYS = {
+    'actions': (lambda agents: (agents, 2), np.int64),
+    'observations': (lambda agents: (agents, 2), np.float32),
+    'rewards': (lambda agents: (agents,), np.float32),
+    'dones': (lambda agents: (), np.bool_),
+    'time': (lambda agents: (), np.int64),
+}
+
+def _attach(names: Dict[str, str], num_envs: int, num_agents: int):
+    """공유 메모리 블록에 연결하고 (블록 목록, 배열 딕셔너리) 반환"""
+    blocks, arrays = [], {}
+    for key, (shape, dtype) in _SHARED_ARRAYS.items():
+        block = shared_memory.SharedMemory(name=names[key])
+        blocks.append(block)
+        arrays[key] = np.ndarray((num_envs,) + shape(num_agents), dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+def _worker(conn, env_fn: Callable[[], RescueEnv], env_slice: slice, names: Dict[str, str],
+            num_envs: int, num_agents: int, max_steps: Optional[int],
+            reward_fn: Optional[Callable[[VecRescueEnv, np.ndarray], np.ndarray]]):
+    """env_slice 범위의 환경을 VecRescueEnv 로 진행하고 결과를 공유 메모리에 직접 기록"""
+    blocks, arrays = _attach(names, num_envs, num_agents)
+    try:
+        vec_env = VecRescueEnv([env_fn() for _ in range(env_slice.stop - env_slice.start)], max_steps)
+        _serve(conn, vec_env, {key: array[env_slice] for key, array in arrays.items()}, reward_fn)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    except Exception:
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+        conn.close()
+
+def _serve(conn, vec_env: VecRescueEnv, arrays: Dict[str, np.ndarray],
+           reward_fn: Optional[Callable[[VecRescueEnv, np.ndarray], np.ndarray]]):
+    """'close' 를 받을 때까지 명령을 처리 (arrays 는 이 워커가 맡은 구간의 뷰)"""
+    actions, observations = arrays['actions'], arrays['observations']
+    rewards, dones, time = arrays['rewards'], arrays['dones'], arrays['time']
+    while True:
+        command = conn.recv()
+        if command == 'step':
+            positions, done, info = vec_env.step(actions)
+            if reward_fn is not None:
+                # 보상은 자동 reset 전 위치 기준
+                final = positions.copy()
+                if done.any():
+                    final[done] = info['final_positions']
+                rewards[:] = reward_fn(vec_env, final)
+            observations[:] = positions
+            dones[:] = done
+            time[:] = vec_env.time
+        elif command == 'reset':
+            observations[:] = vec_env.reset()
+            rewards[:] = 0.0
+            dones[:] = False
+            time[:] = 0
+        elif command == 'close':
+            return
+        conn.send(('ok', None))
+
+class SubprocVecEnv:
+    """여러 워커 프로세스가 환경을 나눠 맡아 진행하는 벡터화 환경
+    
+    워커 i 는 연속된 환경 구간을 하나의 VecRescueEnv 로 진행하고, 관찰(에이전트 위치)/보상/
+    종료 여부를 multiprocessing.shared_memory 배열에 직접 쓴다. 학습 프로세스는 같은 메모리를
+    복사 없이 읽으며, 파이프로는 'step'/'reset'/'close' 같은 짧은 명령과 응답만 오간다.
+    워커가 죽으면 같은 구간으로 다시 띄우고 해당 환경을 reset 한 뒤 info['restarted'] 에 기록한다.
+    
+    재시작 제한은 워커별 이동 구간 기준이다: 한 워커가 최근 restart_window 번의 step 안에서
+    max_restarts 번을 넘게 죽으면 (계속 죽는 워커로 보고) RuntimeError 를 낸다. 드물게 따로따로
+    일어나는 충돌은 긴 학습에서도 제한에 걸리지 않는다. restarts 는 전체 재시작 횟수 (통계용) 이다.
+    """
+    
+    def __init__(self, env_fn: Callable[[], RescueEnv], num_envs: int, num_workers: int,
+                 max_steps: Optional[int] = None,
+                 reward_fn: Optional[Callable[[VecRescueEnv, np.ndarray], np.ndarray]] = None,
+                 start_method: Optional[str] = None, max_restarts: int = 3, restart_window: int = 10000,
+                 timeout: float = 60.0):
+        if not 0 < num_workers <= num_envs:
+            raise ValueError("num_workers must be between 1 and num_envs")
+        self.env_fn = env_fn
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.max_steps = max_steps
+        self.reward_fn = reward_fn
+        self.max_restarts = max_restarts  # 워커마다 restart_window 스텝 안에서 허용하는 재시작 수
+        self.restart_window = restart_window
+        self.timeout = timeout
+        self.restarts = 0
+        self.steps = 0  # step_wait 를 마친 횟수 (재시작 구간 기준)
+        self._restart_steps = [deque() for _ in range(num_workers)]  # 워커별 최근 재시작 시점
+        self._context = mp.get_context(start_method)
+        
+        # 에이전트 수는 원형 환경 하나로 확인
+        self.num_agents = len(env_fn().agents)
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.buffers: Dict[str, np.ndarray] = {}
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self.slices = [slice(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+        self._processes: List[Optional[mp.Process]] = [None] * num_workers
+        self._conns: List[Any] = [None] * num_workers
+        self.closed = False
+        try:
+            for key, (shape, dtype) in _SHARED_ARRAYS.items():
+                shape = (num_envs,) + shape(self.num_agents)
+                block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+                self._blocks[key] = block
+                self.buffers[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                self.buffers[key].fill(0)
+            for i in range(num_workers):
+                self._start_worker(i)
+        except BaseException:
+            # 이미 만든 공유 메모리와 띄운 워커를 정리 (남겨 두면 /dev/shm 에 블록이 쌓임)
+            self.close()
+            raise
+    
+    # 학습 프로세스가 복사 없이 읽는 공유 배열
+    @property
+    def observations(self) -> np.ndarray:
+        return self.buffers['observations']
+    
+    @property
+    def rewards(self) -> np.ndarray:
+        return self.buffers['rewards']
+    
+    @property
+    def dones(self) -> np.ndarray:
+        return self.buffers['dones']
+    
+    def reset(self) -> np.ndarray:
+        """모든 환경 초기화 (반환값은 공유 관찰 배열 [N, A, 2] 자체)"""
+        self._broadcast('reset')
+        self._wait_all()
+        return self.observations
+    
+    def step_async(self, actions: np.ndarray):
+        """행동을 공유 메모리에 쓰고 모든 워커에 진행 명령 전송"""
+        np.copyto(self.buffers['actions'], actions, casting='same_kind')
+        self._broadcast('step')
+    
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """(관찰 [N, A, 2], 보상 [N, A], 종료 [N], info) — 배열은 공유 메모리 뷰이므로 다음 step 에서 덮어써짐"""
+        restarted = self._wait_all()
+        self.steps += 1
+        info = {'time': self.buffers['time']}
+        if restarted:
+            info['restarted'] = restarted
+        return self.observations, self.rewards, self.dones, info
+    
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        self.step_async(actions)
+        return self.step_wait()
+    
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        conns = [conn for conn in self._conns if conn is not None]
+        for conn in conns:
+            try:
+                conn.send('close')
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in conns:
+            conn.close()
+        self.buffers.clear()
+        for block in self._blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass  # 밖에서 아직 배열 뷰를 쥐고 있으면 그 뷰가 사라질 때 해제됨
+            block.unlink()
+        self._blocks.clear()
+    
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
+    
+    def _start_worker(self, i: int):
+        parent_conn, child_conn = self._context.Pipe()
+        names = {key: block.name for key, block in self._blocks.items()}
+        process = self._context.Process(
+            target=_worker, daemon=True,
+            args=(child_conn, self.env_fn, self.slices[i], names, self.num_envs, self.num_agents,
+                  self.max_steps, self.reward_fn))
+        process.start()
+        child_conn.close()
+        self._processes[i] = process
+        self._conns[i] = parent_conn
+    
+    def _broadcast(self, command: str):
+        for conn in self._conns:
+            try:
+                conn.send(command)
+            except (BrokenPipeError, OSError):
+                pass  # 응답을 기다릴 때 재시작
+    
+    def _wait_all(self) -> List[int]:
+        """모든 워커의 응답을 기다리고, 죽은 워커는 다시 띄운 뒤 그 구간을 reset"""
+        restarted = []
+        for i, conn in enumerate(self._conns):
+            try:
+                if not conn.poll(self.timeout):
+                    raise TimeoutError(f"worker {i} did not respond within {self.timeout}s")
+                status, payload = conn.recv()
+            except (EOFError, ConnectionResetError, TimeoutError):
+                self._restart_worker(i)
+                restarted.append(i)
+                continue
+            if status == 'error':
+                raise RuntimeError(f"worker {i} failed:\n{payload}")
+        return restarted
+    
+    def _restart_worker(self, i: int):
+        recent = self._restart_steps[i]
+        while recent and recent[0] <= self.steps - self.restart_window:
+            recent.popleft()
+        if len(recent) >= self.max_restarts:
+            raise RuntimeError(f"worker {i} crashed more than {self.max_restarts} times "
+                               f"within {self.restart_window} steps")
+        recent.append(self.steps)
+        self.restarts += 1
+        process = self._processes[i]
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        self._conns[i].close()
+        self._start_worker(i)
+        # 새 워커의 환경은 처음 상태이므로 종료로 표시
+        try:
+            self._conns[i].send('reset')
+            if not self._conns[i].poll(self.timeout):
+                raise RuntimeError(f"worker {i} did not respond within {self.timeout}s after restart")
+            status, payload = self._conns[i].recv()
+        except (EOFError, ConnectionResetError, BrokenPipeError) as error:
+            raise RuntimeError(f"worker {i} could not be restarted") from error
+        if status == 'error':
+            raise RuntimeError(f"worker {i} failed after restart:\n{payload}")
+        self.buffers['dones'][self.slices[i]] = True
@@ -0,0 +1,101 @@
+from typing import List, Tuple, Dict, Any, Optional
+import numpy as np
+from environments.rescue.rescue_env import RescueEnv
+from environments.rescue.occupancy_grid import OccupancyGrid
+from environments.base.agent_registry import AgentRegistry
+from agents.types.drone import DroneAgent
+
+class VecRescueEnv:
+    """N개의 독립된 구조 환경을 쌓은 NumPy 배열로 한 번에 진행하는 벡터화 환경
+    
+    RescueEnv 인스턴스들을 원형으로 받아 에이전트 위치와 장애물 격자를 배열로 복사한다.
+    step 은 RescueEnv.step 의 이동 규칙(맵 경계 클램핑 후 장애물 통과 가능 여부 확인)을
+    모든 환경/에이전트에 대해 한 번에 적용하고, max_steps 에 닿은 에피소드는 자동으로 reset 한다.
+    RescueEnv.step 과 같이 속도 제한이나 환자 기반 종료/보상은 없으며, 장애물 배치는 생성 시점 기준으로 고정된다.
+    """
+    
+    def __init__(self, envs: List[RescueEnv], max_steps: Optional[int] = None):
+        if not envs:
+            raise ValueError("VecRescueEnv needs at least one environment")
+        first = envs[0]
+        for env in envs:
+            if (env.width, env.height) != (first.width, first.height):
+                raise ValueError("All environments must share the same width and height")
+            if len(env.agents) != len(first.agents):
+                raise ValueError("All environments must have the same number of agents")
+        
+        self.num_envs = len(envs)
+        self.num_agents = len(first.agents)
+        self.width = first.width
+        self.height = first.height
+        self.max_steps = max_steps if max_steps is not None else first.max_steps
+        
+        # 에이전트 상태 [N, A, ...]
+        self.spawn_positions = self._to_int_positions(
+            [list(env._spawn_positions) for env in envs])
+        self.positions = self._to_int_positions(
+            [[agent.pos for agent in env.agents] for env in envs])
+        self.can_fly = np.array([[isinstance(agent, DroneAgent) for agent in env.agents]
+                                 for env in envs], dtype=bool)
+        self.type_codes = np.array([[AgentRegistry.type_code(agent) for agent in env.agents]
+                                    for env in envs], dtype=np.int64)
+        self._layers = np.where(self.can_fly, OccupancyGrid.AERIAL, OccupancyGrid.GROUND)
+        self.time = np.array([env.time for env in envs], dtype=np.int64)
+        
+        # 장애물 배치가 같은 환경끼리는 통과 가능 격자를 공유 [M, 2, H+1, W+1]
+        layouts: Dict[frozenset, int] = {}
+        grids = []
+        map_ids = []
+        for env in envs:
+            key = frozenset(env.obstacles.items())
+            if key not in layouts:
+                layouts[key] = len(grids)
+                grids.append(env.occupancy.blocked == 0)
+            map_ids.append(layouts[key])
+        self.passable = np.stack(grids)
+        self.map_ids = np.array(map_ids, dtype=np.int64)
+    
+    def reset(self) -> np.ndarray:
+        """모든 환경을 초기화하고 에이전트 위치 [N, A, 2] 반환"""
+        self.positions[:] = self.spawn_positions
+        self.time[:] = 0
+        return self.positions.copy()
+    
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+        """정수 이동량 actions[N, A, 2] 로 모든 환경을 한 스텝 진행
+        
+        반환값은 (위치 [N, A, 2], 종료 여부 [N], info). 종료된 환경은 자동으로
+        초기화되며, 초기화 전 위치는 info['final_positions'] 에 담긴다.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != self.positions.shape:
+            raise ValueError(f"actions must have shape {self.positions.shape}, got {actions.shape}")
+        if not np.issubdtype(actions.dtype, np.integer):
+            raise TypeError("actions must be integer (dx, dy) displacements")
+        
+        new_positions = self.positions + actions
+        np.clip(new_positions[..., 0], 0, self.width, out=new_positions[..., 0])
+        np.clip(new_positions[..., 1], 0, self.height, out=new_positions[..., 1])
+        passable = self.passable[self.map_ids[:, None], self._layers,
+                                 new_positions[..., 1], new_positions[..., 0]]
+        np.copyto(self.positions, new_positions, where=passable[..., None])
+        
+        self.time += 1
+        if self.max_steps is not None:
+            dones = self.time >= self.max_steps
+        else:
+            dones = np.zeros(self.num_envs, dtype=bool)
+        
+        info = {'time': self.time.copy()}
+        if dones.any():
+            info['final_positions'] = self.positions[dones].copy()
+            self.positions[dones] = self.spawn_positions[dones]
+            self.time[dones] = 0
+        return self.positions.copy(), dones, info
+    
+    def _to_int_positions(self, positions: List[List[Tuple[float, float]]]) -> np.ndarray:
+        array = np.array(positions, dtype=np.float64).reshape(len(positions), -1, 2)
+        as_int = array.astype(np.int64)
+        if not np.array_equal(as_int, array):
+            raise ValueError("VecRescueEnv requires integer agent positions")
+        return as_int
@@ -0,0 +1,98 @@
+from typing import Tuple, Optional
+import numpy as np
+from environments.rescue.spatial_index import UniformGridIndex
+from environments.rescue.line_of_sight import LineOfSight
+
+def in_view_range(center: Tuple[float, float], view_range: float, points: np.ndarray) -> np.ndarray:
+    """center 로부터 view_range 이내인 점들의 마스크 (에이전트의 _is_in_view_range 와 같은 판정)"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    dx = points[:, 0] - center[0]
+    dy = points[:, 1] - center[1]
+    return np.sqrt(dx**2 + dy**2) <= view_range
+
+class VisibilityResult:
+    """모든 에이전트의 가시 객체를 CSR 인덱스 배열로 담은 결과
+    
+    에이전트 행 a 에서 보이는 환자는 patient_indices[patient_offsets[a]:patient_offsets[a+1]],
+    장애물은 obstacle_indices[obstacle_offsets[a]:obstacle_offsets[a+1]] 이다.
+    인덱스는 상태의 'patients' / 'obstacles' 리스트 순서를 따른다.
+    """
+    
+    def __init__(self, patient_offsets: np.ndarray, patient_indices: np.ndarray,
+                 obstacle_offsets: np.ndarray, obstacle_indices: np.ndarray):
+        self.patient_offsets = patient_offsets
+        self.patient_indices = patient_indices
+        self.obstacle_offsets = obstacle_offsets
+        self.obstacle_indices = obstacle_indices
+    
+    def __len__(self) -> int:
+        return len(self.patient_offsets) - 1
+    
+    def visible(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """에이전트 행 row 에서 보이는 (환자 인덱스, 장애물 인덱스)"""
+        return (self.patient_indices[self.patient_offsets[row]:self.patient_offsets[row + 1]],
+                self.obstacle_indices[self.obstacle_offsets[row]:self.obstacle_offsets[row + 1]])
+
+class VisibilityEngine:
+    """모든 에이전트의 시야(view_range) 안에 있는 환자/장애물을 한 번에 계산
+    
+    정적인 장애물은 균일 격자 인덱스로 후보를 좁히고, 수가 적고 바뀔 수 있는
+    환자는 에이전트 x 환자 거리를 벡터화해서 한 번에 계산한다.
+    line_of_sight 가 있으면 시야 안의 후보 중 장애물에 가려진 것을 광선 추적으로 뺀다
+    (장애물 대상은 obstacle_radius 안에서 처음 막히면 보이는 것으로 봄).
+    """
+    
+    def __init__(self, cell_size: float = 100, chunk_size: int = 1 << 20,
+                 line_of_sight: Optional[LineOfSight] = None, obstacle_radius: float = 0.0):
+        self.cell_size = cell_size
+        self.chunk_size = chunk_size  # 환자 거리 계산 시 한 번에 만들 최대 원소 수
+        self.obstacle_index: Optional[UniformGridIndex] = None
+        self.line_of_sight = line_of_sight
+        self.obstacle_radius = obstacle_radius
+    
+    def set_obstacles(self, positions: np.ndarray):
+        """장애물 위치가 바뀌었을 때 공간 인덱스를 다시 생성"""
+        self.obstacle_index = UniformGridIndex(positions, self.cell_size)
+    
+    def query(self, positions: np.ndarray, view_ranges: np.ndarray,
+              patients: np.ndarray, can_fly: Optional[np.ndarray] = None) -> VisibilityResult:
+        """can_fly 는 가림 판정의 층 선택용 (line_of_sight 가 없으면 쓰지 않음, 없으면 모두 지상)"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        view_ranges = np.asarray(view_ranges, dtype=np.float64)
+        patient_offsets, patient_indices = self._query_patients(positions, view_ranges, patients)
+        if self.obstacle_index is None:
+            obstacle_offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+            obstacle_indices = np.zeros(0, dtype=np.int64)
+        else:
+            obstacle_offsets, obstacle_indices = self.obstacle_index.query_radius_batch(
+                positions, view_ranges)
+        if self.line_of_sight is not None:
+            if can_fly is None:
+                can_fly = np.zeros(len(positions), dtype=bool)
+            patient_offsets, patient_indices = self.line_of_sight.filter(
+                'patients', patient_offsets, patient_indices, positions, can_fly, patients)
+            if self.obstacle_index is not None:
+                obstacle_offsets, obstacle_indices = self.line_of_sight.filter(
+                    'obstacles', obstacle_offsets, obstacle_indices, positions, can_fly,
+                    self.obstacle_index.points, self.obstacle_radius)
+        return VisibilityResult(patient_offsets, patient_indices, obstacle_offsets, obstacle_indices)
+    
+    def _query_patients(self, positions: np.ndarray, view_ranges: np.ndarray,
+                        patients: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        patients = np.asarray(patients, dtype=np.float64).reshape(-1, 2)
+        num_agents = len(positions)
+        rows, cols = [], []
+        step = max(1, self.chunk_size // max(len(patients), 1))
+        for start in range(0, num_agents, step):
+            block = slice(start, start + step)
+            dx = patients[None, :, 0] - positions[block, 0, None]
+            dy = patients[None, :, 1] - positions[block, 1, None]
+            visible = np.sqrt(dx**2 + dy**2) <= view_ranges[block, None]
+            block_rows, block_cols = np.nonzero(visible)
+            rows.append(block_rows + start)
+            cols.append(block_cols)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(num_agents + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_agents), out=offsets[1:])
+        return offsets, cols.astype(np.int64)
@@ -1,17 +1,18 @@
-import pygame
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 from ..base.base_environment import BaseEnvironment
 from .constants import Colors, WarehouseConfig
+from utils.profiling import StepProfiler
 
 class WarehouseEnv(BaseEnvironment):
     def __init__(self, width: int = WarehouseConfig.DEFAULT_WIDTH, 
-                 height: int = WarehouseConfig.DEFAULT_HEIGHT):
-        super().__init__()
-        pygame.init()
+                 height: int = WarehouseConfig.DEFAULT_HEIGHT,
+                 render_mode: Optional[str] = None,
+                 render_every: int = 1,
+                 profiler: Optional[StepProfiler] = None):
+        # pygame은 첫 render() 호출 시에만 초기화
+        super().__init__(render_mode, render_every, profiler)
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("Warehouse Management")
         
         # Environment specific state
         self.items = {}  # 창고 내 물품 위치
@@ -26,38 +27,57 @@ class WarehouseEnv(BaseEnvironment):
         return self._get_state()
         
     def step(self, actions: List[Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool, Dict[str, Any]]:
+        profiler = self.profiler
+        profiler.begin_step()
+        try:
+            state, observations, done, info = self._run_step(actions, profiler)
+        except BaseException:
+            profiler.abort_step()
+            raise
+        profile = profiler.end_step()
+        if profile is not None:
+            info['profile'] = profile
+        return state, observations, done, info
+    
+    def _run_step(self, actions: List[Any], profiler: StepProfiler) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool, Dict[str, Any]]:
         # 각 에이전트의 행동 처리
-        for agent, action in zip(self.agents, actions):
-            if action[0] == 'move':
-                dx, dy = action[1]
-                new_x = max(0, min(self.width, agent.pos[0] + dx))
-                new_y = max(0, min(self.height, agent.pos[1] + dy))
-                if self._is_valid_move((new_x, new_y)):
-                    agent.pos = (new_x, new_y)
-            elif action[0] == 'pickup':
-                self._handle_pickup(agent)
-            elif action[0] == 'drop':
-                self._handle_drop(agent)
-            elif action[0] == 'charge':
-                self._handle_charge(agent)
-                
+        with profiler.phase('actions'):
+            for agent, action in zip(self.agents, actions):
+                if action[0] == 'move':
+                    dx, dy = action[1]
+                    new_x = max(0, min(self.width, agent.pos[0] + dx))
+                    new_y = max(0, min(self.height, agent.pos[1] + dy))
+                    if self._is_valid_move((new_x, new_y)):
+                        agent.pos = (new_x, new_y)
+                elif action[0] == 'pickup':
+                    self._handle_pickup(agent)
+                elif action[0] == 'drop':
+                    self._handle_drop(agent)
+                elif action[0] == 'charge':
+                    self._handle_charge(agent)
+        
         self.time += 1
-        observations = [agent.get_observation(self._get_state()) for agent in self.agents]
+        with profiler.phase('observations'):
+            observations = [agent.get_observation(self._get_state()) for agent in self.agents]
         done = False  # 나중에 종료 조건 추가
         
-        return self._get_state(), observations, done, {'time': self.time}
+        info = {'time': self.time}
+        return self._get_state(), observations, done, info
     
     def render(self):
-        """환경을 시각화"""
+        """환경을 시각화 (rgb_array 모드에서는 프레임 배열 반환)"""
+        if not self._ensure_screen(self.width, self.height, "Warehouse Management"):
+            return None
         self.screen.fill(Colors.WHITE)
         self._draw_shelves()
         self._draw_items()
         self._draw_charging_stations()
         self._draw_agents()
-        pygame.display.flip()
+        return self._present()
         
     def _draw_shelves(self):
         """선반 그리기"""
+        import pygame
         for shelf in self.shelves:
             pygame.draw.rect(self.screen, Colors.GRAY,
                            (shelf[0]-WarehouseConfig.SHELF_SIZE//2,
@@ -67,12 +87,14 @@ class WarehouseEnv(BaseEnvironment):
             
     def _draw_items(self):
         """물품 그리기"""
+        import pygame
         for pos, item_info in self.items.items():
             pygame.draw.circle(self.screen, Colors.BLUE, pos, 
                              WarehouseConfig.ITEM_SIZE)
             
     def _draw_charging_stations(self):
         """충전소 그리기"""
+        import pygame
         for station in self.charging_stations:
             pygame.draw.rect(self.screen, Colors.YELLOW,
                            (station[0]-WarehouseConfig.CHARGING_STATION_SIZE//2,
@@ -82,8 +104,9 @@ class WarehouseEnv(BaseEnvironment):
             
     def _draw_agents(self):
         """에이전트 그리기"""
-        for agent in self.agents:
-            pygame.draw.circle(self.screen, Colors.BLACK, agent.pos, 10)
+        import pygame
+        for pos in self.registry.positions[:self.registry.count].tolist():
+            pygame.draw.circle(self.screen, Colors.BLACK, pos, 10)
             
     def _is_valid_move(self, pos: Tuple[int, int]) -> bool:
         """이동 가능 여부 확인"""
@@ -106,7 +129,7 @@ class WarehouseEnv(BaseEnvironment):
             'items': self.items,
             'shelves': self.shelves,
             'charging_stations': self.charging_stations,
-            'agents': [(agent.pos, type(agent).__name__) for agent in self.agents]
+            'agents': list(zip(self.registry.position_tuples(), self.registry.type_names))
         }
     
     def get_observation_space(self) -> Dict[str, Any]:
@@ -1,31 +1,26 @@
-import pygame
-from environments.rescue.rescue_env import RescueEnv
-from agents.types.drone import DroneAgent
-from agents.types.wheeled import WheeledAgent
+import argparse
+from pathlib import Path
+from utils.scenario import ScenarioBuilder
+from agents.base.base_policy import select_actions_by_policy
 
-def setup_agents(env):
-    """에이전트 설정"""
-    env.add_agent(DroneAgent((100, 100), 0))
-    env.add_agent(DroneAgent((100, 130), 1))
-    env.add_agent(WheeledAgent((100, 160), 2))
+DEFAULT_CONFIG = Path(__file__).resolve().parent.parent / 'configs' / 'rescue_mission.yaml'
 
 def main():
-    # 환경 생성 및 설정
-    env = RescueEnv()
-    env.setup_default_environment()
-    setup_agents(env)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--config', default=str(DEFAULT_CONFIG), help="시나리오 YAML 경로")
+    args = parser.parse_args()
+    
+    # 시나리오 파일로 환경/에이전트/정책 생성 (월드는 처음 한 번만 컴파일하고 이후에는 캐시를 불러옴)
+    env = ScenarioBuilder(args.config).build(render_mode='human')
     
     # 초기 상태
-    state = env.reset()
-    running = True
+    observations = env.observe()
     
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        
-        # 각 에이전트의 행동 (지금은 정지 상태)
-        actions = [(0, 0) for _ in env.agents]
+    # 창 이벤트 처리 (첫 호출에서 창을 만들고, 창을 닫으면 종료)
+    while env.pump_events():
+        # 같은 정책을 쓰는 에이전트끼리 한 번에 행동 결정 (정책이 없으면 정지, 보낼 메시지 없음)
+        movements = select_actions_by_policy(env.agents, observations)
+        actions = [(tuple(movement), None) for movement in movements.tolist()]
         
         # 환경 진행
         state, observations, done, info = env.step(actions)
@@ -34,7 +29,7 @@ def main():
         if done:
             break
     
-    pygame.quit()
+    env.close()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,154 @@
+from typing import Dict, Any, Tuple, Optional, Sequence, Union
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from agents.base.base_policy import BasePolicy
+from environments.base.agent_registry import AGENT_TYPE_CODES, UNKNOWN_AGENT_TYPE
+from policies.gnn.graph_builder import AgentGraph, GraphBuilder, NUM_NODE_TYPES, EDGE_FEATURE_DIM
+
+class MessagePassingLayer(nn.Module):
+    """간선 목록 위의 메시지 전달 한 단계 (index_add_ 로 받는 노드별 평균)
+    
+    메시지는 relu(W_src h[source] + 간선 임베딩) 이고, 노드 상태는
+    h + relu(W [h, 평균 메시지]) 로 갱신한다. W_src h 는 간선마다가 아니라 노드마다
+    한 번만 계산한 뒤 source 로 모으고, 간선 단위 연산은 제자리(in-place)로 수행한다.
+    """
+    
+    def __init__(self, hidden_dim: int):
+        super().__init__()
+        self.source = nn.Linear(hidden_dim, hidden_dim)
+        self.combine = nn.Linear(2 * hidden_dim, hidden_dim)
+    
+    def forward(self, h: torch.Tensor, source: torch.Tensor, target: torch.Tensor,
+                edge_embedding: torch.Tensor, inv_degree: torch.Tensor) -> torch.Tensor:
+        messages = self.source(h).index_select(0, source).add_(edge_embedding).relu_()
+        aggregated = torch.zeros_like(h).index_add_(0, target, messages).mul_(inv_degree)
+        return h + F.relu(self.combine(torch.cat([h, aggregated], dim=-1)))
+
+class GraphNetwork(nn.Module):
+    """AgentGraph 전체에 대해 한 번의 forward 로 에이전트별 행동 평균과 가치를 계산"""
+    
+    def __init__(self, node_feature_dim: int = 0, hidden_dim: int = 64, num_layers: int = 2,
+                 action_dim: int = 2, position_scale: float = 100.0):
+        super().__init__()
+        self.node_feature_dim = node_feature_dim
+        self.position_scale = position_scale  # 간선의 상대 위치/거리 정규화 값
+        self.node_type = nn.Embedding(NUM_NODE_TYPES, hidden_dim)
+        self.node_features = nn.Linear(node_feature_dim, hidden_dim) if node_feature_dim else None
+        # 간선 임베딩 (상대 위치/거리 + 종류 쌍)은 모든 층이 공유
+        self.edge = nn.Linear(EDGE_FEATURE_DIM, hidden_dim, bias=False)
+        self.edge_type = nn.Embedding(NUM_NODE_TYPES * NUM_NODE_TYPES, hidden_dim)
+        self.layers = nn.ModuleList([MessagePassingLayer(hidden_dim) for _ in range(num_layers)])
+        self.actor = nn.Linear(hidden_dim, action_dim)
+        self.critic = nn.Linear(hidden_dim, 1)
+    
+    def forward(self, graph: AgentGraph,
+                node_features: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor]:
+        """반환값은 (행동 평균 [에이전트 수, action_dim], 가치 [에이전트 수]) (에이전트 노드 순서)"""
+        h = self.node_type(graph.node_type)
+        if self.node_features is not None:
+            # node_features 는 에이전트 노드의 특징 [에이전트 수, node_feature_dim]
+            h = h.index_add(0, torch.nonzero(graph.agent_mask).squeeze(1), self.node_features(node_features))
+        source, target = graph.edge_index[0], graph.edge_index[1]
+        edge_embedding = self.edge(graph.edge_attr / self.position_scale) + self.edge_type(graph.edge_type)
+        degree = torch.bincount(target, minlength=h.shape[0]).clamp_(min=1)
+        inv_degree = degree.reciprocal().to(h.dtype).unsqueeze(1)
+        for layer in self.layers:
+            h = layer(h, source, target, edge_embedding, inv_degree)
+        h = h[graph.agent_mask]
+        return self.actor(h), self.critic(h).squeeze(-1)
+
+class GNNPolicy(BasePolicy):
+    """에이전트/환경 객체 그래프 위의 메시지 전달 정책
+    
+    여러 환경을 batch_graphs 로 합친 그래프도 한 번의 forward 로 처리한다.
+    행동은 에이전트별 대각 가우시안(평균은 네트워크 출력, 표준편차는 학습 파라미터)이며,
+    select_action 은 PPOPolicy 와 같이 tanh(평균) * 2 를 정수 이동량으로 바꾼다.
+    """
+    
+    def __init__(self, node_feature_dim: int = 0, hidden_dim: int = 64, num_layers: int = 2,
+                 action_dim: int = 2, radius: float = 150.0, k: Optional[int] = None,
+                 lr: float = 3e-4, clip_ratio: float = 0.2, update_epochs: int = 4,
+                 value_coef: float = 0.5, entropy_coef: float = 0.0, device: str = 'cpu'):
+        super().__init__()
+        self.action_dim = action_dim
+        self.device = torch.device(device)
+        self.network = GraphNetwork(node_feature_dim, hidden_dim, num_layers, action_dim, radius).to(self.device)
+        self.log_std = nn.Parameter(torch.zeros(action_dim, device=self.device))
+        self.optimizer = torch.optim.Adam(list(self.network.parameters()) + [self.log_std], lr=lr)
+        self.clip_ratio = clip_ratio
+        self.update_epochs = update_epochs
+        self.value_coef = value_coef
+        self.entropy_coef = entropy_coef
+        self.graph_builder = GraphBuilder(radius, k=k)
+    
+    def select_action(self, state: Dict[str, Any]) -> Tuple[int, int]:
+        """환경 상태(state['agents'] 의 (위치, 종류 이름) 목록)에서 state['agent_row'] 번째 에이전트의 행동"""
+        positions = np.array([pos for pos, _ in state['agents']], dtype=np.float64).reshape(-1, 2)
+        type_codes = np.array([AGENT_TYPE_CODES.get(name, UNKNOWN_AGENT_TYPE) for _, name in state['agents']], dtype=np.int64)
+        actions = self.select_actions(self.graph_builder.build(positions, type_codes))
+        dx, dy = actions[state.get('agent_row', 0)].tolist()
+        return dx, dy
+    
+    def select_actions(self, graph: Union[AgentGraph, Sequence[Dict[str, Any]]],
+                       node_features: Optional[torch.Tensor] = None) -> np.ndarray:
+        """그래프의 모든 에이전트 행동을 한 번에 결정 (정수 이동량 [에이전트 수, action_dim])
+        
+        상태 목록을 주면 BasePolicy 와 같이 상태마다 select_action 을 호출한다.
+        """
+        if not isinstance(graph, AgentGraph):
+            return super().select_actions(graph)
+        with torch.inference_mode():
+            mean, _ = self.network(self._to_device(graph), node_features)
+            return (torch.tanh(mean) * 2).to(torch.int64).cpu().numpy()
+    
+    def act(self, graph: AgentGraph,
+            node_features: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """학습용 확률적 행동 (행동, 로그 확률, 가치)"""
+        with torch.no_grad():
+            mean, value = self.network(self._to_device(graph), node_features)
+            dist = torch.distributions.Normal(mean, self.log_std.exp())
+            action = dist.sample()
+            return action, dist.log_prob(action).sum(-1), value
+    
+    def evaluate(self, graph: AgentGraph, actions: torch.Tensor,
+                 node_features: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """주어진 행동의 (로그 확률, 가치, 엔트로피)"""
+        mean, value = self.network(self._to_device(graph), node_features)
+        dist = torch.distributions.Normal(mean, self.log_std.exp())
+        return dist.log_prob(actions).sum(-1), value, dist.entropy().sum(-1)
+    
+    def update(self, experience: Dict[str, Any]):
+        """PPO clipped objective 로 업데이트
+        
+        experience: graph, actions, log_probs, returns, advantages (에이전트 노드 순서),
+        선택적으로 node_features. 반환값은 마지막 epoch 의 손실 값들이며, graph 가 없으면 빈 dict 이다.
+        """
+        if experience.get('graph') is None:
+            return {}
+        graph = self._to_device(experience['graph'])
+        node_features = experience.get('node_features')
+        actions = torch.as_tensor(experience['actions'], dtype=torch.float32, device=self.device)
+        old_log_probs = torch.as_tensor(experience['log_probs'], dtype=torch.float32, device=self.device)
+        returns = torch.as_tensor(experience['returns'], dtype=torch.float32, device=self.device)
+        advantages = torch.as_tensor(experience['advantages'], dtype=torch.float32, device=self.device)
+        advantages = (advantages - advantages.mean()) / (advantages.std(unbiased=False) + 1e-8)
+        
+        for _ in range(self.update_epochs):
+            log_probs, values, entropy = self.evaluate(graph, actions, node_features)
+            ratio = torch.exp(log_probs - old_log_probs)
+            clipped = torch.clamp(ratio, 1 - self.clip_ratio, 1 + self.clip_ratio)
+            policy_loss = -torch.min(ratio * advantages, clipped * advantages).mean()
+            value_loss = F.mse_loss(values, returns)
+            loss = policy_loss + self.value_coef * value_loss - self.entropy_coef * entropy.mean()
+            self.optimizer.zero_grad()
+            loss.backward()
+            self.optimizer.step()
+        return {'policy_loss': policy_loss.item(), 'value_loss': value_loss.item(),
+                'entropy': entropy.mean().item()}
+    
+    def _to_device(self, graph: AgentGraph) -> AgentGraph:
+        if isinstance(graph.edge_index, np.ndarray):
+            return graph.to_torch(self.device)
+        return graph
@@ -0,0 +1,244 @@
+from typing import List, Optional, Dict, Any, Tuple
+import numpy as np
+from environments.base.agent_registry import AGENT_TYPE_CODES, UNKNOWN_AGENT_TYPE
+from environments.rescue.spatial_index import UniformGridIndex
+from environments.rescue.constants import ObstacleType
+
+# 노드 종류: 에이전트 종류 코드 다음에 환경 객체 종류가 이어지고,
+# 마지막은 종류를 모르는 에이전트(UNKNOWN_AGENT_TYPE)용
+PATIENT_NODE = len(AGENT_TYPE_CODES)
+OBSTACLE_NODE = PATIENT_NODE + 1
+AERIAL_OBSTACLE_NODE = PATIENT_NODE + 2
+UNKNOWN_NODE = PATIENT_NODE + 3
+NUM_NODE_TYPES = PATIENT_NODE + 4
+EDGE_FEATURE_DIM = 3  # (dx, dy, distance)
+
+class AgentGraph:
+    """에이전트 상호작용 그래프 (COO 희소 형식)
+    
+    edge_index[0] 은 메시지를 보내는 노드(source), edge_index[1] 은 받는 노드(target)이다.
+    edge_attr 는 (source 위치 - target 위치, 거리), edge_type 은
+    source 종류 * NUM_NODE_TYPES + target 종류이다 (음수 종류 코드는 UNKNOWN_NODE 로 바뀌므로
+    항상 임베딩 인덱스 범위 안). 노드 0..num_agents-1 은 에이전트,
+    그 뒤는 에이전트와 연결된 환경 객체(entity_index 는 원래 객체 인덱스)이다.
+    여러 그래프를 batch_graphs 로 합치면 batch 가 각 노드의 그래프 번호가 된다.
+    """
+    
+    def __init__(self, edge_index, edge_attr, edge_type, node_type, positions, batch,
+                 agent_mask, entity_index, num_graphs: int = 1):
+        self.edge_index = edge_index
+        self.edge_attr = edge_attr
+        self.edge_type = edge_type
+        self.node_type = node_type
+        self.positions = positions
+        self.batch = batch
+        self.agent_mask = agent_mask
+        self.entity_index = entity_index
+        self.num_graphs = num_graphs
+    
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_type)
+    
+    @property
+    def num_edges(self) -> int:
+        return self.edge_index.shape[1]
+    
+    def to_torch(self, device: Optional[str] = None) -> 'AgentGraph':
+        """같은 구조의 torch 텐서 그래프로 변환 (가능하면 메모리 공유)"""
+        import torch
+        return AgentGraph(
+            edge_index=torch.from_numpy(self.edge_index).to(device),
+            edge_attr=torch.from_numpy(self.edge_attr).to(device),
+            edge_type=torch.from_numpy(self.edge_type).to(device),
+            node_type=torch.from_numpy(self.node_type).to(device),
+            positions=torch.from_numpy(self.positions.astype(np.float32)).to(device),
+            batch=torch.from_numpy(self.batch).to(device),
+            agent_mask=torch.from_numpy(self.agent_mask).to(device),
+            entity_index=torch.from_numpy(self.entity_index).to(device),
+            num_graphs=self.num_graphs,
+        )
+
+def batch_graphs(graphs: List[AgentGraph]) -> AgentGraph:
+    """여러 그래프를 노드 인덱스를 이동시켜 하나의 disjoint union 그래프로 합침"""
+    node_offsets = np.cumsum([0] + [graph.num_nodes for graph in graphs[:-1]])
+    return AgentGraph(
+        edge_index=np.concatenate([graph.edge_index + offset
+                                   for graph, offset in zip(graphs, node_offsets)], axis=1),
+        edge_attr=np.concatenate([graph.edge_attr for graph in graphs]),
+        edge_type=np.concatenate([graph.edge_type for graph in graphs]),
+        node_type=np.concatenate([graph.node_type for graph in graphs]),
+        positions=np.concatenate([graph.positions for graph in graphs]),
+        batch=np.concatenate([np.full(graph.num_nodes, i, dtype=np.int64)
+                              for i, graph in enumerate(graphs)]),
+        agent_mask=np.concatenate([graph.agent_mask for graph in graphs]),
+        entity_index=np.concatenate([graph.entity_index for graph in graphs]),
+        num_graphs=len(graphs),
+    )
+
+class GraphBuilder:
+    """한 환경의 에이전트 radius/kNN 그래프를 매 스텝 점진적으로 갱신
+    
+    후보 쌍은 radius + skin 이내의 쌍(Verlet 이웃 목록)으로 만들어 두고 매 스텝 현재 거리로
+    거르기만 한다. 기준 위치에서 skin/2 넘게 움직인 에이전트가 생기면 그 에이전트의 쌍만 다시 계산한다.
+    k 를 주면 각 에이전트가 radius 안에서 가장 가까운 k개 이웃에게서만 메시지를 받는다.
+    set_entities 로 환자/장애물을 주면 entity_radius 안의 객체에서 에이전트로 가는 간선도 만든다.
+    """
+    
+    def __init__(self, radius: float, k: Optional[int] = None, skin: Optional[float] = None,
+                 entity_radius: Optional[float] = None, rebuild_fraction: float = 0.25):
+        self.radius = radius
+        self.k = k
+        self.skin = skin if skin is not None else 0.2 * radius
+        self.entity_radius = entity_radius
+        # 움직인 에이전트 비율이 이보다 크면 부분 갱신 대신 전체를 다시 생성
+        self.rebuild_fraction = rebuild_fraction
+        self.stats: Dict[str, int] = {'rebuilds': 0, 'partial_updates': 0, 'reuses': 0}
+        self._reference_positions: Optional[np.ndarray] = None
+        self._candidates = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        self._entity_index: Optional[UniformGridIndex] = None
+        self._entity_types = np.zeros(0, dtype=np.int64)
+    
+    def set_entities(self, positions: np.ndarray, node_types: np.ndarray):
+        """에이전트와 연결할 환경 객체 설정 (정적이므로 공간 인덱스를 한 번만 생성)"""
+        self._entity_index = UniformGridIndex(positions, self.entity_radius or self.radius)
+        self._entity_types = np.asarray(node_types, dtype=np.int64)
+    
+    def reset(self):
+        """다음 build 에서 후보 쌍을 새로 생성"""
+        self._reference_positions = None
+    
+    def build(self, positions: np.ndarray, type_codes: np.ndarray) -> AgentGraph:
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        type_codes = np.asarray(type_codes, dtype=np.int64)
+        if (type_codes < 0).any():
+            type_codes = np.where(type_codes == UNKNOWN_AGENT_TYPE, UNKNOWN_NODE, type_codes)
+        if len(type_codes) and (type_codes.min() < 0 or type_codes.max() >= NUM_NODE_TYPES):
+            raise ValueError(f"agent type codes must be in [0, {NUM_NODE_TYPES}) or UNKNOWN_AGENT_TYPE")
+        num_agents = len(positions)
+        
+        self._update_candidates(positions)
+        source, target = self._candidates
+        delta = positions[source] - positions[target]
+        distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+        keep = distance <= self.radius
+        source, target, delta, distance = source[keep], target[keep], delta[keep], distance[keep]
+        if self.k is not None:
+            keep = self._nearest_k(target, distance)
+            source, target, delta, distance = source[keep], target[keep], delta[keep], distance[keep]
+        node_type = type_codes
+        
+        node_positions = positions
+        entity_nodes = np.zeros(0, dtype=np.int64)
+        if self._entity_index is not None and len(self._entity_index):
+            offsets, entities = self._entity_index.query_radius_batch(
+                positions, self.entity_radius or self.radius)
+            entity_target = np.repeat(np.arange(num_agents), np.diff(offsets))
+            # 어떤 에이전트와도 연결되지 않은 객체는 노드로 만들지 않음
+            entity_nodes, entity_source = np.unique(entities, return_inverse=True)
+            entity_positions = self._entity_index.points[entity_nodes]
+            entity_delta = entity_positions[entity_source] - positions[entity_target]
+            source = np.concatenate([source, entity_source + num_agents])
+            target = np.concatenate([target, entity_target])
+            delta = np.concatenate([delta, entity_delta])
+            distance = np.concatenate([distance, np.sqrt(entity_delta[:, 0] ** 2 + entity_delta[:, 1] ** 2)])
+            node_type = np.concatenate([type_codes, self._entity_types[entity_nodes]])
+            node_positions = np.concatenate([positions, entity_positions])
+        
+        edge_attr = np.empty((len(source), EDGE_FEATURE_DIM), dtype=np.float32)
+        edge_attr[:, :2] = delta
+        edge_attr[:, 2] = distance
+        num_nodes = len(node_type)
+        agent_mask = np.zeros(num_nodes, dtype=bool)
+        agent_mask[:num_agents] = True
+        return AgentGraph(
+            edge_index=np.stack([source, target]),
+            edge_attr=edge_attr,
+            edge_type=node_type[source] * NUM_NODE_TYPES + node_type[target],
+            node_type=node_type,
+            positions=node_positions,
+            batch=np.zeros(num_nodes, dtype=np.int64),
+            agent_mask=agent_mask,
+            entity_index=entity_nodes,
+        )
+    
+    def _update_candidates(self, positions: np.ndarray):
+        """기준 위치에서 skin/2 넘게 움직인 에이전트의 후보 쌍만 다시 계산
+        
+        모든 후보 쌍은 두 에이전트의 기준 위치 사이 거리가 radius + skin 이하라는 조건을
+        유지한다. 두 에이전트 모두 기준 위치에서 skin/2 이내에 있으면 현재 거리가 radius
+        이하인 쌍은 반드시 후보에 있으므로, 멀리 움직인 에이전트만 갱신하면 된다.
+        """
+        reference = self._reference_positions
+        if reference is None or reference.shape != positions.shape:
+            self._rebuild_candidates(positions)
+            return
+        moved = positions - reference
+        moved = (moved[:, 0] ** 2 + moved[:, 1] ** 2) > (self.skin / 2) ** 2
+        if not moved.any():
+            self.stats['reuses'] += 1
+            return
+        if moved.mean() > self.rebuild_fraction:
+            self._rebuild_candidates(positions)
+            return
+        
+        movers = np.flatnonzero(moved)
+        reference[movers] = positions[movers]
+        index = UniformGridIndex(reference, self.radius + self.skin)
+        offsets, neighbors = index.query_radius_batch(reference[movers], self.radius + self.skin)
+        mover = np.repeat(movers, np.diff(offsets))
+        not_self = neighbors != mover
+        mover, neighbors = mover[not_self], neighbors[not_self]
+        # 움직인 에이전트가 포함된 기존 쌍을 지우고 양방향 쌍을 새로 추가
+        # (둘 다 움직인 쌍은 양쪽 질의에서 모두 나오므로 한 방향만 추가)
+        source, target = self._candidates
+        keep = ~(moved[source] | moved[target])
+        one_way = ~moved[neighbors]
+        self._candidates = (np.concatenate([source[keep], neighbors, mover[one_way]]),
+                            np.concatenate([target[keep], mover, neighbors[one_way]]))
+        self.stats['partial_updates'] += 1
+    
+    def _rebuild_candidates(self, positions: np.ndarray):
+        index = UniformGridIndex(positions, self.radius + self.skin)
+        offsets, neighbors = index.query_radius_batch(positions, self.radius + self.skin)
+        target = np.repeat(np.arange(len(positions)), np.diff(offsets))
+        not_self = neighbors != target
+        self._candidates = (neighbors[not_self], target[not_self])
+        self._reference_positions = positions.copy()
+        self.stats['rebuilds'] += 1
+    
+    def _nearest_k(self, target: np.ndarray, distance: np.ndarray) -> np.ndarray:
+        """받는 노드별로 가장 가까운 k개 간선만 남기는 마스크"""
+        order = np.lexsort((distance, target))
+        sorted_target = target[order]
+        group_start = np.searchsorted(sorted_target, sorted_target, side='left')
+        rank = np.arange(len(order)) - group_start
+        keep = np.zeros(len(order), dtype=bool)
+        keep[order[rank < self.k]] = True
+        return keep
+
+def entities_from_state(state: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """환경 상태의 환자/장애물을 GraphBuilder.set_entities 인자 (위치, 노드 종류)로 변환"""
+    patients = np.asarray(state['patients'], dtype=np.float64).reshape(-1, 2)
+    obstacles = np.asarray([pos for pos, _ in state['obstacles']], dtype=np.float64).reshape(-1, 2)
+    obstacle_types = [AERIAL_OBSTACLE_NODE if obs_type == ObstacleType.AERIAL.value else OBSTACLE_NODE
+                      for _, obs_type in state['obstacles']]
+    node_types = np.concatenate([np.full(len(patients), PATIENT_NODE, dtype=np.int64),
+                                 np.asarray(obstacle_types, dtype=np.int64)])
+    return np.concatenate([patients, obstacles]), node_types
+
+class BatchedGraphBuilder:
+    """벡터화 환경 전체의 그래프를 환경별 GraphBuilder 로 만들어 하나로 합침"""
+    
+    def __init__(self, num_envs: int, **builder_kwargs: Any):
+        self.builders = [GraphBuilder(**builder_kwargs) for _ in range(num_envs)]
+    
+    def set_entities(self, env_index: int, positions: np.ndarray, node_types: np.ndarray):
+        self.builders[env_index].set_entities(positions, node_types)
+    
+    def build(self, positions: np.ndarray, type_codes: np.ndarray) -> AgentGraph:
+        """positions [N, A, 2], type_codes [N, A] (또는 모든 환경 공통 [A])"""
+        positions = np.asarray(positions)
+        type_codes = np.broadcast_to(np.asarray(type_codes), positions.shape[:2])
+        return batch_graphs([builder.build(env_positions, env_types) for builder, env_positions, env_types
+                             in zip(self.builders, positions, type_codes)])
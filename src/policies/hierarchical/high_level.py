@@ -1,14 +1,17 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Sequence
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from ...agents.base.base_policy import BasePolicy
+from agents.base.base_policy import BasePolicy
+from environments.rescue.observation_encoder import FeatureBatch
 
 class HighLevelPolicy(BasePolicy):
     def __init__(self, state_dim: int, action_dim: int):
         super().__init__()
         self.state_dim = state_dim
         self.action_dim = action_dim
+        self._features = FeatureBatch(state_dim)
         
         # 신경망 구조
         self.network = nn.Sequential(
@@ -31,15 +34,40 @@ class HighLevelPolicy(BasePolicy):
         # 행동을 (dx, dy) 형태로 변환
         dx, dy = self._convert_to_movement(action)
         return dx, dy
+    
+    def select_actions(self, states: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """모든 에이전트의 상태를 한 배치로 쌓아 한 번의 forward 로 행동 결정 [에이전트 수, 2]"""
+        state_tensor = self._preprocess_states(states)
+        
+        with torch.inference_mode():
+            action_logits = self.network(state_tensor)
+            action = F.softmax(action_logits, dim=-1)
+            
+        return self._convert_to_movements(action)
+        
+    def select_subgoals(self, states: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """에이전트별 서브골 방향 [배치, 2] (각 성분 [-1, 1], SubgoalScheduler 가 목표 지점으로 바꿈)"""
+        if self.action_dim < 2:
+            raise ValueError("select_subgoals needs action_dim >= 2")
+        state_tensor = self._preprocess_states(states)
+        
+        with torch.inference_mode():
+            directions = torch.tanh(self.network(state_tensor)[:, :2])
+            
+        return directions.numpy().astype(np.float64)
         
     def update(self, experience: Dict[str, Any]):
         # PPO 업데이트 로직 구현
         pass
         
     def _preprocess_state(self, state: Dict[str, Any]) -> torch.Tensor:
-        # 상태를 신경망 입력으로 변환
-        # 임시로 랜덤 텐서 반환
-        return torch.randn(self.state_dim)
+        # 관찰의 'features' (ObservationEncoder 결과)를 신경망 입력으로 사용
+        return self._features([state])[0]
+    
+    def _preprocess_states(self, states: Sequence[Dict[str, Any]]) -> torch.Tensor:
+        # 여러 관찰의 'features' 를 재사용 버퍼에 모아 [배치, state_dim] 텐서로 변환
+        # (특징 배열 [배치, state_dim] 을 직접 주면 복사 없이 사용)
+        return self._features(states)
         
     def _convert_to_movement(self, action_probs: torch.Tensor) -> Tuple[int, int]:
         # 행동을 실제 이동으로 변환
@@ -47,4 +75,9 @@ class HighLevelPolicy(BasePolicy):
         return (
             int(torch.randint(-2, 3, (1,)).item()),
             int(torch.randint(-2, 3, (1,)).item())
-        ) 
\ No newline at end of file
+        ) 
+    
+    def _convert_to_movements(self, action_probs: torch.Tensor) -> np.ndarray:
+        # 배치 행동을 실제 이동 [배치, 2] 로 변환
+        # 임시로 랜덤 이동 반환
+        return torch.randint(-2, 3, (action_probs.shape[0], 2)).numpy()
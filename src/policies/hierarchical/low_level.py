@@ -0,0 +1,28 @@
+from typing import Dict, Any, Tuple, Sequence
+import numpy as np
+from agents.base.base_policy import BasePolicy
+
+class NavigationPolicy(BasePolicy):
+    """환경의 흐름장 (RescueEnv(navigation=True)) 이 관찰에 넣은 'navigation_move' 를 그대로 따르는 하위 정책
+    
+    이동량은 환경이 모든 에이전트에 대해 한 번에 조회해 두므로 에이전트별 경로 탐색이 없다.
+    'navigation_move' 가 없는 관찰은 (0, 0) 이다.
+    """
+    
+    def select_action(self, state: Dict[str, Any]) -> Tuple[int, int]:
+        move = state.get('navigation_move')
+        if move is None:
+            return 0, 0
+        return int(move[0]), int(move[1])
+    
+    def select_actions(self, states: Sequence[Dict[str, Any]]) -> np.ndarray:
+        actions = np.zeros((len(states), 2), dtype=np.int64)
+        for i, state in enumerate(states):
+            move = state.get('navigation_move')
+            if move is not None:
+                actions[i] = move
+        return actions
+    
+    def update(self, experience: Dict[str, Any]):
+        # 학습하지 않는 정책
+        pass
@@ -0,0 +1,171 @@
+from typing import Callable, Dict, Any, Optional, Sequence, Tuple, Union
+import numpy as np
+
+class SubgoalScheduler:
+    """HighLevelPolicy 의 서브골을 에이전트별로 캐시하고 필요한 에이전트만 다시 계획하는 스케줄러
+    
+    상위 정책의 select_subgoals 출력은 방향으로 쓰며, 서브골은 현재 위치에서 그 방향으로
+    goal_distance 떨어진 지점(맵 안으로 자름)이다. 서브골은 다음 사건이 생길 때까지 유지된다.
+    - interval: replan_every 스텝마다 (모든 에이전트가 같은 스텝에 다시 계획하므로 forward 한 번)
+    - reached: 서브골까지 거리가 reach_radius 이하
+    - message: 무시할 종류(ignore_message_types, 기본은 Observer 의 매 스텝 'observation' 방송)가
+      아닌 새 메시지를 받음
+    - blocked: 지난 스텝에 움직이려 했는데 위치가 그대로 (장애물/경계에 막힘)
+    사건(interval 제외)은 마지막 계획 후 event_cooldown 스텝이 지나야 반영되므로, 막힌 채 같은 서브골을
+    계속 받는 에이전트도 재계획 비율이 1 / event_cooldown 을 넘지 않는다.
+    다시 계획할 에이전트만 모아 상위 정책 forward 를 스텝당 최대 한 번 부른다. 매 스텝의 (dx, dy) 는
+    하위 제어기가 정한다: 서브골 쪽으로 축마다 최대 speed 만큼 움직이는 정수 이동량이며, act() 에서는
+    그 칸이 막혀 있으면 한 축만 움직이는 이동을 대신 시도한다 (신경망 호출 없음).
+    """
+    
+    REASONS = ('initial', 'interval', 'reached', 'message', 'blocked')
+    
+    def __init__(self, high_level, replan_every: int = 10, goal_distance: float = 100.0,
+                 reach_radius: float = 1.0, event_cooldown: int = 3, world_size: Optional[Tuple[float, float]] = None,
+                 ignore_message_types: Sequence[str] = ('observation',)):
+        if replan_every < 1:
+            raise ValueError("replan_every must be at least 1")
+        self.high_level = high_level
+        self.replan_every = replan_every
+        self.goal_distance = goal_distance
+        self.reach_radius = reach_radius
+        self.event_cooldown = event_cooldown
+        self.world_size = world_size  # 주면 목표를 맵 안으로 자름
+        self.ignore_message_types = frozenset(ignore_message_types)
+        
+        self.subgoals = np.zeros((0, 2), dtype=np.float64)
+        self._since_plan = np.zeros(0, dtype=np.int64)  # 마지막 계획 후 지난 스텝 수
+        self._last_positions = np.zeros((0, 2), dtype=np.float64)
+        self._last_actions = np.zeros((0, 2), dtype=np.int64)
+        self.reset_counters()
+    
+    def reset(self):
+        """에피소드 시작: 모든 에이전트가 다음 호출에서 새로 계획"""
+        self.subgoals = np.zeros((0, 2), dtype=np.float64)
+    
+    def reset_counters(self):
+        self.steps = 0  # select_actions 호출 수
+        self.agent_steps = 0
+        self.high_level_calls = 0  # 상위 정책 forward 수
+        self.replans = 0  # 다시 계획한 에이전트 수 (합계)
+        self.replan_reasons: Dict[str, int] = {reason: 0 for reason in self.REASONS}
+    
+    def stats(self) -> Dict[str, Any]:
+        """재계획 빈도 카운터"""
+        return {
+            'steps': self.steps,
+            'high_level_calls': self.high_level_calls,
+            'replans': self.replans,
+            'replan_rate': self.replans / self.agent_steps if self.agent_steps else 0.0,
+            'reasons': dict(self.replan_reasons),
+        }
+    
+    def act(self, env, observations: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """RescueEnv 의 에이전트 배열과 받은 메시지로 이번 스텝 이동량 [에이전트 수, 2] 결정"""
+        count = env.registry.count
+        has_new_message = self._has_new_message
+        new_messages = np.array([has_new_message(agent.received_messages) for agent in env.agents], dtype=bool)
+        if self.world_size is None:
+            self.world_size = (env.width, env.height)
+        can_fly = env.registry.can_fly[:count]
+        size = np.array([env.width, env.height])
+        
+        def passable(rows: np.ndarray, targets: np.ndarray) -> np.ndarray:
+            # 환경과 같이 맵 경계로 자른 칸의 통과 가능 여부
+            cells = np.clip(targets, 0, size).astype(np.int64)
+            return env.occupancy.passable_mask(cells[:, 0], cells[:, 1], can_fly[rows])
+        
+        # 관찰의 'features' 는 인코더 버퍼의 행이므로 버퍼를 그대로 넘겨 재계획 행만 골라 씀
+        features = env.observation_encoder.buffer[:count] if observations else observations
+        return self.select_actions(env.registry.positions[:count], env.registry.speeds[:count],
+                                   features, new_messages, passable)
+    
+    def select_actions(self, positions: np.ndarray, speeds: np.ndarray,
+                       observations: Union[Sequence[Dict[str, Any]], np.ndarray],
+                       new_messages: Optional[np.ndarray] = None,
+                       passable: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        """positions [A, 2], speeds [A] 에 대한 정수 이동량 [A, 2]
+        
+        observations 는 관찰 목록 또는 특징 배열 [A, state_dim] 이며 재계획하는 에이전트의 행만 읽는다.
+        
+        passable(rows, targets) 를 주면 하위 제어기가 막힌 칸을 피한다 (targets [N, 2] 는 rows 에이전트의 이동 후 위치).
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        num_agents = len(positions)
+        if len(self.subgoals) != num_agents:
+            self._start(positions)
+            replan = np.ones(num_agents, dtype=bool)
+            self.replan_reasons['initial'] += num_agents
+        else:
+            events = {
+                'interval': np.full(num_agents, self.steps % self.replan_every == 0),
+                'reached': np.hypot(*(self.subgoals - positions).T) <= self.reach_radius,
+                'message': (np.zeros(num_agents, dtype=bool) if new_messages is None
+                            else np.asarray(new_messages, dtype=bool)),
+                'blocked': ((positions == self._last_positions).all(axis=1)
+                            & (self._last_actions != 0).any(axis=1)),
+            }
+            cooled = self._since_plan >= self.event_cooldown
+            replan = np.zeros(num_agents, dtype=bool)
+            for reason, mask in events.items():
+                if reason != 'interval':
+                    mask = mask & cooled
+                self.replan_reasons[reason] += int(np.count_nonzero(mask & ~replan))  # 먼저 잡힌 사유로만 셈
+                replan |= mask
+        
+        rows = np.flatnonzero(replan)
+        if len(rows):
+            if isinstance(observations, np.ndarray):
+                states = observations[rows]
+            else:
+                states = [observations[i] for i in rows]
+            directions = self.high_level.select_subgoals(states)
+            norms = np.hypot(directions[:, 0], directions[:, 1])[:, None]
+            goals = positions[rows] + directions / np.maximum(norms, 1e-12) * self.goal_distance
+            if self.world_size is not None:
+                np.clip(goals, 0, self.world_size, out=goals)
+            self.subgoals[rows] = goals
+            self._since_plan[rows] = 0
+            self.high_level_calls += 1
+            self.replans += len(rows)
+        
+        actions = self._low_level(positions, np.asarray(speeds, dtype=np.float64), passable)
+        self._since_plan += 1
+        np.copyto(self._last_positions, positions)
+        np.copyto(self._last_actions, actions)
+        self.steps += 1
+        self.agent_steps += num_agents
+        return actions
+    
+    def _start(self, positions: np.ndarray):
+        num_agents = len(positions)
+        self.subgoals = positions.copy()
+        self._since_plan = np.zeros(num_agents, dtype=np.int64)
+        self._last_positions = positions.copy()
+        self._last_actions = np.zeros((num_agents, 2), dtype=np.int64)
+    
+    def _low_level(self, positions: np.ndarray, speeds: np.ndarray,
+                   passable: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]]) -> np.ndarray:
+        """서브골 쪽으로 축마다 최대 speed 만큼 (정수 좌표를 유지하도록 반올림), 막히면 x축만 / y축만 시도"""
+        step = np.floor(np.maximum(speeds, 1.0))[:, None]
+        actions = np.clip(np.rint(self.subgoals - positions), -step, step).astype(np.int64)
+        if passable is None:
+            return actions
+        rows = np.flatnonzero(actions.any(axis=1))
+        rows = rows[~passable(rows, positions[rows] + actions[rows])]
+        for axis in (0, 1):
+            if not len(rows):
+                break
+            # 한 축만 움직이는 대안 (x축 먼저)
+            alternative = actions[rows].copy()
+            alternative[:, 1 - axis] = 0
+            ok = alternative.any(axis=1) & passable(rows, positions[rows] + alternative)
+            actions[rows[ok]] = alternative[ok]
+            rows = rows[~ok]
+        return actions
+    
+    def _has_new_message(self, messages: Sequence[Dict[str, Any]]) -> bool:
+        for message in messages:
+            if not isinstance(message, dict) or message.get('type') not in self.ignore_message_types:
+                return True
+        return False
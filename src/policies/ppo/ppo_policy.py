@@ -1,14 +1,20 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Sequence, Optional
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from ...agents.base.base_policy import BasePolicy
+from agents.base.base_policy import BasePolicy
+from environments.rescue.observation_encoder import FeatureBatch
+from policies.ppo.rollout_buffer import RolloutBuffer
 
 class PPOPolicy(BasePolicy):
-    def __init__(self, state_dim: int, action_dim: int):
+    def __init__(self, state_dim: int, action_dim: int, lr: float = 3e-4, clip_ratio: float = 0.2,
+                 update_epochs: int = 4, batch_size: int = 4096, value_coef: float = 0.5,
+                 entropy_coef: float = 0.0, max_grad_norm: float = 0.5):
         super().__init__()
         self.state_dim = state_dim
         self.action_dim = action_dim
+        self._features = FeatureBatch(state_dim)
         
         # Actor 네트워크
         self.actor = nn.Sequential(
@@ -28,24 +34,95 @@ class PPOPolicy(BasePolicy):
             nn.Linear(32, 1)
         )
         
+        # 학습용 가우시안 행동 분포의 로그 표준편차와 최적화기
+        self.log_std = nn.Parameter(torch.zeros(action_dim))
+        self.trainable_parameters = list(self.actor.parameters()) + list(self.critic.parameters()) + [self.log_std]
+        self.optimizer = torch.optim.Adam(self.trainable_parameters, lr=lr)
+        self.clip_ratio = clip_ratio
+        self.update_epochs = update_epochs
+        self.batch_size = batch_size
+        self.value_coef = value_coef
+        self.entropy_coef = entropy_coef
+        self.max_grad_norm = max_grad_norm
+    
     def select_action(self, state: Dict[str, Any]) -> Tuple[int, int]:
         state_tensor = self._preprocess_state(state)
         
         with torch.no_grad():
             action_mean = self.actor(state_tensor)
             action = torch.tanh(action_mean)  # 행동을 [-1, 1] 범위로 제한
-            
+        
         # 행동을 실제 이동으로 변환
         dx = int(action[0].item() * 2)  # [-2, 2] 범위로 스케일링
         dy = int(action[1].item() * 2)
         
         return dx, dy
+    
+    def select_actions(self, states: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """모든 에이전트의 상태를 한 배치로 쌓아 한 번의 forward 로 행동 결정 [에이전트 수, 2]"""
+        state_tensor = self._preprocess_states(states)
+        
+        with torch.inference_mode():
+            action = torch.tanh(self.actor(state_tensor))
+            # select_action 의 int() 와 같이 0 방향으로 버림
+            return (action * 2).to(torch.int64).numpy()
+    
+    def act(self, states) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """학습용 확률적 행동 (행동 [B, action_dim], 로그 확률 [B], 가치 [B])
         
+        환경 이동량은 select_actions 와 같이 int(tanh(행동) * 2) 로 변환한다.
+        """
+        state_tensor = self._preprocess_states(states)
+        with torch.no_grad():
+            dist = torch.distributions.Normal(self.actor(state_tensor), self.log_std.exp())
+            action = dist.sample()
+            return action, dist.log_prob(action).sum(-1), self.critic(state_tensor).squeeze(-1)
+    
+    def evaluate(self, states: torch.Tensor, actions: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """주어진 행동의 (로그 확률, 가치, 엔트로피)"""
+        dist = torch.distributions.Normal(self.actor(states), self.log_std.exp())
+        return dist.log_prob(actions).sum(-1), self.critic(states).squeeze(-1), dist.entropy().sum(-1)
+    
     def update(self, experience: Dict[str, Any]):
-        # PPO 업데이트 로직 구현
-        pass
+        """PPO clipped objective 로 업데이트
+        
+        experience['buffer'] 는 compute_returns_and_advantages 를 마친 RolloutBuffer 이고,
+        experience['agent_indices'] 를 주면 그 에이전트 열(이 정책을 쓰는 에이전트)의 샘플만 사용한다.
+        반환값은 마지막 미니배치의 손실 값들이며, 'buffer' 가 없거나 비어 있으면 업데이트하지 않고 빈 dict 이다.
+        """
+        buffer: Optional[RolloutBuffer] = experience.get('buffer')
+        if buffer is None or buffer.step == 0:
+            return {}
+        agent_indices: Optional[Sequence[int]] = experience.get('agent_indices')
+        # 이점 정규화 통계는 이 정책이 쓰는 샘플 전체 기준
+        advantages = buffer.advantages[:buffer.step]
+        if agent_indices is not None:
+            advantages = advantages[:, :, torch.as_tensor(agent_indices, dtype=torch.int64)]
+        mean, std = advantages.mean(), advantages.std(unbiased=False) + 1e-8
         
+        stats = {}
+        for _ in range(self.update_epochs):
+            for batch in buffer.minibatches(self.batch_size, agent_indices):
+                log_probs, values, entropy = self.evaluate(batch['observations'], batch['actions'])
+                batch_advantages = (batch['advantages'] - mean) / std
+                ratio = torch.exp(log_probs - batch['log_probs'])
+                clipped = torch.clamp(ratio, 1 - self.clip_ratio, 1 + self.clip_ratio)
+                policy_loss = -torch.min(ratio * batch_advantages, clipped * batch_advantages).mean()
+                value_loss = F.mse_loss(values, batch['returns'])
+                loss = policy_loss + self.value_coef * value_loss - self.entropy_coef * entropy.mean()
+                self.optimizer.zero_grad()
+                loss.backward()
+                nn.utils.clip_grad_norm_(self.trainable_parameters, self.max_grad_norm)
+                self.optimizer.step()
+                stats = {'policy_loss': policy_loss.item(), 'value_loss': value_loss.item(),
+                         'entropy': entropy.mean().item()}
+        return stats
+    
     def _preprocess_state(self, state: Dict[str, Any]) -> torch.Tensor:
-        # 상태를 신경망 입력으로 변환
-        # 임시로 랜덤 텐서 반환
-        return torch.randn(self.state_dim) 
\ No newline at end of file
+        # 관찰의 'features' (ObservationEncoder 결과)를 신경망 입력으로 사용
+        return self._features([state])[0]
+    
+    def _preprocess_states(self, states: Sequence[Dict[str, Any]]) -> torch.Tensor:
+        # 여러 관찰의 'features' 를 재사용 버퍼에 모아 [배치, state_dim] 텐서로 변환
+        # (특징 배열 [배치, state_dim] 을 직접 주면 복사 없이 사용)
+        return self._features(states) 
\ No newline at end of file
@@ -0,0 +1,95 @@
+from typing import Dict, Iterator, Optional, Sequence
+import torch
+
+class RolloutBuffer:
+    """PPO 학습용 고정 크기 롤아웃 저장소 [num_steps, num_envs, num_agents, ...]
+    
+    모든 배열은 생성 시 한 번만 할당하고 add 는 해당 시점 행에 복사만 한다.
+    GAE 는 시간 축만 역순으로 돌면서 (환경, 에이전트) 전체를 한 번에 계산하며,
+    미니배치는 평탄화한 뷰에서 무작위 순열 인덱스로 꺼낸다.
+    에이전트 종류별 정책(드론/바퀴)은 agent_indices 로 자기 에이전트 열만 골라 같은 버퍼를 공유한다.
+    """
+    
+    def __init__(self, num_steps: int, num_envs: int, num_agents: int, obs_dim: int,
+                 action_dim: int = 2, gamma: float = 0.99, gae_lambda: float = 0.95,
+                 device: str = 'cpu'):
+        self.num_steps = num_steps
+        self.num_envs = num_envs
+        self.num_agents = num_agents
+        self.gamma = gamma
+        self.gae_lambda = gae_lambda
+        self.device = torch.device(device)
+        shape = (num_steps, num_envs, num_agents)
+        self.observations = torch.zeros(shape + (obs_dim,), device=self.device)
+        self.actions = torch.zeros(shape + (action_dim,), device=self.device)
+        self.log_probs = torch.zeros(shape, device=self.device)
+        self.values = torch.zeros(shape, device=self.device)
+        self.rewards = torch.zeros(shape, device=self.device)
+        self.dones = torch.zeros((num_steps, num_envs), device=self.device)  # 에피소드 종료는 환경 단위
+        self.advantages = torch.zeros(shape, device=self.device)
+        self.returns = torch.zeros(shape, device=self.device)
+        self.step = 0
+    
+    @property
+    def full(self) -> bool:
+        return self.step == self.num_steps
+    
+    def reset(self):
+        """다음 롤아웃을 처음부터 기록 (배열은 재사용)"""
+        self.step = 0
+    
+    def add(self, observations, actions, log_probs, values, rewards, dones):
+        """한 스텝 기록 (observations [N, A, obs_dim], actions [N, A, action_dim],
+        log_probs/values/rewards [N, A], dones [N] — dones 는 이 스텝 이후 에피소드가 끝났는지)"""
+        if self.full:
+            raise IndexError("RolloutBuffer is full; call reset() after the update")
+        t = self.step
+        self.observations[t].copy_(torch.as_tensor(observations))
+        self.actions[t].copy_(torch.as_tensor(actions))
+        self.log_probs[t].copy_(torch.as_tensor(log_probs))
+        self.values[t].copy_(torch.as_tensor(values))
+        self.rewards[t].copy_(torch.as_tensor(rewards))
+        self.dones[t].copy_(torch.as_tensor(dones))
+        self.step += 1
+    
+    def compute_returns_and_advantages(self, last_values):
+        """GAE(lambda) 이점과 반환값 계산 (last_values [N, A] 는 마지막 다음 상태의 가치)
+        
+        dones[t] 가 참인 환경은 t 다음 상태로 부트스트랩하지 않는다.
+        """
+        last_values = torch.as_tensor(last_values, dtype=torch.float32, device=self.device)
+        # 종료 마스크 [T, N, 1] 을 에이전트 축으로 브로드캐스트
+        not_done = (1.0 - self.dones[:self.step]).unsqueeze(-1)
+        next_values = torch.cat([self.values[1:self.step], last_values.unsqueeze(0)])
+        deltas = self.rewards[:self.step] + self.gamma * next_values * not_done - self.values[:self.step]
+        discounts = self.gamma * self.gae_lambda * not_done
+        advantage = torch.zeros_like(last_values)
+        for t in reversed(range(self.step)):
+            advantage = deltas[t] + discounts[t] * advantage
+            self.advantages[t] = advantage
+        torch.add(self.advantages[:self.step], self.values[:self.step], out=self.returns[:self.step])
+    
+    def minibatches(self, batch_size: int, agent_indices: Optional[Sequence[int]] = None,
+                    generator: Optional[torch.Generator] = None) -> Iterator[Dict[str, torch.Tensor]]:
+        """무작위 순서의 미니배치 (agent_indices 를 주면 그 에이전트들의 샘플만)
+        
+        평탄화는 뷰로 하고, 각 미니배치만 index_select 로 모은다.
+        """
+        agents = (torch.arange(self.num_agents, device=self.device) if agent_indices is None
+                  else torch.as_tensor(agent_indices, dtype=torch.int64, device=self.device))
+        # (시간, 환경) 행 x 선택한 에이전트 열의 평탄화 인덱스
+        rows = torch.arange(self.step * self.num_envs, device=self.device) * self.num_agents
+        indices = (rows.unsqueeze(1) + agents.unsqueeze(0)).reshape(-1)
+        indices = indices[torch.randperm(len(indices), generator=generator, device=self.device)]
+        
+        flat = {
+            'observations': self.observations.view(-1, self.observations.shape[-1]),
+            'actions': self.actions.view(-1, self.actions.shape[-1]),
+            'log_probs': self.log_probs.view(-1),
+            'values': self.values.view(-1),
+            'advantages': self.advantages.view(-1),
+            'returns': self.returns.view(-1),
+        }
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            yield {name: tensor.index_select(0, batch) for name, tensor in flat.items()}
@@ -0,0 +1,185 @@
+import contextlib
+import json
+import time
+from typing import Any, Dict, Optional
+import numpy as np
+
+# 히스토그램 구간 경계 (ms): 1us ~ 10s, 10배마다 4구간
+HISTOGRAM_EDGES_MS = np.logspace(-3, 4, 29)
+
+_NULL_PHASE = contextlib.nullcontext()
+
+class _Phase:
+    """한 단계의 시작/끝 시각을 재서 StepProfiler 에 더하는 컨텍스트 (단계 이름마다 하나를 재사용)"""
+    __slots__ = ('profiler', 'name', 'start')
+    
+    def __init__(self, profiler: 'StepProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.profiler._add(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+class StepProfiler:
+    """환경 step 의 단계별 시간과 호출 수를 기록하는 프로파일러
+    
+    환경은 step 마다 begin_step() / end_step() 을 부르고 단계는 `with profiler.phase('name'):` 으로 감싼다.
+    step 이 예외로 끝나면 end_step 대신 abort_step() 을 불러 cProfile 을 끄고 그 스텝을 버린다.
+    enabled=False 면 phase 는 공유 nullcontext 를 돌려주고 end_step 은 None 을 반환하므로 비용은
+    함수 호출 몇 번뿐이다. 켜져 있으면 단계별 스텝당 시간을 최근 window 스텝의 링 버퍼에 모아
+    summary() 에서 p50/p99 와 로그 구간 히스토그램으로 보여주고, dump_every 스텝마다 요약을
+    dump_path (JSON lines) 에 덧붙이거나 출력한다.
+    
+    cprofile_steps > 0 이면 enabled 와 별개로 처음 그만큼의 step 을 cProfile 로 감싸고,
+    끝나면 tottime 순 핫스팟 보고서를 cprofile_path 에 쓴다.
+    """
+    
+    def __init__(self, enabled: bool = False, window: int = 1000, dump_every: int = 0,
+                 dump_path: Optional[str] = None, cprofile_steps: int = 0,
+                 cprofile_path: str = 'step_profile.txt', cprofile_top: int = 40):
+        self.enabled = enabled
+        self.window = window
+        self.dump_every = dump_every
+        self.dump_path = dump_path
+        self.cprofile_steps = cprofile_steps
+        self.cprofile_path = cprofile_path
+        self.cprofile_top = cprofile_top
+        self.steps = 0
+        self._phases: Dict[str, _Phase] = {}
+        self._step_ns: Dict[str, int] = {}  # 이번 스텝의 단계별 누적 시간
+        self._step_calls: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+        self._history: Dict[str, np.ndarray] = {}  # 단계별 최근 window 스텝의 시간 (ms)
+        self._total_calls: Dict[str, int] = {}
+        self._step_start = 0
+        self._cprofile = None  # cProfile.Profile (cprofile_steps > 0 일 때만 import)
+        self._cprofile_remaining = cprofile_steps
+    
+    def phase(self, name: str):
+        """단계 시간을 재는 컨텍스트 (꺼져 있으면 아무것도 하지 않음)"""
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+    
+    def count(self, name: str, value: int = 1):
+        """이번 스텝의 이벤트 수 (메시지 수 등) 누적"""
+        if self.enabled:
+            self._counts[name] = self._counts.get(name, 0) + value
+    
+    def begin_step(self):
+        if self._cprofile_remaining > 0:
+            if self._cprofile is None:
+                import cProfile
+                self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        if self.enabled:
+            self._step_start = time.perf_counter_ns()
+    
+    def abort_step(self):
+        """예외로 끝난 스텝 정리: cProfile 을 끄고 이번 스텝에 쌓인 단계 시간과 이벤트 수는 버림"""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self._step_ns = {}
+        self._step_calls = {}
+        self._counts = {}
+    
+    def end_step(self) -> Optional[Dict[str, Any]]:
+        """스텝을 마감하고 이번 스텝의 {'phases_ms', 'calls', 'counts', 'step_ms'} 를 반환 (꺼져 있으면 None)"""
+        if self._cprofile_remaining > 0:
+            self._cprofile.disable()
+            self._cprofile_remaining -= 1
+            if self._cprofile_remaining == 0:
+                self.write_cprofile_report()
+        if not self.enabled:
+            return None
+        
+        self._add('step', time.perf_counter_ns() - self._step_start)
+        row = self.steps % self.window
+        phases_ms = {}
+        for name, total_ns in self._step_ns.items():
+            history = self._history.get(name)
+            if history is None:
+                # 처음 보는 단계는 이전 스텝에서 0ms 였던 것으로 채움
+                history = self._history[name] = np.zeros(self.window)
+            history[row] = phases_ms[name] = total_ns / 1e6
+            self._total_calls[name] = self._total_calls.get(name, 0) + self._step_calls[name]
+        for name, history in self._history.items():
+            if name not in self._step_ns:
+                history[row] = 0.0
+        report = {
+            'step_ms': phases_ms.pop('step'),
+            'phases_ms': phases_ms,
+            'calls': {name: calls for name, calls in self._step_calls.items() if name != 'step'},
+            'counts': self._counts,
+        }
+        self._step_ns = {}
+        self._step_calls = {}
+        self._counts = {}
+        self.steps += 1
+        if self.dump_every and self.steps % self.dump_every == 0:
+            self.dump()
+        return report
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """최근 window 스텝의 단계별 통계와 히스토그램 ('step' 은 스텝 전체)"""
+        filled = min(self.steps, self.window)
+        result = {}
+        for name, history in self._history.items():
+            values = history[:filled]
+            if not len(values):
+                continue
+            counts, _ = np.histogram(values, bins=HISTOGRAM_EDGES_MS)
+            result[name] = {
+                'steps': int(filled),
+                'total_calls': self._total_calls.get(name, 0),
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(np.percentile(values, 50)),
+                'p99_ms': float(np.percentile(values, 99)),
+                'max_ms': float(values.max()),
+                # 비어 있지 않은 구간만: 구간 하한(ms) -> 스텝 수
+                'histogram': {f"{edge:.4g}": int(c) for edge, c in zip(HISTOGRAM_EDGES_MS[:-1], counts) if c},
+            }
+        return result
+    
+    def dump(self):
+        """현재 요약을 dump_path 에 한 줄 JSON 으로 덧붙이거나, 경로가 없으면 표로 출력"""
+        summary = self.summary()
+        if self.dump_path:
+            with open(self.dump_path, 'a') as f:
+                f.write(json.dumps({'step': self.steps, 'phases': summary}) + '\n')
+            return
+        print(f"[profile] step {self.steps} (last {min(self.steps, self.window)} steps)")
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]['mean_ms']):
+            print(f"  {name:<20} mean {stats['mean_ms']:8.3f} ms  p50 {stats['p50_ms']:8.3f}  "
+                  f"p99 {stats['p99_ms']:8.3f}  calls {stats['total_calls']}")
+    
+    def write_cprofile_report(self, path: Optional[str] = None):
+        """cProfile 결과를 tottime 순으로 정렬해 저장"""
+        if self._cprofile is None:
+            return
+        import pstats
+        path = path or self.cprofile_path
+        with open(path, 'w') as f:
+            f.write(f"# cProfile over {self.cprofile_steps - self._cprofile_remaining} env steps, sorted by tottime\n")
+            stats = pstats.Stats(self._cprofile, stream=f)
+            stats.sort_stats('tottime').print_stats(self.cprofile_top)
+    
+    def reset(self):
+        """누적 통계 초기화 (설정은 유지)"""
+        self.steps = 0
+        self._step_ns, self._step_calls, self._counts = {}, {}, {}
+        self._history.clear()
+        self._total_calls.clear()
+    
+    def _add(self, name: str, elapsed_ns: int):
+        self._step_ns[name] = self._step_ns.get(name, 0) + elapsed_ns
+        self._step_calls[name] = self._step_calls.get(name, 0) + 1
@@ -1,34 +1,101 @@
-from typing import Type, Dict, Any
+import importlib
+from typing import Dict, Any
+
+# 기본 컴포넌트는 "모듈:클래스" 문자열로 등록해 처음 get_* 할 때 import (torch 등은 정책을 쓸 때만 불러옴)
+BUILTIN_ENVIRONMENTS = {
+    'rescue': 'environments.rescue.rescue_env:RescueEnv',
+    'warehouse': 'environments.warehouse.warehouse_env:WarehouseEnv',
+}
+BUILTIN_AGENTS = {
+    'drone': 'agents.types.drone:DroneAgent',
+    'wheeled': 'agents.types.wheeled:WheeledAgent',
+    'observer': 'agents.types.observer:Observer',
+}
+BUILTIN_POLICIES = {
+    'hierarchical_policy': 'policies.hierarchical.high_level:HighLevelPolicy',
+    'ppo_policy': 'policies.ppo.ppo_policy:PPOPolicy',
+    'gnn_policy': 'policies.gnn.gnn_policy:GNNPolicy',
+    'navigation_policy': 'policies.hierarchical.low_level:NavigationPolicy',
+}
+
+def load_entry(path: str) -> Any:
+    """"패키지.모듈:속성" 경로의 객체를 import 해서 반환"""
+    module_name, _, attribute = path.partition(':')
+    if not module_name or not attribute:
+        raise ValueError(f"'{path}' is not a 'module:attribute' path")
+    target = importlib.import_module(module_name)
+    for part in attribute.split('.'):
+        target = getattr(target, part)
+    return target
 
 class Registry:
+    """이름 -> 클래스 레지스트리
+
+    클래스 대신 "패키지.모듈:클래스" 문자열을 등록하면 처음 get_* 할 때 import 하고 그 결과를 보관한다.
+    """
+
     def __init__(self):
         self._agents = {}
         self._environments = {}
         self._policies = {}
 
     def register_agent(self, name: str, agent_class: Any):
-        self._agents[name] = agent_class
+        self._agents[name] = _check_entry(agent_class)
 
     def register_environment(self, name: str, env_class: Any):
-        self._environments[name] = env_class
+        self._environments[name] = _check_entry(env_class)
 
     def register_policy(self, name: str, policy_class: Any):
-        self._policies[name] = policy_class
+        self._policies[name] = _check_entry(policy_class)
 
     def get_agent(self, name: str) -> Any:
-        if name not in self._agents:
-            raise KeyError(f"Agent '{name}' not found in registry")
-        return self._agents[name]
+        return _resolve(self._agents, name, 'Agent')
 
     def get_environment(self, name: str) -> Any:
-        if name not in self._environments:
-            raise KeyError(f"Environment '{name}' not found in registry")
-        return self._environments[name]
+        return _resolve(self._environments, name, 'Environment')
 
     def get_policy(self, name: str) -> Any:
-        if name not in self._policies:
-            raise KeyError(f"Policy '{name}' not found in registry")
-        return self._policies[name]
+        return _resolve(self._policies, name, 'Policy')
+
+    # import 하지 않고 등록 여부만 확인 (설정 검증용)
+    def has_agent(self, name: str) -> bool:
+        return name in self._agents
+
+    def has_environment(self, name: str) -> bool:
+        return name in self._environments
+
+    def has_policy(self, name: str) -> bool:
+        return name in self._policies
+
+def _check_entry(entry: Any) -> Any:
+    if isinstance(entry, str) and ':' not in entry:
+        raise ValueError(f"'{entry}' is not a 'module:attribute' path")
+    return entry
+
+def _resolve(entries: Dict[str, Any], name: str, kind: str) -> Any:
+    if name not in entries:
+        raise KeyError(f"{kind} '{name}' not found in registry")
+    entry = entries[name]
+    if isinstance(entry, str):
+        try:
+            entry = load_entry(entry)
+        except (ImportError, AttributeError) as error:
+            raise ImportError(f"{kind} '{name}' could not be loaded from '{entries[name]}'") from error
+        entries[name] = entry
+    return entry
+
+def register_builtins(target: Registry):
+    """기본 환경/에이전트/정책을 등록 (이미 같은 이름이 있으면 그대로 둠)"""
+    for name, path in BUILTIN_ENVIRONMENTS.items():
+        if not target.has_environment(name):
+            target.register_environment(name, path)
+    for name, path in BUILTIN_AGENTS.items():
+        if not target.has_agent(name):
+            target.register_agent(name, path)
+    for name, path in BUILTIN_POLICIES.items():
+        if not target.has_policy(name):
+            target.register_policy(name, path)
 
 # 전역 레지스트리 인스턴스
-registry = Registry() 
\ No newline at end of file
+registry = Registry()
+register_builtins(registry)
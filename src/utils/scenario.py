@@ -0,0 +1,315 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+from utils.config import Config
+from utils.registry import Registry, register_builtins, registry as default_registry
+
+# 캐시 형식이나 occupancy/인덱스 계산이 바뀌면 올려서 예전 아티팩트를 무효화
+# (배치 코드 _populate / setup_default_environment 는 소스 해시가 키에 들어가므로 자동으로 무효화됨)
+ARTIFACT_VERSION = 2
+
+# environment 섹션 중 환경 생성자 인자가 아니라 월드 배치를 정하는 키
+WORLD_KEYS = ('type', 'layout', 'patients', 'obstacles', 'random_obstacles')
+
+# 컴파일된 배열의 모양/내용을 바꾸는 생성자 인자 (build(**env_kwargs) 로 덮어쓰면 키에 반영)
+WORLD_SHAPE_KEYS = ('width', 'height', 'grid_size')
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'HRL_SCENARIO_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'hrl_gnn', 'scenarios'))
+
+def scenario_key(env_config: Dict[str, Any], layout_source: str = '') -> str:
+    """environment 섹션의 내용과 배치 코드 소스의 해시 (키 순서/들여쓰기와 무관)"""
+    canonical = json.dumps({'version': ARTIFACT_VERSION, 'environment': env_config,
+                            'layout': hashlib.sha256(layout_source.encode()).hexdigest()},
+                           sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+def lattice_clearance(passable: np.ndarray) -> np.ndarray:
+    """격자점별로 가장 가까운 막힌 격자점까지의 4-이웃 BFS 거리 (막힌 점은 0)
+    
+    passable 은 [..., R, C] bool. 막힌 점이 하나도 없는 층은 R + C 로 채운다.
+    """
+    rows, cols = passable.shape[-2:]
+    distance = np.where(passable, rows + cols, 0).astype(np.int32)
+    reached = ~passable
+    frontier = reached.copy()
+    step = 0
+    while frontier.any():
+        step += 1
+        grown = np.zeros_like(frontier)
+        grown[..., 1:, :] |= frontier[..., :-1, :]
+        grown[..., :-1, :] |= frontier[..., 1:, :]
+        grown[..., :, 1:] |= frontier[..., :, :-1]
+        grown[..., :, :-1] |= frontier[..., :, 1:]
+        frontier = grown & ~reached
+        distance[frontier] = step
+        reached |= frontier
+    return distance
+
+class WorldArtifact:
+    """한 시나리오 월드를 미리 계산한 배열 묶음
+    
+    obstacle_positions [O, 2], obstacle_aerial [O], patients [P, 2], blocked (occupancy.blocked),
+    passable / clearance [2, R, C] (grid_size 격자점의 GROUND/AERIAL 층별 통과 가능 여부와
+    가장 가까운 장애물까지의 BFS 거리), navigation_distance [2, P, R, C] (NavigationField 의 환자별 거리장),
+    index_* (장애물 UniformGridIndex 배열).
+    디렉토리에서 불러오면 모든 배열이 .npy 파일을 memory-map 한 것이라 실제로 읽는 페이지만 메모리에 올라온다.
+    """
+    
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any], directory: Optional[str] = None):
+        self.arrays = arrays
+        self.meta = meta
+        self.directory = directory
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+    
+    @classmethod
+    def compile(cls, env) -> 'WorldArtifact':
+        """배치가 끝난 RescueEnv 에서 배열을 뽑아냄"""
+        from environments.rescue.navigation import NavigationField
+        positions, aerial = env.obstacle_arrays()
+        if env.obstacles:
+            # 정수 좌표는 정수로 저장해야 불러온 뒤 obstacles 의 키가 원래와 같아짐
+            positions = np.array(list(env.obstacles)).reshape(-1, 2)
+        env._compute_visibility()
+        index = env.visibility.obstacle_index
+        grid = env.grid_size
+        passable = env.occupancy.blocked[:, ::grid, ::grid] == 0
+        navigation = env.navigation if getattr(env, 'navigation', None) is not None else NavigationField(env)
+        navigation.update()
+        arrays = {
+            'obstacle_positions': positions,
+            'obstacle_aerial': aerial.astype(bool),
+            'patients': np.array(env.patients).reshape(-1, 2),
+            'blocked': env.occupancy.blocked,
+            'passable': passable,
+            'clearance': lattice_clearance(passable),
+            'navigation_distance': navigation.distance,
+        }
+        arrays.update({'index_' + name: array for name, array in index.arrays().items() if name != 'points'})
+        meta = {'version': ARTIFACT_VERSION, 'width': env.width, 'height': env.height,
+                'grid_size': grid, 'cell_size': index.cell_size}
+        return cls(arrays, meta)
+    
+    def save(self, directory: str):
+        """directory 에 배열별 .npy 와 meta.json 을 씀 (다른 프로세스와 경쟁해도 완성된 디렉토리만 보이도록 원자적 이름 변경)"""
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=parent)
+        try:
+            for name, array in self.arrays.items():
+                np.save(os.path.join(staging, name + '.npy'), np.ascontiguousarray(array))
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(self.meta, f)
+            os.rename(staging, directory)
+        except OSError:
+            # 다른 프로세스가 먼저 같은 아티팩트를 저장함
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(os.path.join(directory, 'meta.json')):
+                raise
+        self.directory = directory
+    
+    @classmethod
+    def load(cls, directory: str) -> 'WorldArtifact':
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {path.stem: np.load(path, mmap_mode='r') for path in Path(directory).glob('*.npy')}
+        return cls(arrays, meta, directory)
+    
+    def writable_blocked(self) -> np.ndarray:
+        """환경마다 따로 고칠 수 있는 blocked (파일에서는 copy-on-write memory-map, 고친 페이지만 복사됨)"""
+        if self.directory is not None:
+            return np.load(os.path.join(self.directory, 'blocked.npy'), mmap_mode='c')
+        return self.arrays['blocked'].copy()
+    
+    def apply(self, env):
+        """RescueEnv 에 월드를 채움 (장애물마다 occupancy/인덱스를 다시 계산하지 않음)"""
+        from environments.rescue.spatial_index import UniformGridIndex
+        if (env.width, env.height, env.grid_size) != (self.meta['width'], self.meta['height'], self.meta['grid_size']):
+            raise ValueError("artifact was compiled for a different map size")
+        positions = self.arrays['obstacle_positions']
+        index = UniformGridIndex.from_arrays(
+            positions, self.meta['cell_size'], self.arrays['index_origin'], self.arrays['index_order'],
+            self.arrays['index_cell_keys'], self.arrays['index_cell_start'])
+        env.load_obstacles(positions, self.arrays['obstacle_aerial'], self.writable_blocked(), index)
+        env.patients = list(map(tuple, self.arrays['patients'].tolist()))
+        env.clearance = self.arrays['clearance']
+        if getattr(env, 'navigation', None) is not None:
+            env.navigation.load(self.arrays['navigation_distance'])
+
+class ScenarioBuilder:
+    """YAML 시나리오에서 환경, 에이전트, 정책을 만드는 빌더
+    
+    environment.type / agents[].type / agents[].policy 는 레지스트리 이름이다. RescueEnv 의 월드
+    (layout: default, patients, obstacles, random_obstacles)는 environment 섹션 (build 에서 덮어쓴
+    width / height / grid_size 포함) 과 배치 코드 소스의 해시를 키로 한 번만 컴파일해 cache_dir 에
+    저장하고, 이후 실행/워커는 그 배열을 memory-map 해서 바로 쓴다.
+    같은 (policy, policy_params) 를 쓰는 에이전트는 정책 인스턴스 하나를 공유한다.
+    """
+    
+    def __init__(self, config: Union[str, os.PathLike, Config, Dict[str, Any]],
+                 registry: Optional[Registry] = None, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        if isinstance(config, (str, os.PathLike)):
+            config = Config(config)
+        self.config = config.config if isinstance(config, Config) else config
+        self.registry = registry if registry is not None else default_registry
+        register_builtins(self.registry)
+        self.cache_dir = cache_dir  # None 이면 디스크 캐시 없이 매번 컴파일
+        self.env_config = dict(self.config.get('environment', {}))
+        self.compiled = False  # 이 빌더가 아티팩트를 새로 컴파일했는지
+        self._artifacts: Dict[str, WorldArtifact] = {}  # 월드 키별
+        self._layout_source: Optional[str] = None
+        self._policies: Dict[str, Any] = {}
+    
+    def validate(self) -> List[str]:
+        """레지스트리 이름과 필수 항목을 컴포넌트 import 없이 확인해 문제 목록을 반환 (비어 있으면 정상)"""
+        problems = []
+        env_type = self.env_config.get('type', 'rescue')
+        if not self.registry.has_environment(env_type):
+            problems.append(f"environment: unknown type '{env_type}'")
+        if self.env_config.get('layout') not in (None, 'empty', 'default'):
+            problems.append(f"environment: unknown layout '{self.env_config['layout']}'")
+        for i, agent_config in enumerate(self.config.get('agents', [])):
+            if not self.registry.has_agent(agent_config.get('type')):
+                problems.append(f"agents[{i}]: unknown type '{agent_config.get('type')}'")
+            if 'pos' not in agent_config.get('params', {}):
+                problems.append(f"agents[{i}]: params.pos is required")
+            policy = agent_config.get('policy')
+            if policy and not self.registry.has_policy(policy):
+                problems.append(f"agents[{i}]: unknown policy '{policy}'")
+        return problems
+    
+    def build(self, **env_kwargs: Any):
+        """환경을 만들고 월드와 에이전트를 채운 뒤 reset 한 환경을 반환 (env_kwargs 는 생성자 인자를 덮어씀)"""
+        env = self.build_environment(**env_kwargs)
+        self.build_agents(env)
+        env.reset()
+        return env
+    
+    def build_environment(self, **env_kwargs: Any):
+        env_class = self.registry.get_environment(self.env_config.get('type', 'rescue'))
+        kwargs = {key: value for key, value in self.env_config.items() if key not in WORLD_KEYS}
+        kwargs.update(env_kwargs)
+        env = env_class(**kwargs)
+        if hasattr(env, 'load_obstacles'):
+            # 월드 아티팩트를 받을 수 있는 환경 (RescueEnv)
+            self.artifact(env, **env_kwargs).apply(env)
+        return env
+    
+    def build_agents(self, env) -> List[Any]:
+        """agents 섹션의 에이전트를 만들어 env 에 추가 (observer 항목은 env.observer 설정)"""
+        from agents.types.observer import Observer
+        agents = []
+        for agent_config in self.config.get('agents', []):
+            agent_class = self.registry.get_agent(agent_config['type'])
+            params = dict(agent_config.get('params', {}))
+            pos = tuple(params.pop('pos'))
+            agent_id = params.pop('id', len(env.agents))
+            if issubclass(agent_class, Observer) and hasattr(env, 'observer'):
+                # 환경의 Observer 는 통신 id -1 로 고정이므로 위치/시야만 적용
+                agent = env.observer
+                agent.pos = pos
+            else:
+                agent = agent_class(pos, agent_id)
+            for name, value in params.items():
+                setattr(agent, name, value)
+            if agent_config.get('policy'):
+                agent.policy = self._policy(agent_config['policy'], agent_config.get('policy_params', {}))
+            if agent is not getattr(env, 'observer', None):
+                env.add_agent(agent)
+            agents.append(agent)
+        return agents
+    
+    def world_key(self, **env_kwargs: Any) -> str:
+        """env_kwargs 로 생성자 인자를 덮어쓴 월드의 캐시 키"""
+        config = dict(self.env_config)
+        config.update({key: env_kwargs[key] for key in WORLD_SHAPE_KEYS if key in env_kwargs})
+        return scenario_key(config, self._layout())
+    
+    def artifact(self, env=None, **env_kwargs: Any) -> WorldArtifact:
+        """캐시된 월드 아티팩트 (없으면 env 또는 새 환경에 배치를 적용해 컴파일하고 저장)
+        
+        env_kwargs 는 build 에서 덮어쓴 생성자 인자이며, 그중 WORLD_SHAPE_KEYS 가 키에 들어간다.
+        """
+        key = self.world_key(**env_kwargs)
+        if key in self._artifacts:
+            return self._artifacts[key]
+        directory = os.path.join(self.cache_dir, key) if self.cache_dir else None
+        if directory and os.path.exists(os.path.join(directory, 'meta.json')):
+            self._artifacts[key] = WorldArtifact.load(directory)
+            return self._artifacts[key]
+        
+        if env is None:
+            kwargs = {key: value for key, value in self.env_config.items() if key not in WORLD_KEYS}
+            kwargs.update(env_kwargs)
+            env = self.registry.get_environment(self.env_config.get('type', 'rescue'))(**kwargs)
+        self._populate(env)
+        artifact = WorldArtifact.compile(env)
+        self.compiled = True
+        if directory:
+            artifact.save(directory)
+            artifact = WorldArtifact.load(directory)
+        self._artifacts[key] = artifact
+        return artifact
+    
+    def _layout(self) -> str:
+        """월드 배치 코드 소스 (배치 코드를 고치면 키가 바뀌어 예전 아티팩트를 쓰지 않음)"""
+        if self._layout_source is None:
+            functions = [ScenarioBuilder._populate]
+            if self.env_config.get('layout') == 'default':
+                env_class = self.registry.get_environment(self.env_config.get('type', 'rescue'))
+                functions.append(env_class.setup_default_environment)
+            try:
+                self._layout_source = ''.join(inspect.getsource(function) for function in functions)
+            except (OSError, TypeError):
+                # 소스를 읽을 수 없는 배포 형태에서는 ARTIFACT_VERSION 으로만 무효화
+                self._layout_source = ''
+        return self._layout_source
+    
+    def _populate(self, env):
+        """environment 섹션의 배치를 add_patient / add_obstacle 로 직접 적용 (컴파일 시에만)"""
+        from environments.rescue.constants import ObstacleType
+        config = self.env_config
+        if config.get('layout') == 'default':
+            env.setup_default_environment()
+        elif config.get('layout') not in (None, 'empty'):
+            raise ValueError(f"unknown layout '{config['layout']}'")
+        for pos in config.get('patients', []):
+            env.add_patient(tuple(pos))
+        for obstacle in config.get('obstacles', []):
+            env.add_obstacle(tuple(obstacle['pos']), ObstacleType(obstacle.get('type', 'NORMAL')))
+        
+        random_obstacles = config.get('random_obstacles')
+        if random_obstacles:
+            # grid_size 격자점 중 가장자리를 뺀 곳에 겹치지 않게 배치
+            rng = np.random.default_rng(random_obstacles.get('seed', 0))
+            grid = env.grid_size
+            cols, rows = env.width // grid - 1, env.height // grid - 1
+            count = min(int(random_obstacles['count']), cols * rows)
+            cells = rng.choice(cols * rows, size=count, replace=False)
+            aerial = rng.random(count) < random_obstacles.get('aerial_fraction', 0.0)
+            for cell, is_aerial in zip(cells.tolist(), aerial.tolist()):
+                pos = ((cell % cols + 1) * grid, (cell // cols + 1) * grid)
+                env.add_obstacle(pos, ObstacleType.AERIAL if is_aerial else ObstacleType.NORMAL)
+    
+    def _policy(self, name: str, params: Dict[str, Any]):
+        key = name + json.dumps(params, sort_keys=True)
+        if key not in self._policies:
+            self._policies[key] = self.registry.get_policy(name)(**params)
+        return self._policies[key]
+
+if __name__ == '__main__':
+    # 설정 검증 (src 디렉토리에서): python -m utils.scenario ../configs/rescue_mission.yaml
+    import sys
+    problems = ScenarioBuilder(sys.argv[1]).validate()
+    for problem in problems:
+        print(problem)
+    print(f"{sys.argv[1]}: {'invalid' if problems else 'ok'}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,198 @@
+import glob
+import os
+import queue
+import threading
+import time
+import zipfile
+from typing import List, Optional, Tuple
+import numpy as np
+
+class VideoRecorder:
+    """에피소드 프레임을 압축 npz 청크로 저장하는 녹화기
+    
+    every 스텝마다 한 프레임을 미리 할당한 청크 버퍼에 넣고, 청크가 차면 백그라운드 스레드가
+    RGB 변환과 압축을 해서 디스크에 쓴다. 시뮬레이션 루프에서는 바뀌는 요소만 다시 그리고
+    (정적 레이어는 환경이 캐시), 32비트 픽셀을 청크 버퍼의 다음 칸에 바로 한 번 복사하는 일만 한다.
+    청크 버퍼는 (max_pending + 1)개를 돌려 쓰므로 쓰기가 밀리면 capture 가 빈 버퍼를 기다리며
+    (wait_seconds 에 누적) 메모리는 늘지 않는다.
+    
+    파일: {directory}/episode_{에피소드:04d}_{청크:04d}.npz ('frames' [n, H, W, 3] uint8, 'steps' [n]),
+    np.load / load_episode 로 읽는다. compress_level 은 zlib 압축 수준 (0이면 압축하지 않음).
+    """
+    
+    def __init__(self, directory: str, every: int = 1, chunk_size: int = 32,
+                 max_pending: int = 2, compress_level: int = 1):
+        if every < 1 or chunk_size < 1 or max_pending < 1:
+            raise ValueError("every, chunk_size and max_pending must be at least 1")
+        self.directory = directory
+        self.every = every
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.compress_level = compress_level
+        os.makedirs(directory, exist_ok=True)
+        
+        self.episode = 0
+        self.frames = 0  # 저장 요청한 프레임 수
+        self.chunks = 0
+        self.wait_seconds = 0.0  # 빈 버퍼를 기다린 시간 (시뮬레이션 루프가 막힌 시간)
+        self.write_seconds = 0.0  # 백그라운드 스레드가 변환/압축/쓰기에 쓴 시간
+        
+        self._free: "queue.Queue[np.ndarray]" = queue.Queue()
+        self._pending: queue.Queue = queue.Queue()
+        self._buffer: Optional[np.ndarray] = None
+        self._channels: Optional[slice] = None  # 버퍼가 32비트 픽셀이면 RGB 채널 슬라이스
+        self._packed: Optional[Tuple[Tuple[int, ...], slice]] = None  # 마지막 32비트 프레임의 (모양, 채널)
+        self._allocated = 0  # 지금까지 할당한 청크 버퍼 수 (최대 max_pending + 1)
+        self._steps = np.zeros(chunk_size, dtype=np.int64)
+        self._count = 0
+        self._chunk_index = 0
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._write_loop, name="VideoRecorder", daemon=True)
+        self._thread.start()
+        self.closed = False
+    
+    def capture(self, env) -> bool:
+        """env.time 이 every 의 배수면 env.render() 프레임을 기록 (기록했으면 True)
+        
+        env 는 render_mode='rgb_array' 여야 하며 render_every 때문에 프레임이 없으면 건너뛴다.
+        """
+        if env.time % self.every != 0:
+            return False
+        self._raise_error()
+        if self._packed is not None:
+            # 지난 프레임과 같은 형식이면 청크 버퍼의 다음 칸에 바로 그림
+            shape, channels = self._packed
+            if self._buffer is None:
+                self._buffer, self._channels = self._next_buffer(shape), channels
+            if (self._buffer.shape[1:] == shape and self._channels == channels
+                    and env.render_into(self._buffer[self._count]) == channels):
+                self._commit(env.time)
+                return True
+        frame = env.render()
+        if frame is None:
+            return False
+        packed = env.packed_frame()
+        if packed is not None and packed[1] is not None:
+            self._packed = (packed[0].shape, packed[1])
+            self.add_frame(*packed, step=env.time)
+        else:
+            self.add_frame(frame, step=env.time)
+        return True
+    
+    def add_frame(self, frame: np.ndarray, channels: Optional[slice] = None, step: int = -1):
+        """프레임을 현재 청크에 복사 (frame 은 호출 후 재사용해도 됨)
+        
+        frame 은 (H, W, 3) RGB 이거나, channels 를 주면 (H, W, 4) 픽셀과 그 안의 RGB 채널 슬라이스.
+        """
+        self._raise_error()
+        if self._buffer is not None and (self._buffer.shape[1:] != frame.shape or self._channels != channels):
+            # 프레임 형식이 바뀌면 청크를 나눔 (빈 버퍼는 돌려놓음)
+            if self._count:
+                self._flush()
+            else:
+                self._free.put(self._buffer)
+                self._buffer = None
+        if self._buffer is None:
+            self._buffer = self._next_buffer(frame.shape)
+            self._channels = channels
+        np.copyto(self._buffer[self._count], frame)
+        self._commit(step)
+    
+    def _commit(self, step: int):
+        """청크 버퍼의 현재 칸을 채운 프레임으로 확정"""
+        self._steps[self._count] = step
+        self._count += 1
+        self.frames += 1
+        if self._count == self.chunk_size:
+            self._flush()
+    
+    def end_episode(self):
+        """남은 프레임을 저장하고 다음 에피소드 파일로 넘어감"""
+        self._flush()
+        self.episode += 1
+        self._chunk_index = 0
+    
+    def close(self):
+        """남은 프레임을 저장하고 쓰기 스레드가 끝날 때까지 기다림"""
+        if self.closed:
+            return
+        self._flush()
+        self.closed = True
+        self._pending.put(None)
+        self._thread.join()
+        self._raise_error()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _next_buffer(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """빈 청크 버퍼 (처음에는 할당하고, 이후에는 쓰기가 끝난 버퍼를 기다려 재사용)"""
+        if self._free.empty() and self._allocated <= self.max_pending:
+            self._allocated += 1
+            return np.empty((self.chunk_size,) + tuple(shape), dtype=np.uint8)
+        start = time.perf_counter()
+        buffer = self._free.get()
+        self.wait_seconds += time.perf_counter() - start
+        if buffer.shape[1:] != tuple(shape):
+            buffer = np.empty((self.chunk_size,) + tuple(shape), dtype=np.uint8)
+        return buffer
+    
+    def _flush(self):
+        if self._count == 0:
+            return
+        path = os.path.join(self.directory, f"episode_{self.episode:04d}_{self._chunk_index:04d}.npz")
+        self._pending.put((path, self._buffer, self._channels, self._count, self._steps[:self._count].copy()))
+        self._chunk_index += 1
+        self.chunks += 1
+        self._count = 0
+        self._buffer = None  # 다음 프레임이 올 때 빈 버퍼를 가져옴
+    
+    def _write_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            path, buffer, channels, count, steps = item
+            start = time.perf_counter()
+            try:
+                if self._error is None:
+                    frames = buffer[:count] if channels is None else self._to_rgb(buffer[:count], channels)
+                    self._save(path, {'frames': np.ascontiguousarray(frames), 'steps': steps})
+            except BaseException as error:  # 메인 스레드의 다음 호출에서 다시 발생
+                self._error = error
+            self.write_seconds += time.perf_counter() - start
+            self._free.put(buffer)
+    
+    def _to_rgb(self, pixels: np.ndarray, channels: slice) -> np.ndarray:
+        """[n, H, W, 4] 픽셀의 RGB 바이트를 [n, H, W, 3] 로 (채널마다 복사하는 편이 뒤집힌 슬라이스 복사보다 빠름)"""
+        frames = np.empty(pixels.shape[:3] + (3,), dtype=np.uint8)
+        for i, channel in enumerate(range(4)[channels]):
+            frames[..., i] = pixels[..., channel]
+        return frames
+    
+    def _save(self, path: str, arrays: dict):
+        """np.savez_compressed 와 같은 npz 형식이지만 압축 수준을 고를 수 있음"""
+        compression = zipfile.ZIP_DEFLATED if self.compress_level > 0 else zipfile.ZIP_STORED
+        with zipfile.ZipFile(path, 'w', compression, compresslevel=self.compress_level or None) as archive:
+            for name, array in arrays.items():
+                with archive.open(name + '.npy', 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, array)
+    
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError("VideoRecorder failed to write a chunk") from self._error
+
+def load_episode(directory: str, episode: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """저장된 에피소드의 (frames [T, H, W, 3], steps [T]) 를 청크 순서대로 이어 붙여 반환"""
+    paths: List[str] = sorted(glob.glob(os.path.join(directory, f"episode_{episode:04d}_*.npz")))
+    if not paths:
+        raise FileNotFoundError(f"no chunks for episode {episode} in {directory}")
+    frames, steps = [], []
+    for path in paths:
+        with np.load(path) as chunk:
+            frames.append(chunk['frames'])
+            steps.append(chunk['steps'])
+    return np.concatenate(frames), np.concatenate(steps)